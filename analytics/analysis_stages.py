@@ -0,0 +1,392 @@
+import sys
+from pathlib import Path
+from pipeline import Stage
+from typing import List, Optional, Sequence
+
+# Each stage function prints its own section of the console report and
+# returns its declared outputs; analyze.py writes the processed/ files.
+# Stage dependencies are imported inside the stage so a run only pays for
+# what it executes (a validate-only run never imports sklearn).
+
+def load_stage(telemetry_dir):
+    from telemetry_loader import TelemetryLoader
+
+    loader = TelemetryLoader(telemetry_dir)
+    events = loader.load_all_sessions()
+    print(f"Loaded {len(events)} events")
+    return {'events': events, 'session_index': loader.session_index}
+
+def validate_stage(events):
+    from validator import TelemetryValidator
+
+    validator = TelemetryValidator()
+    return _report_validation(validator.validate(events))
+
+def _report_validation(result):
+    print("\n=== Validation Report ===")
+    print(f"Sessions: {result.session_count}")
+    print(f"Events: {result.event_count}")
+
+    if result.errors:
+        print(f"\nErrors ({len(result.errors)}):")
+        for error in result.errors:
+            print(f"  - {error}")
+
+    if result.warnings:
+        print(f"\nWarnings ({len(result.warnings)}):")
+        for warning in result.warnings:
+            print(f"  - {warning}")
+
+    if not result.is_valid():
+        print("\nValidation failed")
+        sys.exit(1)
+
+    print("\nValidation passed")
+    return {'validation': result}
+
+def extract_stage(events):
+    from feature_extractor import FeatureExtractor
+
+    print("\n=== Feature Engineering ===")
+    extractor = FeatureExtractor()
+    attempts_df = extractor.extract_attempt_features(events)
+    print(f"Extracted features for {len(attempts_df)} attempts")
+    return {'attempts_df': attempts_df}
+
+def aggregate_stage(attempts_df):
+    from session_aggregator import SessionAggregator
+
+    aggregator = SessionAggregator()
+    sessions_df = aggregator.aggregate_session_features(attempts_df)
+    print(f"Aggregated features for {len(sessions_df)} sessions")
+    return {'sessions_df': sessions_df}
+
+# --memory-budget variants of load/validate/extract/aggregate (see
+# chunked_frames): telemetry is read in chunks of whole session files and
+# spilled under the stage's artifact_dir, and each stage holds one chunk
+# at a time. Only aggregate's sessions_df is built in memory.
+
+def chunked_load_stage(telemetry_dir, memory_budget, artifact_dir):
+    from telemetry_loader import TelemetryLoader
+    from chunked_frames import MAX_CHUNK_SESSIONS, SpilledFrames, chunk_bytes
+    from run_metrics import peak_rss_mb
+
+    n_sessions = sum(1 for _ in Path(telemetry_dir).glob("*.csv"))
+    max_bytes = chunk_bytes(memory_budget, n_sessions, resident_bytes=int((peak_rss_mb() or 0) * 2**20))
+    loader = TelemetryLoader(telemetry_dir)
+    event_chunks = SpilledFrames(Path(artifact_dir) / "events", "events")
+    for events in loader.iter_session_chunks(max_bytes, max_files=MAX_CHUNK_SESSIONS):
+        event_chunks.append(events)
+    print(f"Loaded {event_chunks.rows} events in {len(event_chunks)} chunks "
+          f"(up to {max_bytes / 2**20:.1f} MB of CSV or {MAX_CHUNK_SESSIONS} sessions each "
+          f"for a {memory_budget / 2**20:.0f} MB budget)")
+    return {'event_chunks': event_chunks, 'session_index': loader.session_index}
+
+def chunked_validate_stage(event_chunks):
+    from validator import TelemetryValidator, ValidationResult
+
+    validator = TelemetryValidator()
+    result = ValidationResult()
+    for events in event_chunks:
+        if events.empty:
+            continue
+        chunk_result = validator.validate(events)
+        result.errors.extend(chunk_result.errors)
+        result.warnings.extend(chunk_result.warnings)
+        result.session_count += chunk_result.session_count
+        result.event_count += chunk_result.event_count
+
+    if result.event_count == 0:
+        result.add_error("No data to validate")
+    # Chunk-level messages such as unknown event types repeat across chunks
+    result.errors = list(dict.fromkeys(result.errors))
+    result.warnings = list(dict.fromkeys(result.warnings))
+    return _report_validation(result)
+
+def chunked_extract_stage(event_chunks, artifact_dir):
+    from feature_extractor import FeatureExtractor
+    from chunked_frames import SpilledFrames
+
+    print("\n=== Feature Engineering ===")
+    extractor = FeatureExtractor()
+    attempt_chunks = SpilledFrames(Path(artifact_dir) / "attempts", "attempts")
+    for events in event_chunks:
+        attempts_df = extractor.extract_attempt_features(events)
+        if len(attempts_df):
+            attempt_chunks.append(attempts_df)
+    print(f"Extracted features for {attempt_chunks.rows} attempts")
+    return {'attempt_chunks': attempt_chunks}
+
+def chunked_aggregate_stage(attempt_chunks):
+    import pandas as pd
+    from session_aggregator import SessionAggregator
+
+    aggregator = SessionAggregator()
+    # A session's attempts are all in one chunk, so chunks aggregate independently
+    frames = [aggregator.aggregate_session_features(attempts_df) for attempts_df in attempt_chunks]
+    sessions_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    print(f"Aggregated features for {len(sessions_df)} sessions")
+    return {'sessions_df': sessions_df}
+
+def select_stage(sessions_df):
+    if len(sessions_df) < 2:  # Need at least 2 sessions for clustering
+        print("\nInsufficient data for clustering (need >=2 sessions)")
+        return {'clustering_features': None}
+
+    print("\n=== Player Clustering ===")
+    from feature_selector import FeatureSelector
+
+    selector = FeatureSelector()
+    clustering_features = selector.select_clustering_features(sessions_df)
+    print(f"Selected {len(clustering_features.columns)-1} features for clustering")
+    return {'clustering_features': clustering_features}
+
+def cluster_stage(clustering_features, memory_budget=None):
+    if clustering_features is None:
+        return {'clustering_results': None, 'interpretations': None, 'cluster_engine': None}
+
+    import sklearn
+    from clustering import PlayerClustering, SILHOUETTE_SAMPLE_SIZE
+
+    # Silhouette is O(n^2) in time and works through distance blocks of
+    # sklearn's working_memory (1 GB by default): under a memory budget it
+    # is sampled and the blocks are kept to a quarter of the budget
+    clusterer = PlayerClustering(silhouette_sample_size=SILHOUETTE_SAMPLE_SIZE if memory_budget else None)
+    working_memory = max(memory_budget // 4 // 2**20, 64) if memory_budget else None
+    with sklearn.config_context(working_memory=working_memory):
+        clustering_results = clusterer.fit_clustering_models(clustering_features)
+
+    print(f"K-Means best: {clustering_results['kmeans']['best_k']} clusters (silhouette: {clustering_results['kmeans']['best_score']:.3f})")
+    print(f"GMM best: {clustering_results['gmm']['best_k']} clusters (silhouette: {clustering_results['gmm']['best_score']:.3f})")
+
+    interpretations = clusterer.interpret_clusters(clustering_features, clustering_results)
+
+    if interpretations.get('error'):
+        print(f"\nClustering failed: {interpretations['error']}")
+        return {'clustering_results': None, 'interpretations': None, 'cluster_engine': None}
+
+    print(f"\nUsing {interpretations['method_used']} clustering:")
+    for cluster_id, info in interpretations['cluster_interpretations'].items():
+        print(f"  {info['description']} ({info['size']} sessions)")
+    return {
+        'clustering_results': clustering_results,
+        'interpretations': interpretations,
+        'cluster_engine': clusterer.export_inference_engine(clustering_features, interpretations)
+    }
+
+def classify_stage(sessions_df, n_jobs=-1):
+    outputs = {
+        'labels_df': None,
+        'training_results': None,
+        'explanations': None,
+        'predictions': None,
+        'session_explanations': None,
+        'inference_engine': None
+    }
+    if len(sessions_df) < 3:  # Need minimum data for supervised learning
+        print("\nInsufficient data for weakness classification (need >=3 sessions)")
+        return outputs
+
+    print("\n=== Weakness Classification ===")
+    from weakness_classifier import WeaknessClassifier
+
+    classifier = WeaknessClassifier(n_jobs=n_jobs)
+    labels_df = classifier.define_weakness_labels(sessions_df)
+
+    print(f"Defined weakness labels for {len(labels_df)} sessions")
+    weakness_cols = [col for col in labels_df.columns if col != 'session_id']
+    for weakness in weakness_cols:
+        positive_cases = labels_df[weakness].sum()
+        print(f"  {weakness}: {positive_cases}/{len(labels_df)} sessions ({positive_cases/len(labels_df)*100:.1f}%)")
+
+    training_results = classifier.train_weakness_models(sessions_df, labels_df)
+    outputs.update({
+        'labels_df': labels_df,
+        'training_results': training_results,
+        'explanations': classifier.explain_weakness_predictions(sessions_df, labels_df),
+        'predictions': classifier.predict_weaknesses(sessions_df),
+        'session_explanations': classifier.explain_sessions(sessions_df) if classifier.models else None,
+        'inference_engine': classifier.export_inference_engine() if classifier.models else None
+    })
+
+    print("\nWeakness model training complete")
+    for weakness, result in training_results.items():
+        if 'error' not in result:
+            print(f"  {weakness}: {result['positive_cases']} positive cases")
+    return outputs
+
+def evaluate_stage(sessions_df, labels_df, cv_cache_dir, n_jobs=-1):
+    if labels_df is None:
+        return {'evaluation': None}
+
+    from weakness_evaluation import WeaknessEvaluator
+
+    print("\n=== Weakness Model Evaluation ===")
+    evaluator = WeaknessEvaluator(cache_dir=cv_cache_dir, n_jobs=n_jobs)
+    evaluation = evaluator.evaluate(sessions_df, labels_df)
+    for weakness, result in evaluation['per_weakness'].items():
+        if 'error' in result:
+            print(f"  {weakness}: {result['error']}")
+            continue
+        lr_scores = result['models']['logistic']
+        print(f"  {weakness}: AUC {lr_scores['auc']['mean']:.3f}, "
+              f"precision {lr_scores['precision']['mean']:.3f}, recall {lr_scores['recall']['mean']:.3f} "
+              f"({result['n_splits']}-fold)")
+    return {'evaluation': evaluation}
+
+def _trend_analyzer(trend_method, trend_threshold):
+    from trend_analyzer import TrendAnalyzer
+
+    analyzer = TrendAnalyzer(classification_method=trend_method)
+    analyzer.trend_thresholds.update({'improving': trend_threshold, 'regressing': -trend_threshold})
+    return analyzer
+
+def trends_stage(sessions_df, session_index, trend_method, trend_threshold):
+    outputs = {'trend_results': None, 'trend_series': None, 'trend_views': None, 'trend_state': None}
+    if len(sessions_df) < 2:  # Need at least 2 sessions for trends
+        print("\nInsufficient data for trend analysis (need >=2 sessions)")
+        return outputs
+
+    print("\n=== Trend Analysis ===")
+    from trend_state import TrendState
+
+    analyzer = _trend_analyzer(trend_method, trend_threshold)
+    trend_results = analyzer.analyze_trends(sessions_df, session_index, include_series=False)
+    trend_series = trend_results.pop('series', None)
+
+    if 'error' in trend_results:
+        print(f"Trend analysis failed: {trend_results['error']}")
+        return outputs
+
+    print(f"Analyzed trends across {trend_results['session_count']} sessions")
+    print(f"Metrics analyzed: {len(trend_results['metrics_analyzed'])}")
+
+    overall = trend_results['trend_summaries']['overall']
+    print(f"\nOverall assessment: {overall['overall_assessment']}")
+    print(f"  Improving: {overall['improving_count']} metrics")
+    print(f"  Stable: {overall['flat_count']} metrics")
+    print(f"  Regressing: {overall['regressing_count']} metrics")
+
+    outputs.update({
+        'trend_results': trend_results,
+        'trend_series': trend_series,
+        # Downsampled min/mean/max buckets so long histories plot at a bounded point count
+        'trend_views': analyzer.build_trend_views(trend_series, session_index) if trend_series else None,
+        # Per-metric EWMA/window state so new sessions can update trends without the history
+        'trend_state': TrendState.from_history(sessions_df, session_index, analyzer=analyzer)
+    })
+    return outputs
+
+def player_trends_stage(sessions_df, session_index, player_map, trend_method, trend_threshold, artifact_dir,
+                        n_jobs=-1):
+    outputs = {'player_trends_file': None, 'player_statistics': None}
+    if len(sessions_df) < 2:
+        return outputs
+
+    import pandas as pd
+
+    analyzer = _trend_analyzer(trend_method, trend_threshold)
+    player_map_df = pd.read_csv(player_map, usecols=['session_id', 'player_id'])
+    player_sessions = sessions_df.merge(player_map_df, on='session_id', how='inner')
+
+    player_trends_file = Path(artifact_dir) / "player_trends.jsonl"
+    player_trends = analyzer.analyze_player_trends(
+        player_sessions, player_key='player_id', output_path=player_trends_file,
+        session_index=session_index, n_jobs=n_jobs
+    )
+    analyzed = sum(1 for record in player_trends if 'error' not in record)
+    print(f"\nPer-player trends: {analyzed}/{len(player_trends)} players analyzed")
+    outputs['player_trends_file'] = player_trends_file
+
+    if trend_method == "statistical":
+        outputs['player_statistics'] = analyzer.analyze_player_trend_statistics(player_sessions, session_index=session_index)
+    return outputs
+
+def insights_stage(sessions_df, inference_engine, trend_results, artifact_dir):
+    print("\n=== Insight Generation ===")
+    from insight_engine import InsightEngine
+
+    insight_engine = InsightEngine()
+    # Session insights are generated lazily and streamed straight to the JSONL file
+    if inference_engine:
+        probabilities = inference_engine.predict_proba(inference_engine.to_matrix(sessions_df))
+        session_insights = insight_engine.iter_session_insights(sessions_df, probabilities, inference_engine.weakness_names)
+    else:
+        session_insights = insight_engine.iter_session_insights(sessions_df)
+    trend_insights = insight_engine.generate_trend_insights(trend_results) if trend_results else []
+
+    insights_file = Path(artifact_dir) / "insights.jsonl"
+    insight_count = insight_engine.write_jsonl(insights_file, session_insights, trend_insights)
+    print(f"Generated {insight_count} insights ({len(trend_insights)} from trends)")
+    return {'insights_file': insights_file, 'insight_count': insight_count}
+
+TREND_MODULES = ['trend_analyzer', 'smoothing', 'trend_tests', 'trend_series', 'trend_views', 'feature_schema', 'feature_dictionary']
+
+def build_stages(evaluate: bool = False, player_trends: bool = False,
+                 targets: Optional[Sequence[str]] = None, memory_budget: Optional[int] = None) -> List[Stage]:
+    """The analysis DAG in execution order; optional stages only when requested.
+
+    With a memory_budget (bytes) the per-session stages run out of core in
+    chunks sized to fit it. With targets, only those stages and the stages
+    they depend on are kept.
+    """
+    if memory_budget:
+        stages = [
+            Stage('load', chunked_load_stage, params=['telemetry_dir', 'telemetry_fingerprint', 'memory_budget'],
+                  outputs=['event_chunks', 'session_index'], modules=['telemetry_loader', 'chunked_frames']),
+            Stage('validate', chunked_validate_stage, inputs=['event_chunks'], outputs=['validation'],
+                  modules=['validator', 'chunked_frames']),
+            Stage('extract', chunked_extract_stage, inputs=['event_chunks'], outputs=['attempt_chunks'],
+                  modules=['feature_extractor', 'chunked_frames']),
+            Stage('aggregate', chunked_aggregate_stage, inputs=['attempt_chunks'], outputs=['sessions_df'],
+                  modules=['session_aggregator', 'chunked_frames'])
+        ]
+    else:
+        stages = [
+            Stage('load', load_stage, params=['telemetry_dir', 'telemetry_fingerprint'],
+                  outputs=['events', 'session_index'], modules=['telemetry_loader']),
+            Stage('validate', validate_stage, inputs=['events'], outputs=['validation'], modules=['validator']),
+            Stage('extract', extract_stage, inputs=['events'], outputs=['attempts_df'], modules=['feature_extractor']),
+            Stage('aggregate', aggregate_stage, inputs=['attempts_df'], outputs=['sessions_df'],
+                  modules=['session_aggregator'])
+        ]
+    stages += [
+        Stage('select', select_stage, inputs=['sessions_df'], outputs=['clustering_features'],
+              modules=['feature_selector']),
+        Stage('cluster', cluster_stage, inputs=['clustering_features'], params=['memory_budget'],
+              outputs=['clustering_results', 'interpretations', 'cluster_engine'],
+              modules=['clustering', 'cluster_inference']),
+        Stage('classify', classify_stage, inputs=['sessions_df'],
+              outputs=['labels_df', 'training_results', 'explanations', 'predictions',
+                       'session_explanations', 'inference_engine'],
+              modules=['weakness_classifier', 'tree_rules', 'session_explanations', 'weakness_inference',
+                       'feature_schema', 'feature_dictionary'], runtime=['n_jobs'])
+    ]
+    if evaluate:
+        stages.append(Stage('evaluate', evaluate_stage, inputs=['sessions_df', 'labels_df'],
+                            params=['cv_cache_dir'], outputs=['evaluation'],
+                            modules=['weakness_evaluation', 'weakness_classifier', 'feature_schema', 'feature_dictionary'],
+                            runtime=['n_jobs']))
+    stages.append(Stage('trends', trends_stage, inputs=['sessions_df', 'session_index'],
+                        params=['trend_method', 'trend_threshold'],
+                        outputs=['trend_results', 'trend_series', 'trend_views', 'trend_state'],
+                        modules=TREND_MODULES + ['trend_state']))
+    if player_trends:
+        stages.append(Stage('player_trends', player_trends_stage, inputs=['sessions_df', 'session_index'],
+                            params=['player_map', 'player_map_fingerprint', 'trend_method', 'trend_threshold'],
+                            outputs=['player_trends_file', 'player_statistics'], modules=TREND_MODULES,
+                            runtime=['n_jobs']))
+    stages.append(Stage('insights', insights_stage, inputs=['sessions_df', 'inference_engine', 'trend_results'],
+                        outputs=['insights_file', 'insight_count'],
+                        modules=['insight_engine', 'insight_contract', 'insight_io', 'weakness_inference',
+                                 'feature_schema', 'feature_dictionary']))
+    return stages if targets is None else _with_dependencies(stages, targets)
+
+def _with_dependencies(stages: List[Stage], targets: Sequence[str]) -> List[Stage]:
+    """Target stages plus everything upstream of them, in execution order"""
+    producers = {output: stage for stage in stages for output in stage.outputs}
+    needed = {stage.name for stage in stages if stage.name in targets}
+    for stage in reversed(stages):
+        if stage.name in needed:
+            needed.update(producers[name].name for name in stage.inputs)
+    return [stage for stage in stages if stage.name in needed]
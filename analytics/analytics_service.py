@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+import argparse
+import io
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from feature_extractor import FeatureExtractor
+from session_aggregator import SessionAggregator
+from weakness_inference import WeaknessInferenceEngine
+from cluster_inference import ClusterInferenceEngine
+from trend_state import TrendState
+from insight_engine import InsightEngine
+from insight_io import insight_to_record
+
+class AnalyticsService:
+    """Per-session feedback from models loaded once from a processed/ folder.
+
+    Uses the artifacts analyze.py writes: weakness_inference.npz,
+    cluster_model.npz, trend_state.json and session_features.csv (the
+    cohort new sessions are ranked against for insights). Missing
+    artifacts just leave that part out of the response.
+
+    analyze_batch scores several requests' sessions in one pass; new
+    sessions are folded into the in-memory trend state (skipping session
+    ids it has recently seen), which is not written back to disk.
+    """
+
+    def __init__(self, processed_dir):
+        processed_dir = Path(processed_dir)
+        self.processed_dir = processed_dir
+        self.weakness_engine = self._load(processed_dir / "weakness_inference.npz", WeaknessInferenceEngine.load)
+        self.cluster_engine = self._load(processed_dir / "cluster_model.npz", ClusterInferenceEngine.load)
+        self.trend_state = self._load(processed_dir / "trend_state.json", TrendState.load)
+        self.reference_df = self._load(processed_dir / "session_features.csv", pd.read_csv)
+
+        self.extractor = FeatureExtractor()
+        self.aggregator = SessionAggregator()
+        self.insight_engine = InsightEngine()
+        self._trend_lock = threading.Lock()
+
+    @staticmethod
+    def _load(path: Path, loader):
+        return loader(path) if path.exists() else None
+
+    def describe(self) -> Dict:
+        return {
+            'processed_dir': str(self.processed_dir),
+            'weakness_models': self.weakness_engine.weakness_names if self.weakness_engine else [],
+            'cluster_method': self.cluster_engine.method if self.cluster_engine else None,
+            'trend_sessions': self.trend_state.session_count if self.trend_state else 0,
+            'reference_sessions': 0 if self.reference_df is None else len(self.reference_df)
+        }
+
+    def analyze(self, csv_text: str) -> Dict:
+        return self.analyze_batch([csv_text])[0]
+
+    def analyze_batch(self, csv_texts: List[str]) -> List[Dict]:
+        """One response per telemetry CSV; a CSV that fails to parse gets an 'error' entry
+
+        A valid CSV without sessions gets an empty 'sessions' list.
+        """
+        responses = [None] * len(csv_texts)
+        frames = []
+        for i, text in enumerate(csv_texts):
+            try:
+                events = pd.read_csv(io.StringIO(text))
+                missing = {'session_id', 'minigame_id', 'event_type', 'payload'} - set(events.columns)
+                if missing:
+                    raise ValueError(f"missing columns {sorted(missing)}")
+                frames.append(events.assign(_request=i))
+            except Exception as e:
+                responses[i] = {'error': f"Invalid telemetry CSV: {e}"}
+
+        # A session id sent by two requests in one batch must not be merged into one
+        # session, so requests are scored in groups whose session ids are disjoint
+        # (normally a single group)
+        groups = []
+        for frame in frames:
+            ids = set(frame['session_id'].dropna().unique())
+            if not ids:
+                continue
+            group = next((group for group in groups if not ids & group['ids']), None)
+            if group is None:
+                group = {'ids': set(), 'frames': []}
+                groups.append(group)
+            group['ids'] |= ids
+            group['frames'].append(frame)
+
+        # Valid CSVs without any session (header only, or no session ids) get an empty list
+        session_requests = [i for i, response in enumerate(responses) if response is None]
+        if not session_requests:
+            return responses
+        session_records = {request: [] for request in session_requests}
+        scored = [self._score_group(group['frames'], session_records) for group in groups]
+        scored = [sessions_df for sessions_df in scored if len(sessions_df)]
+        trends = self._update_trends(pd.concat(scored, ignore_index=True) if scored else pd.DataFrame())
+
+        for request, records in session_records.items():
+            responses[request] = {'sessions': records, 'trends': trends}
+        return responses
+
+    def _score_group(self, frames: List[pd.DataFrame], session_records: Dict[int, List[Dict]]) -> pd.DataFrame:
+        """Score requests with disjoint session ids in one pass, appending to session_records"""
+        session_requests = {}
+        for frame in frames:
+            for session_id in frame['session_id'].unique():
+                session_requests[session_id] = int(frame['_request'].iloc[0])
+
+        events = pd.concat(frames, ignore_index=True).drop(columns='_request')
+        attempts_df = self.extractor.extract_attempt_features(events)
+        sessions_df = self.aggregator.aggregate_session_features(attempts_df) if len(attempts_df) else pd.DataFrame()
+
+        if len(sessions_df):
+            for request, record in zip(sessions_df['session_id'].map(session_requests), self._score(sessions_df)):
+                session_records[request].append(record)
+        return sessions_df
+
+    def _score(self, sessions_df: pd.DataFrame) -> List[Dict]:
+        """Features, cluster, weakness probabilities and insights for each aggregated session"""
+        session_ids = sessions_df['session_id'].tolist()
+        records = [{'session_id': session_id, 'features': _json_row(row)}
+                   for session_id, row in zip(session_ids, sessions_df.to_dict('records'))]
+
+        if self.cluster_engine:
+            labels = self.cluster_engine.predict(self.cluster_engine.to_matrix(sessions_df))
+            for record, label in zip(records, labels):
+                record['cluster'] = {'cluster': int(label), 'description': self.cluster_engine.descriptions[label]}
+
+        probabilities = None
+        if self.weakness_engine:
+            probabilities = self.weakness_engine.predict_proba(self.weakness_engine.to_matrix(sessions_df))
+            for record, row in zip(records, probabilities):
+                record['weakness_probabilities'] = dict(zip(self.weakness_engine.weakness_names, row.tolist()))
+
+        position = {session_id: i for i, session_id in enumerate(session_ids)}
+        for record in records:
+            record['insights'] = []
+        insights = self.insight_engine.iter_session_insights(
+            sessions_df, probabilities, self.weakness_engine.weakness_names if self.weakness_engine else None,
+            reference_df=self.reference_df
+        )
+        for session_id, insight in insights:
+            records[position[session_id]]['insights'].append(insight_to_record(insight, session_id))
+        return records
+
+    def _update_trends(self, sessions_df: pd.DataFrame) -> Optional[Dict]:
+        if self.trend_state is None:
+            return None
+        with self._trend_lock:
+            for session in sessions_df.to_dict('records'):
+                self.trend_state.update(session)
+            summary = self.trend_state.summarize()
+        if 'error' in summary:
+            return summary
+        return {
+            'session_count': summary['session_count'],
+            'trend_classifications': summary['trend_classifications'],
+            'insights': [insight_to_record(insight, None)
+                         for insight in self.insight_engine.generate_trend_insights(summary)]
+        }
+
+def _json_row(row: Dict) -> Dict:
+    return {name: (None if pd.isna(value) else value.item() if isinstance(value, np.generic) else value)
+            for name, value in row.items()}
+
+class RequestBatcher:
+    """Collects concurrent requests and hands them to the service in batches.
+
+    A single worker thread takes the first waiting request, then keeps
+    collecting for up to batch_window_ms or until max_batch requests are
+    queued, and scores them together. Under no load a request waits at
+    most batch_window_ms before it is scored.
+    """
+
+    def __init__(self, service: AnalyticsService, max_batch: int = 32, batch_window_ms: float = 2.0):
+        self.service = service
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000
+        self.batch_sizes = []
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, csv_text: str) -> Future:
+        future = Future()
+        self._queue.put((csv_text, future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.perf_counter(), 0))
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+
+            self.batch_sizes.append(len(batch))
+            try:
+                responses = self.service.analyze_batch([text for text, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), response in zip(batch, responses):
+                future.set_result(response)
+
+def make_handler(batcher: RequestBatcher):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, {'status': 'ok', **batcher.service.describe()})
+            else:
+                self._reply(404, {'error': f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/sessions":
+                self._reply(404, {'error': f"Unknown path {self.path}"})
+                return
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0))).decode('utf-8')
+            try:
+                response = batcher.submit(body).result()
+            except Exception as e:
+                self._reply(500, {'error': f"{type(e).__name__}: {e}"})
+                return
+            self._reply(400 if 'error' in response else 200, response)
+
+        def _reply(self, status: int, payload: Dict):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def start_server(processed_dir, host: str = "127.0.0.1", port: int = 8765,
+                 max_batch: int = 32, batch_window_ms: float = 2.0):
+    """Load the models and start serving on a background thread; returns (server, batcher)"""
+    batcher = RequestBatcher(AnalyticsService(processed_dir), max_batch=max_batch, batch_window_ms=batch_window_ms)
+    server = ThreadingHTTPServer((host, port), make_handler(batcher))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, batcher
+
+def main():
+    parser = argparse.ArgumentParser(description="Local analytics service: per-session feedback from stored models")
+    parser.add_argument("processed_directory", help="processed/ folder written by analyze.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=32, help="most requests scored together (default 32)")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="how long to wait for more requests before scoring a batch (default 2 ms)")
+    args = parser.parse_args()
+
+    if not Path(args.processed_directory).exists():
+        print(f"Error: Directory {args.processed_directory} does not exist")
+        raise SystemExit(1)
+
+    server, batcher = start_server(args.processed_directory, args.host, args.port,
+                                   max_batch=args.max_batch, batch_window_ms=args.batch_window_ms)
+    print(f"Serving on http://{args.host}:{server.server_address[1]}")
+    print(json.dumps(batcher.service.describe(), indent=2))
+    print("POST a session telemetry CSV to /sessions; GET /health for model info. Ctrl+C to stop.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        batcher.close()
+
+if __name__ == "__main__":
+    main()
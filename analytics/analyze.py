@@ -1,157 +1,161 @@
 #!/usr/bin/env python3
 
+import os
 import sys
+import time
+import argparse
+import hashlib
+import shutil
 from pathlib import Path
-from telemetry_loader import TelemetryLoader
-from validator import TelemetryValidator
-from feature_extractor import FeatureExtractor
-from session_aggregator import SessionAggregator
-from feature_selector import FeatureSelector
-from clustering import PlayerClustering
+from pipeline import PipelineRunner
+from analysis_stages import build_stages
 import json
 
-def main():
-    if len(sys.argv) != 2:
-        print("Usage: python analyze.py <telemetry_directory>")
-        sys.exit(1)
-    
-    telemetry_dir = sys.argv[1]
-    
-    if not Path(telemetry_dir).exists():
-        print(f"Error: Directory {telemetry_dir} does not exist")
-        sys.exit(1)
-    
+# Stages each subcommand needs on top of load/validate; their upstream
+# stages are added by build_stages. None runs the whole pipeline.
+COMMAND_TARGETS = {
+    'validate': [],
+    'features': ['aggregate'],
+    'cluster': ['cluster'],
+    'weakness': ['classify', 'evaluate'],
+    'trends': ['trends', 'player_trends'],
+    'all': None
+}
+
+def telemetry_fingerprint(session_index) -> str:
+    """Content hash of the telemetry directory from its (file, mtime, size) index"""
+    columns = ['source_file', 'file_mtime', 'file_size']
+    rows = session_index[columns].sort_values('source_file').to_csv(index=False)
+    return hashlib.sha256(rows.encode()).hexdigest()
+
+def file_fingerprint(path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest() if path else None
+
+def run_analysis(telemetry_dir, evaluate: bool = False, player_map=None, trend_method: str = "threshold",
+                 trend_threshold: float = 0.1, command: str = "all", table_format: str = "csv",
+                 profile: bool = False, memory_budget: int = None, n_jobs: int = -1) -> dict:
+    """Run the staged pipeline for one telemetry directory and write its processed/ outputs.
+
+    command limits the run to the stages one subcommand needs (see
+    COMMAND_TARGETS). table_format picks CSV and/or columnar (see
+    columnar_store) attempt and session feature tables. Stage outputs are
+    cached under processed/stage_cache. Per-stage timings, CPU, peak RSS and
+    row counts go to processed/run_metrics.json; profile re-runs every stage
+    under cProfile (processed/profiles/<stage>.prof). memory_budget (bytes)
+    runs loading, validation, extraction and aggregation out of core in
+    chunks sized to fit it, spilling to the stage cache (see chunked_frames).
+    n_jobs caps the joblib workers of the classify, evaluate and player
+    trend stages; it does not change their outputs or cache keys.
+    Returns the per-stage run/reuse report, or None when there is no telemetry.
+    """
+    from telemetry_loader import TelemetryLoader
+
+    output_dir = Path(telemetry_dir).parent / "processed"
     print(f"Loading telemetry from: {telemetry_dir}")
-    
-    loader = TelemetryLoader(telemetry_dir)
-    df = loader.load_all_sessions()
-    
-    if df.empty:
+
+    # Stat-only rescan of the directory; unchanged files are not re-read
+    loader = TelemetryLoader(telemetry_dir, index_path=output_dir / "session_index.csv")
+    session_index = loader.load_session_index()
+    if session_index.empty:
         print("No telemetry data found")
-        return
-    
-    print(f"Loaded {len(df)} events")
-    
-    validator = TelemetryValidator()
-    result = validator.validate(df)
-    
-    print("\n=== Validation Report ===")
-    print(f"Sessions: {result.session_count}")
-    print(f"Events: {result.event_count}")
-    
-    if result.errors:
-        print(f"\nErrors ({len(result.errors)}):")
-        for error in result.errors:
-            print(f"  - {error}")
-    
-    if result.warnings:
-        print(f"\nWarnings ({len(result.warnings)}):")
-        for warning in result.warnings:
-            print(f"  - {warning}")
-    
-    if not result.is_valid():
-        print("\nValidation failed")
-        sys.exit(1)
-    
-    print("\nValidation passed")
-    
-    # Feature Engineering
-    print("\n=== Feature Engineering ===")
-    extractor = FeatureExtractor()
-    attempts_df = extractor.extract_attempt_features(df)
-    print(f"Extracted features for {len(attempts_df)} attempts")
-    
-    aggregator = SessionAggregator()
-    sessions_df = aggregator.aggregate_session_features(attempts_df)
-    print(f"Aggregated features for {len(sessions_df)} sessions")
-    
-    # Player Clustering
-    if len(sessions_df) >= 2:  # Need at least 2 sessions for clustering
-        print("\n=== Player Clustering ===")
-        selector = FeatureSelector()
-        clustering_features = selector.select_clustering_features(sessions_df)
-        print(f"Selected {len(clustering_features.columns)-1} features for clustering")
-        
-        clusterer = PlayerClustering()
-        clustering_results = clusterer.fit_clustering_models(clustering_features)
-        
-        print(f"K-Means best: {clustering_results['kmeans']['best_k']} clusters (silhouette: {clustering_results['kmeans']['best_score']:.3f})")
-        print(f"GMM best: {clustering_results['gmm']['best_k']} clusters (silhouette: {clustering_results['gmm']['best_score']:.3f})")
-        
-        interpretations = clusterer.interpret_clusters(clustering_features, clustering_results)
-        
-        if interpretations.get('error'):
-            print(f"\nClustering failed: {interpretations['error']}")
-            clustering_results = None
-            interpretations = None
-        else:
-            print(f"\nUsing {interpretations['method_used']} clustering:")
-            for cluster_id, info in interpretations['cluster_interpretations'].items():
-                print(f"  {info['description']} ({info['size']} sessions)")
-    else:
-        print("\nInsufficient data for clustering (need >=2 sessions)")
-        clustering_results = None
-        interpretations = None
-    
-    # Weakness Classification
-    if len(sessions_df) >= 3:  # Need minimum data for supervised learning
-        print("\n=== Weakness Classification ===")
-        from weakness_classifier import WeaknessClassifier
-        
-        classifier = WeaknessClassifier()
-        labels_df = classifier.define_weakness_labels(sessions_df)
-        
-        print(f"Defined weakness labels for {len(labels_df)} sessions")
-        weakness_cols = [col for col in labels_df.columns if col != 'session_id']
-        for weakness in weakness_cols:
-            positive_cases = labels_df[weakness].sum()
-            print(f"  {weakness}: {positive_cases}/{len(labels_df)} sessions ({positive_cases/len(labels_df)*100:.1f}%)")
-        
-        training_results = classifier.train_weakness_models(sessions_df, labels_df)
-        explanations = classifier.explain_weakness_predictions(sessions_df, labels_df)
-        predictions = classifier.predict_weaknesses(sessions_df)
-        
-        print("\nWeakness model training complete")
-        for weakness, result in training_results.items():
-            if 'error' not in result:
-                print(f"  {weakness}: {result['positive_cases']} positive cases")
-    else:
-        print("\nInsufficient data for weakness classification (need >=3 sessions)")
-        training_results = None
-        explanations = None
-        predictions = None
-    
-    # Trend Analysis
-    if len(sessions_df) >= 2:  # Need at least 2 sessions for trends
-        print("\n=== Trend Analysis ===")
-        from trend_analyzer import TrendAnalyzer
-        
-        analyzer = TrendAnalyzer()
-        trend_results = analyzer.analyze_trends(sessions_df)
-        
-        if 'error' in trend_results:
-            print(f"Trend analysis failed: {trend_results['error']}")
-            trend_results = None
+        return None
+
+    params = {
+        'telemetry_dir': str(Path(telemetry_dir).resolve()),
+        'telemetry_fingerprint': telemetry_fingerprint(session_index),
+        'cv_cache_dir': output_dir / "cv_folds",
+        'trend_method': trend_method,
+        'trend_threshold': trend_threshold,
+        'player_map': str(player_map) if player_map else None,
+        'player_map_fingerprint': file_fingerprint(player_map),
+        'memory_budget': memory_budget,
+        'n_jobs': n_jobs
+    }
+
+    targets = COMMAND_TARGETS[command]
+    stages = build_stages(evaluate=evaluate, player_trends=bool(player_map),
+                          targets=None if targets is None else ['validate'] + targets, memory_budget=memory_budget)
+    runner = PipelineRunner(stages, cache_dir=output_dir / "stage_cache",
+                            profile_dir=output_dir / "profiles" if profile else None)
+    started = time.time()
+    report = runner.run(params, force=profile)
+
+    save_start = time.perf_counter()
+    save_outputs(runner, output_dir, table_format=table_format)
+    write_run_metrics(output_dir / "run_metrics.json", runner.metrics, command, started,
+                      save_seconds=time.perf_counter() - save_start)
+
+    reused = runner.reused_stages()
+    print(f"\nStages reused from cache: {', '.join(reused) if reused else 'none'}")
+    return {'telemetry_dir': str(telemetry_dir), 'output_dir': str(output_dir), 'stages': report}
+
+def write_run_metrics(path: Path, stage_metrics, command: str, started: float, save_seconds: float):
+    """Write run_metrics.json and print a one-line-per-stage timing summary"""
+    from run_metrics import peak_rss_mb
+
+    ran = [record for record in stage_metrics if record['status'] != 'reused']
+    metrics = {
+        'command': command,
+        'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(started)),
+        'wall_seconds': round(time.time() - started, 4),
+        'stage_wall_seconds': round(sum(record['wall_seconds'] for record in ran), 4),
+        'stage_cpu_seconds': round(sum(record['cpu_seconds'] for record in ran), 4),
+        'save_outputs_seconds': round(save_seconds, 4),
+        'peak_rss_mb': None if peak_rss_mb() is None else round(peak_rss_mb(), 1),
+        'python': sys.version.split()[0],
+        'stages': stage_metrics
+    }
+    with open(path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+
+    print("\nStage timings (wall / cpu / peak RSS):")
+    for record in stage_metrics:
+        if record['status'] == 'reused':
+            print(f"  {record['stage']:<14} reused")
         else:
-            print(f"Analyzed trends across {trend_results['session_count']} sessions")
-            print(f"Metrics analyzed: {len(trend_results['metrics_analyzed'])}")
-            
-            overall = trend_results['trend_summaries']['overall']
-            print(f"\nOverall assessment: {overall['overall_assessment']}")
-            print(f"  Improving: {overall['improving_count']} metrics")
-            print(f"  Stable: {overall['flat_count']} metrics")
-            print(f"  Regressing: {overall['regressing_count']} metrics")
-    else:
-        print("\nInsufficient data for trend analysis (need >=2 sessions)")
-        trend_results = None
-    
-    # Save outputs
-    output_dir = Path(telemetry_dir).parent / "processed"
+            rss = f"{record['peak_rss_mb']:.0f} MB" if record['peak_rss_mb'] is not None else "n/a"
+            print(f"  {record['stage']:<14} {record['wall_seconds']:7.3f}s / {record['cpu_seconds']:7.3f}s / {rss}")
+
+def session_dates(sessions_df, session_index):
+    """UTC start date (YYYY-MM-DD) per session row, for partitioning session tables"""
+    import pandas as pd
+
+    start_times = sessions_df['session_id'].map(session_index.set_index('session_id')['start_time'])
+    return pd.to_datetime(start_times, unit='s', utc=True).dt.strftime('%Y-%m-%d')
+
+def save_outputs(runner: PipelineRunner, output_dir: Path, table_format: str = "csv"):
+    """Write the processed/ files for every artifact the runner's stages produce"""
+    def artifact(name):
+        return runner.artifact(name) if runner.produces(name) else None
+
     output_dir.mkdir(exist_ok=True)
-    
-    attempts_df.to_csv(output_dir / "attempt_features.csv", index=False)
-    sessions_df.to_csv(output_dir / "session_features.csv", index=False)
-    
+    write_csv = table_format in ("csv", "both")
+    write_columnar = table_format in ("columnar", "both")
+    if write_columnar:
+        from columnar_store import write_table, write_table_chunks
+
+    attempts_df = artifact('attempts_df')
+    attempt_chunks = artifact('attempt_chunks')
+    sessions_df = artifact('sessions_df')
+    if attempts_df is not None:
+        if write_csv:
+            attempts_df.to_csv(output_dir / "attempt_features.csv", index=False)
+        if write_columnar:
+            write_table(attempts_df, output_dir / "attempt_features", partition_by='minigame_id')
+    if attempt_chunks is not None:
+        # Out-of-core run: both formats are written one spilled chunk at a time
+        if write_csv:
+            attempt_chunks.to_csv(output_dir / "attempt_features.csv")
+        if write_columnar:
+            write_table_chunks(attempt_chunks.aligned(), output_dir / "attempt_features", partition_by='minigame_id')
+    if sessions_df is not None:
+        if write_csv:
+            sessions_df.to_csv(output_dir / "session_features.csv", index=False)
+        if write_columnar:
+            write_table(sessions_df, output_dir / "session_features", partition_by='date',
+                        partition_values=session_dates(sessions_df, runner.artifact('session_index')))
+
+    clustering_results = artifact('clustering_results')
     if clustering_results and clustering_results.get('kmeans', {}).get('best_k') is not None:
         with open(output_dir / "clustering_results.json", 'w') as f:
             # Convert numpy types to native Python for JSON serialization
@@ -166,36 +170,195 @@ def main():
                 }
             }
             json.dump(serializable_results, f, indent=2)
-        
+
         with open(output_dir / "cluster_interpretations.json", 'w') as f:
-            json.dump(interpretations, f, indent=2)
-    
+            json.dump(runner.artifact('interpretations'), f, indent=2)
+
+        runner.artifact('cluster_engine').save(output_dir / "cluster_model.npz")
+
+    training_results = artifact('training_results')
+    session_explanations = artifact('session_explanations')
+    inference_engine = artifact('inference_engine')
+    evaluation = artifact('evaluation')
     if training_results:
         with open(output_dir / "weakness_training_results.json", 'w') as f:
             json.dump(training_results, f, indent=2)
-        
+
         with open(output_dir / "weakness_explanations.json", 'w') as f:
-            json.dump(explanations, f, indent=2)
-        
+            json.dump(runner.artifact('explanations'), f, indent=2)
+
         with open(output_dir / "weakness_predictions.json", 'w') as f:
-            json.dump(predictions, f, indent=2)
-    
+            json.dump(runner.artifact('predictions'), f, indent=2)
+
+        if session_explanations:
+            session_explanations.save(output_dir / "weakness_session_explanations.npz")
+
+        if inference_engine:
+            inference_engine.save(output_dir / "weakness_inference.npz")
+
+        if evaluation:
+            with open(output_dir / "weakness_evaluation.json", 'w') as f:
+                json.dump(evaluation, f, indent=2)
+
+    trend_results = artifact('trend_results')
+    trend_series = artifact('trend_series')
     if trend_results:
         with open(output_dir / "trend_analysis.json", 'w') as f:
             json.dump(trend_results, f, indent=2)
-    
+
+        if trend_series:
+            trend_series.save(output_dir / "trend_series")
+            runner.artifact('trend_views').save(output_dir / "trend_views")
+
+        runner.artifact('trend_state').save(output_dir / "trend_state.json")
+
+    player_trends_file = artifact('player_trends_file')
+    player_statistics = artifact('player_statistics')
+    if player_trends_file:
+        shutil.copyfile(player_trends_file, output_dir / "player_trends.jsonl")
+    if player_statistics is not None:
+        player_statistics.to_csv(output_dir / "player_trend_statistics.csv", index=False)
+
+    insights_file = artifact('insights_file')
+    if insights_file:
+        shutil.copyfile(insights_file, output_dir / "insights.jsonl")
+
     print(f"\nAnalysis complete. Results saved to {output_dir}")
-    print("  - attempt_features.csv: Per-attempt metrics")
-    print("  - session_features.csv: Per-session aggregated metrics")
+    print("  - session_index.csv: Session start times and source files")
+    if attempts_df is not None or attempt_chunks is not None:
+        if write_csv:
+            print("  - attempt_features.csv: Per-attempt metrics")
+        if write_columnar:
+            print("  - attempt_features/: Per-attempt metrics, columnar .npy partitioned by minigame")
+    if sessions_df is not None:
+        if write_csv:
+            print("  - session_features.csv: Per-session aggregated metrics")
+        if write_columnar:
+            print("  - session_features/: Per-session aggregated metrics, columnar .npy partitioned by start date")
     if clustering_results and clustering_results.get('kmeans', {}).get('best_k') is not None:
         print("  - clustering_results.json: Clustering model performance")
         print("  - cluster_interpretations.json: Player archetype descriptions")
+        print("  - cluster_model.npz: Scaler and chosen cluster model for assigning new sessions")
     if training_results:
         print("  - weakness_training_results.json: Model training statistics")
         print("  - weakness_explanations.json: Feature importance and decision rules")
         print("  - weakness_predictions.json: Per-session weakness probabilities")
+        if session_explanations:
+            print("  - weakness_session_explanations.npz: Per-session top feature contributions")
+        if inference_engine:
+            print("  - weakness_inference.npz: Stacked weakness models for fast scoring")
+        if evaluation:
+            print("  - weakness_evaluation.json: Cross-validated precision, recall, AUC and calibration")
     if trend_results:
         print("  - trend_analysis.json: Improvement trends and performance trajectories")
+        if trend_series:
+            print("  - trend_series/: Raw and smoothed metric series (memory-mappable .npy)")
+            print("  - trend_views/: Per-session/day/week min/mean/max trend buckets")
+        print("  - trend_state.json: Incremental trend state for per-session updates")
+    if insights_file:
+        print(f"  - insights.jsonl: {runner.artifact('insight_count')} structured insights per session and for the trend history")
+    if player_trends_file:
+        print("  - player_trends.jsonl: Per-player trend classifications (one record per player)")
+        if player_statistics is not None:
+            print("  - player_trend_statistics.csv: Per-player x metric slope CI and Mann-Kendall tests")
+    print("  - stage_cache/: Cached stage outputs reused by later runs")
+    print("  - run_metrics.json: Per-stage wall/CPU time, peak RSS and row counts")
+
+def follow_telemetry(telemetry_dir, interval: float = 0.25, max_polls: int = None):
+    """Keep processed/live_session_features.csv current while sessions are being played.
+
+    Polls every `interval` seconds, reading only newly appended telemetry
+    lines; the CSV is replaced atomically whenever a session changes.
+    """
+    from telemetry_follower import TelemetryFollower
+
+    output_dir = Path(telemetry_dir).parent / "processed"
+    output_dir.mkdir(exist_ok=True)
+    live_path = output_dir / "live_session_features.csv"
+    follower = TelemetryFollower(telemetry_dir)
+    print(f"Following {telemetry_dir} (Ctrl+C to stop); live features in {live_path}")
+
+    polls = 0
+    try:
+        while max_polls is None or polls < max_polls:
+            changed = follower.poll()
+            if changed:
+                tmp_path = live_path.with_suffix('.csv.tmp')
+                follower.session_features().to_csv(tmp_path, index=False)
+                os.replace(tmp_path, live_path)
+                print(f"[{time.strftime('%H:%M:%S')}] updated {len(changed)} session(s); "
+                      f"{len(follower.features)} sessions, {follower.event_count} events")
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    return follower
+
+def build_parser() -> argparse.ArgumentParser:
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("telemetry_directory")
+    options.add_argument("--evaluate", action="store_true",
+                         help="cross-validate weakness models and write weakness_evaluation.json")
+    options.add_argument("--player-map", metavar="CSV",
+                         help="CSV mapping session_id to player_id; enables per-player trends (player_trends.jsonl)")
+    options.add_argument("--trend-method", choices=["threshold", "statistical"], default="threshold",
+                         help="classify trends by relative change (default) or by OLS/Mann-Kendall significance")
+    options.add_argument("--trend-threshold", type=float, default=0.1,
+                         help="relative change that counts as improving/regressing (default 0.1)")
+    options.add_argument("--profile", action="store_true",
+                         help="re-run every stage under cProfile and write processed/profiles/<stage>.prof")
+    options.add_argument("--table-format", choices=["csv", "columnar", "both"], default="csv",
+                         help="attempt/session feature tables as CSV (default), columnar .npy partitions, or both")
+    options.add_argument("--memory-budget", metavar="SIZE",
+                         help="process telemetry out of core in chunks that fit SIZE (e.g. 2G or 512M), "
+                              "spilling intermediate tables to disk")
+
+    parser = argparse.ArgumentParser(description="Telemetry analytics pipeline")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("validate", parents=[options], help="load and validate telemetry only")
+    commands.add_parser("features", parents=[options], help="extract attempt and session features")
+    commands.add_parser("cluster", parents=[options], help="cluster sessions into player archetypes")
+    commands.add_parser("weakness", parents=[options], help="train and export weakness classifiers")
+    commands.add_parser("trends", parents=[options], help="analyze improvement trends")
+    commands.add_parser("all", parents=[options], help="run the full pipeline (default)")
+    follow = commands.add_parser("follow", help="tail session files as they are written and keep session features live")
+    follow.add_argument("telemetry_directory")
+    follow.add_argument("--interval", type=float, default=0.25, help="seconds between polls (default 0.25)")
+    return parser
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # `analyze.py <dir> [options]` keeps running the full pipeline
+    if argv and argv[0] not in list(COMMAND_TARGETS) + ["follow", "-h", "--help"]:
+        argv.insert(0, "all")
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+
+    telemetry_dir = args.telemetry_directory
+    if not Path(telemetry_dir).exists():
+        print(f"Error: Directory {telemetry_dir} does not exist")
+        sys.exit(1)
+
+    if args.command == "follow":
+        follow_telemetry(telemetry_dir, interval=args.interval)
+        return
+
+    memory_budget = None
+    if args.memory_budget:
+        from chunked_frames import parse_memory_budget
+        try:
+            memory_budget = parse_memory_budget(args.memory_budget)
+        except ValueError as e:
+            parser.error(str(e))
+
+    run_analysis(telemetry_dir, evaluate=args.evaluate, player_map=args.player_map,
+                 trend_method=args.trend_method, trend_threshold=args.trend_threshold,
+                 command=args.command, table_format=args.table_format, profile=args.profile,
+                 memory_budget=memory_budget)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
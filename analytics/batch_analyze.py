@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+# Modules every stage worker needs; importing them once per worker process
+# means each directory after the first pays no import cost.
+WARM_MODULES = [
+    'telemetry_loader', 'validator', 'feature_extractor', 'session_aggregator', 'feature_selector',
+    'clustering', 'weakness_classifier', 'weakness_evaluation', 'trend_analyzer', 'trend_state',
+    'insight_engine'
+]
+LOG_FILE = "analysis_log.txt"
+
+def expand_directories(patterns: Sequence[str]) -> List[Path]:
+    """Telemetry directories named by paths or glob patterns, in order and without duplicates"""
+    directories = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for match in matches:
+            path = Path(match)
+            if path.is_dir() and path.resolve() not in [d.resolve() for d in directories]:
+                directories.append(path)
+    return directories
+
+def warm_worker():
+    """Pool initializer: import the analysis stack once per worker process"""
+    import importlib
+    for module in WARM_MODULES:
+        importlib.import_module(module)
+
+def analyze_directory(telemetry_dir: str, options: Dict) -> Dict:
+    """Run the full pipeline for one directory, logging its report to processed/analysis_log.txt.
+
+    Failures are caught and returned so one bad tenant does not stop the batch.
+    """
+    from analyze import run_analysis
+
+    output_dir = Path(telemetry_dir).parent / "processed"
+    record = {'telemetry_dir': str(telemetry_dir), 'output_dir': str(output_dir), 'status': 'ok',
+              'stages_ran': [], 'stages_reused': [], 'error': None}
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            result = run_analysis(telemetry_dir, **options)
+        if result is None:
+            record['status'] = 'empty'
+        else:
+            record['stages_ran'] = [entry['stage'] for entry in result['stages'] if entry['status'] == 'ran']
+            record['stages_reused'] = [entry['stage'] for entry in result['stages'] if entry['status'] == 'reused']
+    except (Exception, SystemExit) as e:
+        # validate_stage exits on invalid telemetry; report it like any other failure
+        record['status'] = 'failed'
+        record['error'] = f"exit status {e.code}" if isinstance(e, SystemExit) else f"{type(e).__name__}: {e}"
+        log.write(traceback.format_exc())
+    record['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / LOG_FILE).write_text(log.getvalue())
+    return record
+
+def analyze_in_worker(telemetry_dir: str, options: Dict) -> Dict:
+    """analyze_directory for a pool worker, stopping the run's joblib workers afterwards.
+
+    A pool worker joins its child processes on exit, and idle loky workers
+    only time out after five minutes, so left running they stall the pool's
+    shutdown.
+    """
+    try:
+        return analyze_directory(telemetry_dir, options)
+    finally:
+        from joblib.externals.loky import get_reusable_executor
+        get_reusable_executor().shutdown(wait=True)
+
+def run_batch(directories: Sequence[Path], workers: int = 1, **options) -> Dict:
+    """Analyze many telemetry directories, each writing to its own processed/ folder.
+
+    With more than one worker the directories are spread over a process pool
+    whose workers import the analysis stack once and reuse it, and each run's
+    joblib pools get an equal share of the cores (n_jobs = cores // workers,
+    at least 1) unless n_jobs is given. Returns the consolidated summary.
+    """
+    output_dirs = [Path(d).resolve().parent / "processed" for d in directories]
+    shared = {str(d) for d in output_dirs if output_dirs.count(d) > 1}
+    if shared:
+        raise ValueError(f"Telemetry directories share an output folder: {', '.join(sorted(shared))}")
+
+    if workers > 1:
+        # Otherwise every worker's classifier and trend pools would each claim every core
+        options.setdefault('n_jobs', max(1, (os.cpu_count() or 1) // workers))
+
+    start = time.perf_counter()
+    records = []
+
+    def report(record):
+        records.append(record)
+        detail = record['error'] or f"{len(record['stages_ran'])} stages ran, {len(record['stages_reused'])} reused"
+        print(f"  [{record['status']}] {record['telemetry_dir']} ({record['elapsed_seconds']:.2f}s) {detail}")
+
+    print(f"Analyzing {len(directories)} telemetry directories with {workers} worker(s)")
+    if workers <= 1:
+        for directory in directories:
+            report(analyze_directory(str(directory), options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=warm_worker) as pool:
+            futures = [pool.submit(analyze_in_worker, str(directory), options) for directory in directories]
+            for future in as_completed(futures):
+                report(future.result())
+
+    order = {str(directory): i for i, directory in enumerate(directories)}
+    records.sort(key=lambda record: order[record['telemetry_dir']])
+    statuses = [record['status'] for record in records]
+    return {
+        'directory_count': len(records),
+        'succeeded': statuses.count('ok'),
+        'empty': statuses.count('empty'),
+        'failed': statuses.count('failed'),
+        'workers': workers,
+        'options': options,
+        'elapsed_seconds': round(time.perf_counter() - start, 3),
+        'directories': records
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the telemetry analytics pipeline over many directories")
+    parser.add_argument("telemetry_directories", nargs="+", metavar="DIR_OR_GLOB",
+                        help="telemetry directories or glob patterns (e.g. 'tenants/*/telemetry')")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--summary", default="batch_summary.json",
+                        help="where to write the consolidated run summary (default batch_summary.json)")
+    parser.add_argument("--evaluate", action="store_true",
+                        help="cross-validate weakness models and write weakness_evaluation.json")
+    parser.add_argument("--trend-method", choices=["threshold", "statistical"], default="threshold",
+                        help="classify trends by relative change (default) or by OLS/Mann-Kendall significance")
+    parser.add_argument("--trend-threshold", type=float, default=0.1,
+                        help="relative change that counts as improving/regressing (default 0.1)")
+    parser.add_argument("--table-format", choices=["csv", "columnar", "both"], default="csv",
+                        help="attempt/session feature tables as CSV (default), columnar .npy partitions, or both")
+    parser.add_argument("--memory-budget", metavar="SIZE",
+                        help="per-directory memory budget for out-of-core processing (e.g. 2G or 512M)")
+    args = parser.parse_args()
+
+    memory_budget = None
+    if args.memory_budget:
+        from chunked_frames import parse_memory_budget
+        try:
+            memory_budget = parse_memory_budget(args.memory_budget)
+        except ValueError as e:
+            parser.error(str(e))
+
+    directories = expand_directories(args.telemetry_directories)
+    if not directories:
+        print("Error: no telemetry directories matched")
+        sys.exit(1)
+
+    summary = run_batch(directories, workers=min(args.workers, len(directories)), evaluate=args.evaluate,
+                        trend_method=args.trend_method, trend_threshold=args.trend_threshold,
+                        table_format=args.table_format, memory_budget=memory_budget)
+    with open(args.summary, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\nBatch complete in {summary['elapsed_seconds']:.1f}s: {summary['succeeded']} succeeded, "
+          f"{summary['empty']} empty, {summary['failed']} failed")
+    print(f"Summary written to {args.summary}; per-directory reports in processed/{LOG_FILE}")
+    if summary['failed']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
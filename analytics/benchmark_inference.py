@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import time
+import numpy as np
+import pandas as pd
+from weakness_classifier import WeaknessClassifier
+from test_weakness_classifier import create_test_data
+
+def make_sessions(n_sessions: int, columns, seed: int = 0) -> pd.DataFrame:
+    """Random session features drawn from the test data's value ranges"""
+    rng = np.random.default_rng(seed)
+    template = create_test_data()
+    data = {'session_id': [f'bench_session_{i}' for i in range(n_sessions)]}
+    for col in columns:
+        low, high = template[col].min(), template[col].max()
+        data[col] = rng.uniform(low, high, n_sessions)
+    return pd.DataFrame(data)
+
+def time_call(fn, repeats: int) -> float:
+    """Best-of-N wall time in milliseconds"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    train_df = create_test_data()
+    classifier = WeaknessClassifier()
+    labels_df = classifier.define_weakness_labels(train_df)
+    classifier.train_weakness_models(train_df, labels_df)
+    engine = classifier.export_inference_engine()
+    
+    columns = [col for col in train_df.columns if col != 'session_id']
+    
+    print("=== Weakness Inference Benchmark ===")
+    print(f"{len(engine.weakness_names)} weaknesses x {len(engine.feature_names)} features\n")
+    
+    single_df = make_sessions(1, columns)
+    single_X = engine.to_matrix(single_df)
+    print("Single session:")
+    print(f"  WeaknessClassifier.predict_weaknesses: {time_call(lambda: classifier.predict_weaknesses(single_df), 200):.3f} ms")
+    print(f"  engine.predict_weaknesses (DataFrame): {time_call(lambda: engine.predict_weaknesses(single_df), 200):.3f} ms")
+    print(f"  engine.predict_proba (array):          {time_call(lambda: engine.predict_proba(single_X), 200):.3f} ms")
+    
+    batch_df = make_sessions(100_000, columns)
+    batch_X = engine.to_matrix(batch_df)
+    print("\n100k-session batch:")
+    print(f"  WeaknessClassifier.predict_weaknesses: {time_call(lambda: classifier.predict_weaknesses(batch_df), 3):.1f} ms")
+    print(f"  engine.predict_weaknesses (DataFrame): {time_call(lambda: engine.predict_weaknesses(batch_df), 3):.1f} ms")
+    print(f"  engine.predict_proba (array):          {time_call(lambda: engine.predict_proba(batch_X), 10):.1f} ms")
+
+if __name__ == "__main__":
+    main()
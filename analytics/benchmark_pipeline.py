@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+from telemetry_generator import generate_telemetry
+
+ANALYZE = Path(__file__).parent / "analyze.py"
+BASELINE_FILE = Path(__file__).parent / "benchmarks" / "pipeline_baseline.json"
+SCALES = {'10': 10, '10k': 10_000, '1m': 1_000_000}
+DEFAULT_SCALES = ['10', '10k']
+# Small runs are dominated by import and scheduling noise, so they take the best of several
+REPEATS = {'10': 5, '10k': 1, '1m': 1}
+CORPUS_FILE = "corpus.json"
+
+def prepare_corpus(root: Path, n_sessions: int, seed: int) -> Dict:
+    """Generate telemetry and a player map under root, reusing a matching corpus from an earlier run"""
+    marker = root / CORPUS_FILE
+    if marker.exists():
+        corpus = json.loads(marker.read_text())
+        if corpus['sessions'] == n_sessions and corpus['seed'] == seed:
+            return corpus
+    shutil.rmtree(root, ignore_errors=True)
+
+    start = time.perf_counter()
+    corpus = generate_telemetry(root / "telemetry", n_sessions, seed=seed, player_map=root / "player_map.csv")
+    corpus.update({'seed': seed, 'generate_seconds': round(time.perf_counter() - start, 3)})
+    marker.write_text(json.dumps(corpus, indent=2))
+    return corpus
+
+def run_scale(root: Path, extra_args: List[str]) -> Dict:
+    """Cold full-pipeline run in a fresh interpreter; returns its run_metrics.json"""
+    shutil.rmtree(root / "processed", ignore_errors=True)
+    command = [sys.executable, str(ANALYZE), "all", str(root / "telemetry"), "--evaluate",
+               "--player-map", str(root / "player_map.csv"), *extra_args]
+    start = time.perf_counter()
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+    metrics = json.loads((root / "processed" / "run_metrics.json").read_text())
+    metrics['process_seconds'] = round(elapsed, 3)
+    return metrics
+
+def best_run(root: Path, extra_args: List[str], repeats: int) -> Dict:
+    """run_scale repeated; each stage keeps its fastest wall time (as in benchmark_startup)"""
+    runs = [run_scale(root, extra_args) for _ in range(repeats)]
+    best = min(runs, key=lambda metrics: metrics['process_seconds'])
+    for record in best['stages']:
+        record['wall_seconds'] = min(stage['wall_seconds'] for metrics in runs
+                                     for stage in metrics['stages'] if stage['stage'] == record['stage'])
+    return best
+
+def scale_result(corpus: Dict, metrics: Dict) -> Dict:
+    return {
+        'sessions': corpus['sessions'],
+        'events': corpus['events'],
+        'process_seconds': metrics['process_seconds'],
+        'stage_wall_seconds': metrics['stage_wall_seconds'],
+        'peak_rss_mb': metrics['peak_rss_mb'],
+        'stages': {record['stage']: {key: record.get(key) for key in
+                                     ('wall_seconds', 'cpu_seconds', 'peak_rss_mb', 'rows_out')}
+                   for record in metrics['stages']}
+    }
+
+def machine_info() -> Dict:
+    return {'platform': platform.platform(), 'machine': platform.machine(), 'cpu_count': os.cpu_count(),
+            'python': platform.python_version()}
+
+def compare(current: Dict, baseline: Dict, tolerance: float, min_seconds: float) -> List[str]:
+    """Regressions of one scale against its baseline.
+
+    A stage regresses when its wall time exceeds the baseline by more than
+    tolerance (a fraction) and by at least min_seconds, so noise on
+    millisecond stages is ignored. Peak RSS uses the same tolerance.
+    """
+    regressions = []
+    for stage, base in baseline['stages'].items():
+        now = current['stages'].get(stage)
+        if now is None or now['wall_seconds'] is None or base['wall_seconds'] is None:
+            continue
+        if now['wall_seconds'] > base['wall_seconds'] * (1 + tolerance) and \
+                now['wall_seconds'] - base['wall_seconds'] >= min_seconds:
+            regressions.append(f"{stage}: {base['wall_seconds']:.3f}s -> {now['wall_seconds']:.3f}s")
+
+    if current['peak_rss_mb'] and baseline['peak_rss_mb'] and \
+            current['peak_rss_mb'] > baseline['peak_rss_mb'] * (1 + tolerance):
+        regressions.append(f"peak RSS: {baseline['peak_rss_mb']:.0f} MB -> {current['peak_rss_mb']:.0f} MB")
+    return regressions
+
+def print_scale(name: str, result: Dict, baseline: Dict = None):
+    print(f"\n--- {name}: {result['sessions']} sessions, {result['events']} events ---")
+    for stage, record in result['stages'].items():
+        line = f"  {stage:<14} {record['wall_seconds']:9.3f}s"
+        base = (baseline or {}).get('stages', {}).get(stage)
+        if base and base['wall_seconds']:
+            line += f"   baseline {base['wall_seconds']:9.3f}s ({record['wall_seconds'] / base['wall_seconds']:.2f}x)"
+        print(line)
+    print(f"  {'process':<14} {result['process_seconds']:9.3f}s   peak RSS {result['peak_rss_mb']} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every pipeline stage on synthetic telemetry and compare to a baseline")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=DEFAULT_SCALES,
+                        help="corpus sizes to run (default: 10 10k; 1m takes hours and tens of GB)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", help="keep generated corpora here and reuse them (default: temporary)")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help=f"baseline file (default {BASELINE_FILE.name})")
+    parser.add_argument("--save-baseline", action="store_true", help="record these results as the new baseline")
+    parser.add_argument("--repeats", type=int, help="runs per scale, best time kept (default 5 for 10, else 1)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="ignore slowdowns smaller than this many seconds (default 0.05)")
+    parser.add_argument("--analyze-args", nargs=argparse.REMAINDER, default=[],
+                        help="extra arguments passed to analyze.py (must come last)")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline)
+    baselines = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix="pipeline_bench_"))
+
+    print("=== Pipeline Benchmark ===")
+    if baselines and baselines.get('machine') != machine_info():
+        print("Note: baseline was recorded on a different machine; timings are not directly comparable")
+
+    results = {}
+    regressions = {}
+    try:
+        for name in args.scales:
+            root = work_dir / name
+            corpus = prepare_corpus(root, SCALES[name], args.seed)
+            repeats = args.repeats or REPEATS[name]
+            results[name] = scale_result(corpus, best_run(root, args.analyze_args, repeats))
+            baseline = baselines.get('scales', {}).get(name)
+            print_scale(name, results[name], baseline)
+            if baseline and not args.save_baseline:
+                regressions[name] = compare(results[name], baseline, args.tolerance, args.min_seconds)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.save_baseline:
+        baselines['machine'] = machine_info()
+        baselines['recorded_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        baselines['seed'] = args.seed
+        baselines.setdefault('scales', {}).update(results)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"\nBaseline written to {baseline_path}")
+        return
+
+    found = {name: items for name, items in regressions.items() if items}
+    if found:
+        print(f"\nRegressions (over {args.tolerance:.0%} slower than baseline):")
+        for name, items in found.items():
+            for item in items:
+                print(f"  [{name}] {item}")
+        sys.exit(1)
+    print("\nNo regressions against baseline" if regressions else "\nNo baseline to compare against")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+from analytics_service import start_server
+
+def post(url: str, body: bytes) -> float:
+    """Round-trip time in milliseconds for one session request"""
+    start = time.perf_counter()
+    with urllib.request.urlopen(urllib.request.Request(url, data=body)) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+def run_load(url: str, bodies, n_requests: int, concurrency: int):
+    requests = [bodies[i % len(bodies)] for i in range(n_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = np.array(list(pool.map(lambda body: post(url, body), requests)))
+    return latencies, time.perf_counter() - start
+
+def report(name: str, latencies: np.ndarray, elapsed: float, batch_sizes):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    print(f"  {name:<28} p50 {p50:6.1f} ms  p95 {p95:6.1f} ms  p99 {p99:6.1f} ms  "
+          f"{len(latencies) / elapsed:7.1f} req/s  mean batch {np.mean(batch_sizes):.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency benchmark for analytics_service.py")
+    parser.add_argument("processed_directory", help="processed/ folder written by analyze.py")
+    parser.add_argument("telemetry_directory", help="session CSVs to replay as requests")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    bodies = [path.read_bytes() for path in sorted(Path(args.telemetry_directory).glob("*.csv"))]
+    if not bodies:
+        print(f"Error: no session CSVs in {args.telemetry_directory}")
+        raise SystemExit(1)
+
+    print("=== Analytics Service Latency Benchmark ===")
+    print(f"{args.requests} requests from {len(bodies)} session files, concurrency {args.concurrency}\n")
+
+    for name, concurrency, max_batch in [
+        ("sequential", 1, 32),
+        ("concurrent, no batching", args.concurrency, 1),
+        ("concurrent, batched", args.concurrency, 32)
+    ]:
+        server, batcher = start_server(args.processed_directory, port=0, max_batch=max_batch)
+        url = f"http://127.0.0.1:{server.server_address[1]}/sessions"
+        post(url, bodies[0])  # warm-up
+        batcher.batch_sizes.clear()
+        latencies, elapsed = run_load(url, bodies, args.requests, concurrency)
+        report(name, latencies, elapsed, batcher.batch_sizes)
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+if __name__ == "__main__":
+    main()
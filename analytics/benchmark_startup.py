@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ANALYZE = Path(__file__).parent / "analyze.py"
+BUDGET_SECONDS = 1.0
+HEADER = "session_id,minigame_id,event_type,timestamp_ms,payload\n"
+
+def write_telemetry(directory: Path, n_sessions: int = 5):
+    for i in range(n_sessions):
+        (directory / f"s{i}.csv").write_text(
+            HEADER +
+            f's{i},anti_air_reaction_test,minigame_start,1000,"{{}}"\n' +
+            f's{i},anti_air_reaction_test,minigame_end,5000,"{{}}"\n'
+        )
+
+def time_command(args, repeats: int) -> float:
+    """Best-of-N wall time in seconds for a fresh interpreter running args"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, capture_output=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = Path(tmp) / "telemetry"
+        telemetry.mkdir()
+        write_telemetry(telemetry)
+
+        # The first validate run fills the stage cache; both cold and cached runs are timed
+        timings = {
+            'analyze --help': time_command([str(ANALYZE), "--help"], 5),
+            'validate (cold cache)': time_command([str(ANALYZE), "validate", str(telemetry)], 1),
+            'validate (cached)': time_command([str(ANALYZE), "validate", str(telemetry)], 5)
+        }
+
+    print("=== CLI Startup Benchmark ===")
+    print(f"Budget: {BUDGET_SECONDS:.2f} s per command\n")
+    for name, seconds in timings.items():
+        print(f"  {name:<22} {seconds:.3f} s")
+
+    over = [name for name, seconds in timings.items() if seconds > BUDGET_SECONDS]
+    if over:
+        print(f"\nOver budget: {', '.join(over)}")
+        sys.exit(1)
+    print("\nAll commands within budget")
+
+if __name__ == "__main__":
+    main()
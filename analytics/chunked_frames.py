@@ -0,0 +1,120 @@
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List
+import pandas as pd
+
+# Out-of-core support for --memory-budget runs: the loader reads telemetry
+# in chunks of whole session files, and each per-session stage (validate,
+# extract, aggregate) holds one chunk at a time, spilling its output to
+# disk. Only the aggregated session matrix is kept in memory for the
+# global stages (clustering, classifiers, trends).
+#
+# Chunk sizes come from the budget. Loading, validating and extracting a
+# chunk peaks at roughly 5x its CSV size (pandas frames plus the
+# extractor's per-session copies), and each aggregated session row costs
+# a few hundred bytes. Both constants are rounded up from measurements on
+# generated telemetry.
+#
+# Chunks are also capped at MAX_CHUNK_SESSIONS files: the validator,
+# extractor and aggregator filter the whole chunk once per session, so
+# their per-session cost grows with chunk size (flat up to ~1000 sessions,
+# doubling by 4000).
+
+WORKING_SET_PER_CSV_BYTE = 8
+SESSION_ROW_BYTES = 512
+MIN_CHUNK_BYTES = 256 * 2**10
+MAX_CHUNK_SESSIONS = 1000
+UNITS = {'': 2**20, 'K': 2**10, 'M': 2**20, 'G': 2**30, 'T': 2**40}
+
+def parse_memory_budget(text: str) -> int:
+    """Bytes from '512M', '2GB', '1.5g' or a bare number of megabytes"""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*', str(text), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid memory budget {text!r} (expected e.g. 512M or 2G)")
+    return int(float(match.group(1)) * UNITS[match.group(2).upper()])
+
+def chunk_bytes(memory_budget: int, n_sessions: int, resident_bytes: int = 0) -> int:
+    """CSV bytes to read per chunk so one chunk fits in what the budget leaves.
+
+    resident_bytes is what the process already holds (interpreter and
+    libraries); the session matrix for n_sessions is reserved as well.
+    Never less than MIN_CHUNK_BYTES, so a budget below the fixed cost
+    still makes progress one small chunk at a time.
+    """
+    available = memory_budget - resident_bytes - n_sessions * SESSION_ROW_BYTES
+    return max(int(available / WORKING_SET_PER_CSV_BYTE), MIN_CHUNK_BYTES)
+
+class SpilledFrames:
+    """A table kept on disk as a sequence of DataFrame chunks, read back one at a time.
+
+    Chunks may have different columns (attempt features depend on the
+    minigames in the chunk); `columns` is their union in order of first
+    appearance, as pd.concat would give. The object itself only holds
+    paths, so it is cheap to cache and pass between stages.
+    """
+
+    def __init__(self, directory, prefix: str):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.paths: List[Path] = []
+        self.columns: List[str] = []
+        self.dtypes: List[Dict[str, str]] = []
+        self.rows = 0
+
+    @property
+    def shape(self):
+        return (self.rows, len(self.columns))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        import joblib
+        for path in self.paths:
+            yield joblib.load(path)
+
+    def append(self, df: pd.DataFrame) -> None:
+        import joblib
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.prefix}_{len(self.paths):05d}.joblib"
+        joblib.dump(df, path)
+        self.paths.append(path)
+        self.columns.extend(column for column in df.columns if column not in self.columns)
+        # All-missing columns (None from the extractor) say nothing about the merged dtype
+        self.dtypes.append({column: str(dtype) for column, dtype in df.dtypes.items() if df[column].notna().any()})
+        self.rows += len(df)
+
+    def to_frame(self) -> pd.DataFrame:
+        """All chunks in one frame; loads the whole table, so only for small ones"""
+        frames = list(self.aligned())
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def to_csv(self, path) -> None:
+        """Write the chunks as one CSV without loading them all"""
+        with open(path, 'w', newline='') as f:
+            for i, chunk in enumerate(self.aligned()):
+                chunk.to_csv(f, index=False, header=i == 0)
+        if not self.paths:
+            Path(path).write_text("\n")
+
+    def aligned(self) -> Iterator[pd.DataFrame]:
+        """Chunks with every column, typed as if the whole table had been built in one frame.
+
+        A numeric column that is missing (or all-missing) in some chunk, or
+        mixes int and float, is float64 with NaN gaps, as when the
+        extractor's records go into a single DataFrame.
+        """
+        merged = {}
+        for column in self.columns:
+            kinds = [dtypes.get(column) for dtypes in self.dtypes]
+            present = [kind for kind in kinds if kind is not None]
+            if present and len(set(kinds)) > 1 and all(_is_numeric(kind) for kind in present):
+                merged[column] = 'float64'
+        for chunk in self:
+            chunk = chunk.reindex(columns=self.columns)
+            for column, dtype in merged.items():
+                chunk[column] = chunk[column].astype(dtype)
+            yield chunk
+
+def _is_numeric(dtype: str) -> bool:
+    return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype)) and not dtype.startswith('bool')
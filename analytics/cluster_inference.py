@@ -0,0 +1,114 @@
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from typing import Dict, List
+
+class ClusterInferenceEngine:
+    """Assigns new sessions to the archetypes of a fitted PlayerClustering.
+
+    Holds the selected style features, their fill values, the scaler
+    statistics and the chosen model's parameters as plain arrays, so
+    assignment needs no sklearn calls:
+
+        kmeans  nearest centroid in scaled space
+        gmm     argmax of log(weight) + Gaussian log-density, using the
+                fitted precision Cholesky factors
+    """
+
+    def __init__(self, method: str, feature_names: List[str], fill_values: np.ndarray, mean: np.ndarray,
+                 scale: np.ndarray, centers: np.ndarray, descriptions: List[str],
+                 weights: np.ndarray = None, precisions_cholesky: np.ndarray = None):
+        if method not in ('kmeans', 'gmm'):
+            raise ValueError(f"Unknown clustering method: {method}")
+        self.method = method
+        self.feature_names = list(feature_names)
+        self.fill_values = np.asarray(fill_values, dtype=np.float64)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.centers = np.asarray(centers, dtype=np.float64)
+        self.descriptions = list(descriptions)
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+        self.precisions_cholesky = None if precisions_cholesky is None else np.asarray(precisions_cholesky, dtype=np.float64)
+
+    @classmethod
+    def from_clustering(cls, clusterer, feature_df: pd.DataFrame, interpretations: Dict) -> 'ClusterInferenceEngine':
+        """Export the model interpret_clusters picked, with feature_df's medians as fill values"""
+        method = interpretations['method_used']
+        model = clusterer.best_kmeans if method == 'kmeans' else clusterer.best_gmm
+        if model is None:
+            raise ValueError("PlayerClustering has no fitted model to export")
+
+        fill_values = np.nan_to_num(feature_df[clusterer.feature_names].median().to_numpy(dtype=np.float64))
+        cluster_info = interpretations['cluster_interpretations']
+        descriptions = [cluster_info[cluster_id]['description'] for cluster_id in sorted(cluster_info)]
+
+        if method == 'kmeans':
+            return cls(method, clusterer.feature_names, fill_values, clusterer.scaler.mean_, clusterer.scaler.scale_,
+                       model.cluster_centers_, descriptions)
+        if model.covariance_type != 'full':
+            raise ValueError(f"Unsupported GMM covariance type: {model.covariance_type}")
+        return cls(method, clusterer.feature_names, fill_values, clusterer.scaler.mean_, clusterer.scaler.scale_,
+                   model.means_, descriptions, weights=model.weights_, precisions_cholesky=model.precisions_cholesky_)
+
+    def to_matrix(self, feature_df: pd.DataFrame) -> np.ndarray:
+        """Align a session feature frame to the engine's feature order"""
+        return feature_df.reindex(columns=self.feature_names).to_numpy(dtype=np.float64)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Cluster id per row of a raw (unscaled) feature matrix"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+
+        nan_mask = np.isnan(X)
+        if nan_mask.any():
+            X = np.where(nan_mask, self.fill_values, X)
+        X = np.nan_to_num((X - self.mean) / self.scale, nan=0.0, posinf=0.0, neginf=0.0)
+
+        if self.method == 'kmeans':
+            distances = ((X[:, np.newaxis, :] - self.centers[np.newaxis, :, :]) ** 2).sum(axis=2)
+            return distances.argmin(axis=1)
+
+        # Constant terms shared by every component are dropped from the log-density
+        log_prob = np.empty((len(X), len(self.centers)))
+        for k, (center, chol) in enumerate(zip(self.centers, self.precisions_cholesky)):
+            y = (X - center) @ chol
+            log_prob[:, k] = np.log(self.weights[k]) + np.log(np.diag(chol)).sum() - 0.5 * (y ** 2).sum(axis=1)
+        return log_prob.argmax(axis=1)
+
+    def assign(self, feature_df: pd.DataFrame) -> Dict[str, Dict]:
+        """session_id -> {'cluster': id, 'description': archetype description}"""
+        labels = self.predict(self.to_matrix(feature_df))
+        return {
+            session_id: {'cluster': int(label), 'description': self.descriptions[label]}
+            for session_id, label in zip(feature_df['session_id'], labels)
+        }
+
+    def save(self, path) -> None:
+        arrays = {
+            'method': np.array(self.method),
+            'feature_names': np.array(self.feature_names),
+            'fill_values': self.fill_values,
+            'mean': self.mean,
+            'scale': self.scale,
+            'centers': self.centers,
+            'descriptions': np.array(self.descriptions)
+        }
+        if self.method == 'gmm':
+            arrays.update(weights=self.weights, precisions_cholesky=self.precisions_cholesky)
+        np.savez(Path(path), **arrays)
+
+    @classmethod
+    def load(cls, path) -> 'ClusterInferenceEngine':
+        with np.load(Path(path)) as data:
+            return cls(
+                method=str(data['method']),
+                feature_names=data['feature_names'].tolist(),
+                fill_values=data['fill_values'],
+                mean=data['mean'],
+                scale=data['scale'],
+                centers=data['centers'],
+                descriptions=data['descriptions'].tolist(),
+                weights=data['weights'] if 'weights' in data else None,
+                precisions_cholesky=data['precisions_cholesky'] if 'precisions_cholesky' in data else None
+            )
@@ -7,9 +7,13 @@ from sklearn.metrics import silhouette_score
 from typing import Dict, Tuple, List
 import json
 
+# Sessions scored for the silhouette when PlayerClustering is given a sample size
+SILHOUETTE_SAMPLE_SIZE = 10000
+
 class PlayerClustering:
-    def __init__(self, random_state=42):
+    def __init__(self, random_state=42, silhouette_sample_size=None):
         self.random_state = random_state
+        self.silhouette_sample_size = silhouette_sample_size
         self.scaler = StandardScaler()
         self.best_kmeans = None
         self.best_gmm = None
@@ -53,7 +57,7 @@ class PlayerClustering:
             labels = kmeans.fit_predict(X)
             
             if len(np.unique(labels)) > 1:  # Need at least 2 clusters for silhouette
-                score = silhouette_score(X, labels)
+                score = self._silhouette(X, labels)
                 results[k] = {
                     'silhouette_score': score,
                     'labels': labels,
@@ -71,7 +75,7 @@ class PlayerClustering:
             'best_k': best_k,
             'best_score': best_score,
             'all_results': results,
-            'session_assignments': dict(zip(session_ids, results[best_k]['labels'])) if best_k and best_k in results else {}
+            'session_assignments': dict(zip(session_ids, results[best_k]['labels'].tolist())) if best_k and best_k in results else {}
         }
     
     def _evaluate_gmm(self, X: np.ndarray, session_ids: np.ndarray) -> Dict:
@@ -86,7 +90,7 @@ class PlayerClustering:
             labels = gmm.fit_predict(X)
             
             if len(np.unique(labels)) > 1:
-                score = silhouette_score(X, labels)
+                score = self._silhouette(X, labels)
                 results[k] = {
                     'silhouette_score': score,
                     'labels': labels,
@@ -104,9 +108,16 @@ class PlayerClustering:
             'best_k': best_k,
             'best_score': best_score,
             'all_results': results,
-            'session_assignments': dict(zip(session_ids, results[best_k]['labels'])) if best_k and best_k in results else {}
+            'session_assignments': dict(zip(session_ids, results[best_k]['labels'].tolist())) if best_k and best_k in results else {}
         }
     
+    def _silhouette(self, X: np.ndarray, labels: np.ndarray) -> float:
+        """Exact silhouette, or one over a fixed random sample for large inputs"""
+        if self.silhouette_sample_size and len(X) > self.silhouette_sample_size:
+            return silhouette_score(X, labels, sample_size=self.silhouette_sample_size,
+                                    random_state=self.random_state)
+        return silhouette_score(X, labels)
+    
     def interpret_clusters(self, feature_df: pd.DataFrame, clustering_results: Dict) -> Dict:
         # Check if we have valid clustering results
         kmeans_valid = clustering_results['kmeans']['best_k'] is not None
@@ -171,6 +182,11 @@ class PlayerClustering:
             'session_assignments': assignments
         }
     
+    def export_inference_engine(self, feature_df: pd.DataFrame, interpretations: Dict):
+        """Export the chosen cluster model as a NumPy inference engine"""
+        from cluster_inference import ClusterInferenceEngine
+        return ClusterInferenceEngine.from_clustering(self, feature_df, interpretations)
+    
     def _generate_cluster_description(self, cluster_id: int, distinctive_features: List[str]) -> str:
         # Generate human-readable cluster descriptions
         descriptions = {
@@ -0,0 +1,192 @@
+import json
+import os
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Binary columnar tables: one .npy file per column and partition, so readers
+# load (or memory-map) only the columns and partitions they need, with dtypes
+# and NaN preserved. Layout:
+#
+#     session_features/
+#         manifest.json                  columns, dtypes, partition key, current version
+#         <version>/
+#             date=2023-11-14/
+#                 00000/                 one segment per written chunk
+#                     _row.npy           original row positions
+#                     <column>.npy
+#                     <column>.null.npy  missing-value mask (string columns only)
+#
+# Writers build a new version directory next to the current one and then
+# replace manifest.json atomically, so a reader never sees a half-written
+# table. The previous version is kept for readers still using it.
+
+MANIFEST = 'manifest.json'
+ROW_COLUMN = '_row'
+UNKNOWN_PARTITION = 'unknown'
+
+def write_table(df: pd.DataFrame, path, partition_by: Optional[str] = None,
+                partition_values: Optional[pd.Series] = None) -> Dict:
+    """Write df as a columnar table and return its manifest.
+
+    Rows are split by the partition_by column, or by partition_values (one
+    label per row, e.g. a date derived from another table) when the key is
+    not a column of df.
+    """
+    if partition_values is None and partition_by is not None:
+        partition_values = df[partition_by]
+    return _write_segments(Path(path), partition_by, [(df, partition_values)])
+
+def write_table_chunks(chunks: Iterable[pd.DataFrame], path, partition_by: Optional[str] = None) -> Dict:
+    """Write a table given as a sequence of frames, holding one chunk in memory at a time.
+
+    Each chunk adds a segment to every partition it has rows in; the table
+    reads back as the concatenation of the chunks. Chunks should share
+    columns and dtypes (e.g. SpilledFrames.aligned()); a column that
+    is int in one chunk and float in another is stored as float64.
+    """
+    return _write_segments(Path(path), partition_by,
+                           ((chunk, chunk[partition_by] if partition_by else None) for chunk in chunks))
+
+def _write_segments(path: Path, partition_by: Optional[str], chunks) -> Dict:
+    path.mkdir(parents=True, exist_ok=True)
+    version = f"v{uuid.uuid4().hex[:12]}"
+
+    columns = {}
+    partitions = {}
+    row_count = 0
+    for df, partition_values in chunks:
+        if partition_values is None:
+            partition_values = [UNKNOWN_PARTITION] * len(df)
+        labels = pd.Series(np.asarray(partition_values, dtype=object), index=df.index)
+        labels = labels.where(labels.notna(), UNKNOWN_PARTITION).astype(str)
+
+        specs = [{'name': name, 'dtype': str(df[name].dtype), 'kind': _column_kind(df[name])} for name in df.columns]
+        for spec in specs:
+            _merge_column(columns, spec, has_data=bool(df[spec['name']].notna().any()))
+
+        rows = np.arange(row_count, row_count + len(df), dtype=np.int64)
+        for label in sorted(labels.unique()):
+            mask = (labels == label).to_numpy()
+            partition = partitions.setdefault(label, {'rows': 0, 'columns': [], 'segments': []})
+            directory = f"{partition_by or 'partition'}={label}/{len(partition['segments']):05d}"
+            part_dir = path / version / directory
+            part_dir.mkdir(parents=True)
+            np.save(part_dir / f"{ROW_COLUMN}.npy", rows[mask])
+
+            part = df.loc[mask]
+            stored = []
+            for spec in specs:
+                values = part[spec['name']]
+                if values.isna().all() and spec['name'] != partition_by:
+                    continue  # filled back in on read
+                _save_column(part_dir, spec, values)
+                stored.append(spec['name'])
+            partition['segments'].append({'rows': int(mask.sum()), 'directory': directory, 'columns': stored})
+            partition['rows'] += int(mask.sum())
+            partition['columns'].extend(name for name in stored if name not in partition['columns'])
+        row_count += len(df)
+
+    manifest = {'version': version, 'row_count': row_count, 'partition_by': partition_by,
+                'columns': [{key: value for key, value in column.items() if key != 'has_data'}
+                            for column in columns.values()],
+                'partitions': dict(sorted(partitions.items()))}
+    tmp_manifest = path / f"{MANIFEST}.{version}.tmp"
+    tmp_manifest.write_text(json.dumps(manifest, indent=2))
+    previous = _read_manifest(path)['version'] if (path / MANIFEST).exists() else None
+    os.replace(tmp_manifest, path / MANIFEST)
+
+    for stale in path.iterdir():
+        if stale.is_dir() and stale.name not in (version, previous):
+            shutil.rmtree(stale, ignore_errors=True)
+    return manifest
+
+def read_table(path, columns: Optional[Sequence[str]] = None,
+               partitions: Optional[Sequence[str]] = None, mmap: bool = False) -> pd.DataFrame:
+    """Load a columnar table, optionally only some columns and partitions, in original row order"""
+    path = Path(path)
+    manifest = _read_manifest(path)
+    specs = {column['name']: column for column in manifest['columns']}
+    wanted = list(specs) if columns is None else list(columns)
+    unknown = [name for name in wanted if name not in specs]
+    if unknown:
+        raise KeyError(f"Columns not in table: {unknown}")
+
+    mmap_mode = 'r' if mmap else None
+    frames = []
+    for label, info in manifest['partitions'].items():
+        if partitions is not None and label not in partitions:
+            continue
+        # Tables written before segments had one directory per partition
+        for segment in info.get('segments', [info]):
+            part_dir = path / manifest['version'] / segment['directory']
+            data = {ROW_COLUMN: np.load(part_dir / f"{ROW_COLUMN}.npy", mmap_mode=mmap_mode)}
+            for name in wanted:
+                if name in segment['columns']:
+                    data[name] = _load_column(part_dir, specs[name], mmap_mode)
+                else:
+                    data[name] = pd.Series(np.nan, index=range(segment['rows'])).astype(_missing_dtype(specs[name]))
+            frames.append(pd.DataFrame(data))
+
+    if not frames:
+        return pd.DataFrame({name: pd.Series(dtype=specs[name]['dtype']) for name in wanted})
+    table = pd.concat(frames, ignore_index=True).sort_values(ROW_COLUMN, kind='stable')
+    table = table.drop(columns=ROW_COLUMN).reset_index(drop=True)
+    for name in wanted:
+        if specs[name]['kind'] == 'string':
+            table[name] = table[name].astype(specs[name]['dtype'])
+    return table
+
+def list_partitions(path) -> List[str]:
+    return list(_read_manifest(Path(path))['partitions'])
+
+def _read_manifest(path: Path) -> Dict:
+    with open(path / MANIFEST) as f:
+        return json.load(f)
+
+def _merge_column(columns: Dict[str, Dict], spec: Dict, has_data: bool) -> None:
+    """Fold one chunk's column spec into the table's, as pd.concat would type the column"""
+    current = columns.get(spec['name'])
+    if current is None:
+        columns[spec['name']] = dict(spec, has_data=has_data)
+    elif has_data and not current['has_data']:
+        # All-missing chunks say nothing about the column's type
+        columns[spec['name']] = dict(spec, has_data=True)
+    elif has_data and current['dtype'] != spec['dtype']:
+        if current['kind'] == spec['kind'] == 'numeric':
+            current['dtype'] = 'float64'
+        else:
+            current.update(dtype='object', kind='string')
+
+def _column_kind(values: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return 'numeric'
+    return 'string'
+
+def _missing_dtype(spec: Dict) -> str:
+    # Integers and booleans cannot hold NaN; an absent column reads back as float or object
+    if spec['kind'] == 'string':
+        return 'object'
+    return 'float64' if spec['dtype'].startswith(('int', 'uint', 'bool')) else spec['dtype']
+
+def _save_column(part_dir: Path, spec: Dict, values: pd.Series) -> None:
+    if spec['kind'] == 'numeric':
+        np.save(part_dir / f"{spec['name']}.npy", values.to_numpy(dtype=spec['dtype']))
+        return
+    missing = values.isna().to_numpy()
+    np.save(part_dir / f"{spec['name']}.npy", values.where(~missing, '').astype(str).to_numpy(dtype=str))
+    if missing.any():
+        np.save(part_dir / f"{spec['name']}.null.npy", missing)
+
+def _load_column(part_dir: Path, spec: Dict, mmap_mode: Optional[str]):
+    values = np.load(part_dir / f"{spec['name']}.npy", mmap_mode=mmap_mode)
+    if spec['kind'] == 'numeric':
+        return values
+    values = values.astype(object)
+    null_path = part_dir / f"{spec['name']}.null.npy"
+    if null_path.exists():
+        values[np.load(null_path)] = None
+    return values
@@ -4,37 +4,49 @@ FEATURE_DICTIONARY = {
         'description': 'Proportion of attempts with correct timing',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = better timing accuracy'
+        'interpretation': 'Higher = better timing accuracy',
+        'category': 'success_rate',
+        'direction': 'higher_is_better'
     },
     'anti_air_reaction_test_early_rate': {
         'description': 'Proportion of attempts with premature input',
         'units': 'ratio (0-1)', 
         'range': '[0, 1]',
-        'interpretation': 'Higher = tendency to rush inputs'
+        'interpretation': 'Higher = tendency to rush inputs',
+        'category': 'early_rate',
+        'direction': 'lower_is_better'
     },
     'anti_air_reaction_test_late_rate': {
         'description': 'Proportion of attempts with delayed input',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = slow reaction time'
+        'interpretation': 'Higher = slow reaction time',
+        'category': 'late_rate',
+        'direction': 'lower_is_better'
     },
     'anti_air_reaction_test_miss_rate': {
         'description': 'Proportion of attempts with no input',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = failure to recognize threats'
+        'interpretation': 'Higher = failure to recognize threats',
+        'category': 'miss_rate',
+        'direction': 'lower_is_better'
     },
     'anti_air_reaction_test_timing_error_mean': {
         'description': 'Average timing offset from optimal window',
         'units': 'milliseconds',
         'range': '[-150, 150]',
-        'interpretation': 'Closer to 0 = more precise timing'
+        'interpretation': 'Closer to 0 = more precise timing',
+        'category': 'timing_error',
+        'direction': 'closer_to_zero'
     },
     'anti_air_reaction_test_timing_error_std': {
         'description': 'Consistency of timing across attempts',
         'units': 'milliseconds',
         'range': '[0, 100]',
-        'interpretation': 'Lower = more consistent timing'
+        'interpretation': 'Lower = more consistent timing',
+        'category': 'timing_consistency',
+        'direction': 'lower_is_better'
     },
     
     # Hit-Confirm Test Features
@@ -42,25 +54,33 @@ FEATURE_DICTIONARY = {
         'description': 'Proportion of correct confirm/block decisions',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = better decision-making under uncertainty'
+        'interpretation': 'Higher = better decision-making under uncertainty',
+        'category': 'success_rate',
+        'direction': 'higher_is_better'
     },
     'hit_confirm_test_false_confirm_rate': {
         'description': 'Proportion of blocked hits incorrectly confirmed',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = tendency to autopilot confirm'
+        'interpretation': 'Higher = tendency to autopilot confirm',
+        'category': 'false_confirm_rate',
+        'direction': 'lower_is_better'
     },
     'hit_confirm_test_missed_confirm_rate': {
         'description': 'Proportion of confirmed hits not followed up',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = overly conservative play'
+        'interpretation': 'Higher = overly conservative play',
+        'category': 'missed_confirm_rate',
+        'direction': 'lower_is_better'
     },
     'hit_confirm_test_decision_error_rate': {
         'description': 'Overall decision error rate',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = poor hit-confirm discipline'
+        'interpretation': 'Higher = poor hit-confirm discipline',
+        'category': 'decision_error_rate',
+        'direction': 'lower_is_better'
     },
     
     # Whiff Punish Test Features
@@ -68,43 +88,57 @@ FEATURE_DICTIONARY = {
         'description': 'Proportion of attacks punished during recovery',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = better frame data knowledge'
+        'interpretation': 'Higher = better frame data knowledge',
+        'category': 'success_rate',
+        'direction': 'higher_is_better'
     },
     'whiff_punish_test_early_rate': {
         'description': 'Proportion of punish attempts during startup',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = impatience or poor recognition'
+        'interpretation': 'Higher = impatience or poor recognition',
+        'category': 'early_rate',
+        'direction': 'lower_is_better'
     },
     'whiff_punish_test_unsafe_rate': {
         'description': 'Proportion of punish attempts during active frames',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = dangerous timing errors'
+        'interpretation': 'Higher = dangerous timing errors',
+        'category': 'unsafe_rate',
+        'direction': 'lower_is_better'
     },
     'whiff_punish_test_late_rate': {
         'description': 'Proportion of punish attempts after recovery',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = slow recognition or execution'
+        'interpretation': 'Higher = slow recognition or execution',
+        'category': 'late_rate',
+        'direction': 'lower_is_better'
     },
     'whiff_punish_test_miss_rate': {
         'description': 'Proportion of whiffs not punished at all',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = missed opportunities'
+        'interpretation': 'Higher = missed opportunities',
+        'category': 'miss_rate',
+        'direction': 'lower_is_better'
     },
     'whiff_punish_test_window_offset_mean': {
         'description': 'Average timing within recovery window',
         'units': 'milliseconds',
         'range': '[0, 300]',
-        'interpretation': 'Lower = faster punish execution'
+        'interpretation': 'Lower = faster punish execution',
+        'category': 'window_offset',
+        'direction': 'lower_is_better'
     },
     'whiff_punish_test_window_offset_std': {
         'description': 'Consistency of punish timing',
         'units': 'milliseconds', 
         'range': '[0, 150]',
-        'interpretation': 'Lower = more consistent execution'
+        'interpretation': 'Lower = more consistent execution',
+        'category': 'window_consistency',
+        'direction': 'lower_is_better'
     },
     
     # Defense Under Pressure Features
@@ -112,25 +146,75 @@ FEATURE_DICTIONARY = {
         'description': 'Average proportion of attacks blocked correctly',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = better mixup defense'
+        'interpretation': 'Higher = better mixup defense',
+        'category': 'block_accuracy',
+        'direction': 'higher_is_better'
     },
     'defense_under_pressure_test_block_accuracy_std': {
         'description': 'Consistency of blocking across strings',
         'units': 'ratio',
         'range': '[0, 0.5]',
-        'interpretation': 'Lower = more consistent defense'
+        'interpretation': 'Lower = more consistent defense',
+        'category': 'block_consistency',
+        'direction': 'lower_is_better'
     },
     'defense_under_pressure_test_error_rate_mean': {
         'description': 'Average proportion of attacks that hit',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Lower = better defensive fundamentals'
+        'interpretation': 'Lower = better defensive fundamentals',
+        'category': 'defense_error_rate',
+        'direction': 'lower_is_better'
     },
     'defense_under_pressure_test_string_success_rate': {
         'description': 'Proportion of complete strings defended',
         'units': 'ratio (0-1)',
         'range': '[0, 1]',
-        'interpretation': 'Higher = sustained defensive pressure handling'
+        'interpretation': 'Higher = sustained defensive pressure handling',
+        'category': 'success_rate',
+        'direction': 'higher_is_better'
+    },
+    
+    # Count Features
+    'defense_under_pressure_test_total_attacks_mean': {
+        'description': 'Average number of attacks per string',
+        'units': 'count',
+        'range': '[0, inf)',
+        'interpretation': 'Context for block accuracy; not a skill measure',
+        'category': 'attack_count',
+        'direction': 'neutral'
+    },
+    'anti_air_reaction_test_attempts': {
+        'description': 'Number of anti-air attempts in the session',
+        'units': 'count',
+        'range': '[0, inf)',
+        'interpretation': 'Sample size behind the other anti-air features',
+        'category': 'attempts',
+        'direction': 'neutral'
+    },
+    'hit_confirm_test_attempts': {
+        'description': 'Number of hit-confirm attempts in the session',
+        'units': 'count',
+        'range': '[0, inf)',
+        'interpretation': 'Sample size behind the other hit-confirm features',
+        'category': 'attempts',
+        'direction': 'neutral'
+    },
+    'whiff_punish_test_attempts': {
+        'description': 'Number of whiff punish attempts in the session',
+        'units': 'count',
+        'range': '[0, inf)',
+        'interpretation': 'Sample size behind the other whiff punish features',
+        'category': 'attempts',
+        'direction': 'neutral'
+    },
+    'defense_under_pressure_test_attempts': {
+        'description': 'Number of defense string attempts in the session',
+        'units': 'count',
+        'range': '[0, inf)',
+        'interpretation': 'Sample size behind the other defense string features',
+        'category': 'attempts',
+        'direction': 'neutral'
     }
 }
 
@@ -0,0 +1,81 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from feature_dictionary import FEATURE_DICTIONARY
+
+MINIGAMES = ('anti_air_reaction_test', 'hit_confirm_test', 'whiff_punish_test', 'defense_under_pressure_test')
+DIRECTIONS = ('higher_is_better', 'lower_is_better', 'closer_to_zero', 'neutral')
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    name: str
+    index: int
+    dtype: str
+    direction: str
+    minigame: str
+    category: str
+
+class FeatureSchema:
+    """FEATURE_DICTIONARY compiled once into typed specs and index arrays.
+
+    Stages resolve session feature columns through the schema instead of
+    substring-matching names: index_of() maps column names to schema
+    positions with one dict lookup each, and category/direction filters
+    are boolean operations on the precomputed arrays. Columns not in the
+    dictionary get index -1 and never match a category.
+    """
+
+    def __init__(self, dictionary: Dict[str, Dict]):
+        self.specs = tuple(self._compile(i, name, info) for i, (name, info) in enumerate(dictionary.items()))
+        self.names = [spec.name for spec in self.specs]
+        self._by_name = {spec.name: spec for spec in self.specs}
+
+        self.categories = np.array([spec.category for spec in self.specs])
+        self.directions = np.array([spec.direction for spec in self.specs])
+        self.minigames = np.array([spec.minigame for spec in self.specs])
+        self.lower_is_better_mask = np.isin(self.directions, ['lower_is_better', 'closer_to_zero'])
+
+    @staticmethod
+    def _compile(index: int, name: str, info: Dict) -> FeatureSpec:
+        minigame = next((m for m in MINIGAMES if name.startswith(m + '_')), None)
+        if minigame is None:
+            raise ValueError(f"Feature {name} does not belong to a known minigame")
+        if info['direction'] not in DIRECTIONS:
+            raise ValueError(f"Feature {name} has unknown direction {info['direction']}")
+
+        return FeatureSpec(
+            name=name,
+            index=index,
+            dtype='int64' if info['category'] == 'attempts' else 'float64',
+            direction=info['direction'],
+            minigame=minigame,
+            category=info['category']
+        )
+
+    def get(self, name: str) -> Optional[FeatureSpec]:
+        return self._by_name.get(name)
+
+    def index_of(self, column_names: Iterable[str]) -> np.ndarray:
+        """Schema index per column, -1 for columns the dictionary does not define"""
+        lookup = self._by_name
+        return np.array([lookup[col].index if col in lookup else -1 for col in column_names], dtype=np.int64)
+
+    def column_mask(self, column_names: Iterable[str], categories: Iterable[str]) -> np.ndarray:
+        """Boolean mask over column_names selecting the given feature categories"""
+        indices = self.index_of(column_names)
+        known = indices >= 0
+        mask = np.zeros(len(indices), dtype=bool)
+        mask[known] = np.isin(self.categories[indices[known]], list(categories))
+        return mask
+
+    def columns_in(self, column_names: Iterable[str], categories: Iterable[str]) -> List[str]:
+        """Columns of the given categories, in their original column order"""
+        column_names = list(column_names)
+        return [column_names[i] for i in np.flatnonzero(self.column_mask(column_names, categories))]
+
+    def lower_is_better(self, column_names: Iterable[str]) -> np.ndarray:
+        """Per-column flag; unknown columns are treated as higher-is-better"""
+        indices = self.index_of(column_names)
+        return np.where(indices >= 0, self.lower_is_better_mask[indices], False)
+
+FEATURE_SCHEMA = FeatureSchema(FEATURE_DICTIONARY)
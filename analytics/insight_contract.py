@@ -1,3 +1,4 @@
+import sys
 from typing import Dict, List, Optional
 from dataclasses import dataclass
 from enum import Enum
@@ -26,6 +27,9 @@ class ConfidenceLevel(Enum):
 
 @dataclass
 class ContributingFactor:
+    # Slotted: no per-instance __dict__, which matters at millions of insights
+    __slots__ = ('feature_name', 'feature_value', 'expected_range', 'interpretation')
+    
     feature_name: str
     feature_value: float
     expected_range: str
@@ -33,6 +37,9 @@ class ContributingFactor:
 
 @dataclass
 class Insight:
+    __slots__ = ('insight_id', 'insight_type', 'severity', 'confidence', 'contributing_factors',
+                 'explanation_text', 'affected_minigames', 'supporting_metrics')
+    
     insight_id: str
     insight_type: InsightType
     severity: SeverityLevel
@@ -201,11 +208,24 @@ class InsightVocabulary:
     @classmethod
     def get_insights_by_ml_source(cls, ml_source: str) -> List[InsightType]:
         """Get insight types that can be generated from a specific ML source"""
-        insights = []
-        for insight_type, definition in cls.DEFINITIONS.items():
-            if ml_source in definition.get("ml_sources", []):
-                insights.append(insight_type)
-        return insights
+        return list(cls._SOURCE_INDEX.get(ml_source, ()))
+    
+    @classmethod
+    def get_insights_by_metric(cls, metric_name: str) -> List[InsightType]:
+        """Get insight types that a feature is a supporting metric for"""
+        return list(cls._METRIC_INDEX.get(metric_name, ()))
+
+def _index_definitions(key: str) -> Dict[str, tuple]:
+    """Reverse index from a DEFINITIONS list field to insight types, in definition order"""
+    index = {}
+    for insight_type, definition in InsightVocabulary.DEFINITIONS.items():
+        for value in definition.get(key, []):
+            index.setdefault(value, []).append(insight_type)
+    return {value: tuple(types) for value, types in index.items()}
+
+# DEFINITIONS is static, so the lookups are built once at import
+InsightVocabulary._SOURCE_INDEX = _index_definitions("ml_sources")
+InsightVocabulary._METRIC_INDEX = _index_definitions("supporting_metrics")
 
 class InsightDataStructure:
     """Utilities for creating and validating insight objects"""
@@ -221,12 +241,10 @@ class InsightDataStructure:
     ) -> Insight:
         """Create a structured insight object"""
         
-        definition = InsightVocabulary.get_definition(insight_type)
-        explanation_text = InsightDataStructure._generate_explanation(
-            insight_type, severity, confidence, definition
-        )
+        explanation_text = InsightDataStructure.get_explanation(insight_type, severity, confidence)
         
-        insight_id = f"{insight_type.value}_{severity.value}_{len(affected_minigames)}"
+        # Few distinct ids exist, so insights share one string object per id
+        insight_id = sys.intern(f"{insight_type.value}_{severity.value}_{len(affected_minigames)}")
         
         return Insight(
             insight_id=insight_id,
@@ -239,6 +257,21 @@ class InsightDataStructure:
             supporting_metrics=supporting_metrics
         )
     
+    _EXPLANATIONS = {}
+    
+    @staticmethod
+    def get_explanation(insight_type: InsightType, severity: SeverityLevel, confidence: ConfidenceLevel) -> str:
+        """Explanation text shared by every insight with the same type, severity and confidence"""
+        key = (insight_type, severity, confidence)
+        explanation = InsightDataStructure._EXPLANATIONS.get(key)
+        if explanation is None:
+            definition = InsightVocabulary.get_definition(insight_type)
+            explanation = sys.intern(InsightDataStructure._generate_explanation(
+                insight_type, severity, confidence, definition
+            ))
+            InsightDataStructure._EXPLANATIONS[key] = explanation
+        return explanation
+    
     @staticmethod
     def _generate_explanation(
         insight_type: InsightType,
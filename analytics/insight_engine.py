@@ -0,0 +1,183 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Tuple
+from insight_contract import (
+    InsightType, SeverityLevel, ConfidenceLevel, ContributingFactor, Insight,
+    InsightVocabulary, InsightDataStructure
+)
+from insight_io import InsightWriter
+from feature_dictionary import get_feature_info
+from feature_schema import FEATURE_SCHEMA
+
+class InsightEngine:
+    """Batch insight generation from session features, weakness probabilities and trends.
+
+    Scores for every (session, insight type) cell are computed at once:
+
+      severity score    mean percentile of the type's supporting metrics
+                        across the batch, oriented so higher is worse
+      confidence score  the classifier's probability for the matching
+                        weakness when there is one, otherwise how far the
+                        severity score sits above the cohort median
+                        (2 * severity - 1)
+
+    Insight objects are only built for cells that reach min_confidence.
+    Trend insights describe the whole ordered history, not one session.
+    """
+
+    # Weakness label (WeaknessClassifier.define_weakness_labels) -> insight it is evidence for
+    WEAKNESS_INSIGHTS = {
+        'inconsistent_timing': InsightType.TIMING_INCONSISTENCY,
+        'poor_mixup_defense': InsightType.POOR_MIXUP_DEFENSE,
+        'late_punish_tendency': InsightType.LATE_REACTIONS,
+        'impatient_player': InsightType.IMPATIENT_INPUTS
+    }
+    TREND_INSIGHTS = {
+        'improving': InsightType.IMPROVING_PERFORMANCE,
+        'flat': InsightType.STABLE_PERFORMANCE,
+        'regressing': InsightType.REGRESSING_PERFORMANCE
+    }
+    CONFIDENCE_LEVELS = [ConfidenceLevel.EMERGING, ConfidenceLevel.LIKELY, ConfidenceLevel.ESTABLISHED]
+    CONFIDENCE_BINS = [0.5, 0.7]
+    SEVERITY_LEVELS = [SeverityLevel.LOW, SeverityLevel.MODERATE, SeverityLevel.HIGH]
+    SEVERITY_BINS = [0.6, 0.85]
+
+    def __init__(self, min_confidence: float = 0.3):
+        self.min_confidence = min_confidence
+
+        trend_types = set(self.TREND_INSIGHTS.values())
+        self.session_types = [t for t in InsightVocabulary.get_all_insight_types() if t not in trend_types]
+
+        # Supporting metric x insight type membership, from the vocabulary's metric index
+        self.metric_names = sorted({
+            metric
+            for insight_type in self.session_types
+            for metric in InsightVocabulary.get_definition(insight_type)['supporting_metrics']
+        })
+        self.membership = np.array([
+            [insight_type in InsightVocabulary.get_insights_by_metric(metric) for insight_type in self.session_types]
+            for metric in self.metric_names
+        ], dtype=np.float64)
+        self.metric_minigames = [FEATURE_SCHEMA.get(metric).minigame for metric in self.metric_names]
+        self.higher_is_better = ~FEATURE_SCHEMA.lower_is_better(self.metric_names)
+        self.metric_info = [get_feature_info(metric) for metric in self.metric_names]
+
+    def generate_session_insights(self, feature_df: pd.DataFrame, weakness_probabilities: np.ndarray = None,
+                                  weakness_names: List[str] = None,
+                                  reference_df: pd.DataFrame = None) -> List[Tuple[str, Insight]]:
+        """All (session_id, Insight) pairs as a list; see iter_session_insights"""
+        return list(self.iter_session_insights(feature_df, weakness_probabilities, weakness_names, reference_df))
+
+    def iter_session_insights(self, feature_df: pd.DataFrame, weakness_probabilities: np.ndarray = None,
+                              weakness_names: List[str] = None,
+                              reference_df: pd.DataFrame = None) -> Iterator[Tuple[str, Insight]]:
+        """Yield (session_id, Insight) pairs for every session from one batched scoring pass.
+
+        Scores stay in (sessions, insight types) arrays; Insight objects are
+        created one at a time as the caller consumes them.
+        weakness_probabilities is an (n_sessions, n_weaknesses) matrix in
+        feature_df row order, e.g. from WeaknessInferenceEngine.predict_proba.
+        reference_df is an optional cohort (e.g. the stored session history)
+        that percentiles are ranked against, so a handful of new sessions
+        are not only compared with each other.
+        """
+        values = feature_df.reindex(columns=self.metric_names).to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+
+        percentiles = self._percentiles(feature_df, reference_df)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            severity = (np.where(valid, percentiles, 0.0) @ self.membership) / (valid @ self.membership)
+        confidence = np.clip(2 * severity - 1, 0.0, 1.0)
+
+        if weakness_probabilities is not None:
+            for i, weakness in enumerate(weakness_names):
+                insight_type = self.WEAKNESS_INSIGHTS.get(weakness)
+                if insight_type in self.session_types:
+                    confidence[:, self.session_types.index(insight_type)] = weakness_probabilities[:, i]
+
+        emit = (confidence >= self.min_confidence) & ~np.isnan(severity)
+        confidence_levels = np.digitize(confidence, self.CONFIDENCE_BINS)
+        severity_levels = np.digitize(np.nan_to_num(severity), self.SEVERITY_BINS)
+
+        session_ids = feature_df['session_id'].to_numpy()
+        for row, col in zip(*np.nonzero(emit)):
+            insight_type = self.session_types[col]
+            metrics = np.flatnonzero(valid[row] & (self.membership[:, col] > 0))
+
+            insight = InsightDataStructure.create_insight(
+                insight_type=insight_type,
+                severity=self.SEVERITY_LEVELS[severity_levels[row, col]],
+                confidence=self.CONFIDENCE_LEVELS[confidence_levels[row, col]],
+                contributing_factors=[
+                    ContributingFactor(
+                        feature_name=self.metric_names[m],
+                        feature_value=float(values[row, m]),
+                        expected_range=self.metric_info[m]['range'],
+                        interpretation=self.metric_info[m]['interpretation']
+                    )
+                    for m in metrics
+                ],
+                affected_minigames=sorted({self.metric_minigames[m] for m in metrics}),
+                supporting_metrics={self.metric_names[m]: float(values[row, m]) for m in metrics}
+            )
+            yield session_ids[row], insight
+
+    def generate_trend_insights(self, trend_results: Dict) -> List[Insight]:
+        """Improving/stable/regressing insights from TrendAnalyzer.analyze_trends output.
+
+        Confidence and severity come from the share of analyzed metrics
+        carrying each trend label.
+        """
+        overall = trend_results['trend_summaries']['overall']
+        per_metric = trend_results['trend_summaries']['per_metric']
+        total = overall['improving_count'] + overall['flat_count'] + overall['regressing_count']
+        if total == 0:
+            return []
+
+        insights = []
+        for trend, insight_type in self.TREND_INSIGHTS.items():
+            count = overall[f'{trend}_count']
+            share = count / total
+            if share < self.min_confidence:
+                continue
+
+            metrics = [name for name, summary in per_metric.items() if summary['trend'] == trend]
+            insights.append(InsightDataStructure.create_insight(
+                insight_type=insight_type,
+                severity=self.SEVERITY_LEVELS[int(np.digitize(share, self.SEVERITY_BINS))],
+                confidence=self.CONFIDENCE_LEVELS[int(np.digitize(share, self.CONFIDENCE_BINS))],
+                contributing_factors=[
+                    ContributingFactor(
+                        feature_name=name,
+                        feature_value=per_metric[name]['end_value'],
+                        expected_range=f"started at {per_metric[name]['start_value']}",
+                        interpretation=per_metric[name]['description']
+                    )
+                    for name in metrics
+                ],
+                affected_minigames=sorted({FEATURE_SCHEMA.get(name).minigame for name in metrics}),
+                supporting_metrics={f'trend_classification_{trend}_count': float(count)}
+            ))
+
+        return insights
+
+    def write_jsonl(self, path, session_insights: Iterable[Tuple[str, Insight]],
+                    trend_insights: Iterable[Insight] = ()) -> int:
+        """Stream insights to JSON Lines; trend insights have a null session_id.
+
+        session_insights may be a generator (e.g. iter_session_insights), in
+        which case no more than one insight is held in memory at a time.
+        """
+        with InsightWriter(path) as writer:
+            writer.write_all(session_insights)
+            writer.write_all((None, insight) for insight in trend_insights)
+        return writer.count
+
+    def _percentiles(self, feature_df: pd.DataFrame, reference_df: pd.DataFrame = None) -> np.ndarray:
+        """Per-metric percentile rank across the batch (plus reference cohort); 1.0 is the worst session"""
+        metrics = feature_df.reindex(columns=self.metric_names)
+        if reference_df is not None:
+            metrics = pd.concat([reference_df.reindex(columns=self.metric_names), metrics], ignore_index=True)
+        worst_high = metrics.rank(pct=True).to_numpy(dtype=np.float64)
+        worst_low = metrics.rank(pct=True, ascending=False).to_numpy(dtype=np.float64)
+        return np.where(self.higher_is_better, worst_low, worst_high)[len(metrics) - len(feature_df):]
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from insight_contract import (
+    InsightType, SeverityLevel, ConfidenceLevel, ContributingFactor, Insight, InsightDataStructure
+)
+
+def insight_to_record(insight: Insight, session_id: Optional[str]) -> Dict:
+    """JSON-ready dict for an insight, with enums as their string values"""
+    return {
+        'session_id': session_id,
+        'insight_id': insight.insight_id,
+        'insight_type': insight.insight_type.value,
+        'severity': insight.severity.value,
+        'confidence': insight.confidence.value,
+        'contributing_factors': [
+            {
+                'feature_name': factor.feature_name,
+                'feature_value': factor.feature_value,
+                'expected_range': factor.expected_range,
+                'interpretation': factor.interpretation
+            }
+            for factor in insight.contributing_factors
+        ],
+        'explanation_text': insight.explanation_text,
+        'affected_minigames': insight.affected_minigames,
+        'supporting_metrics': insight.supporting_metrics
+    }
+
+def insight_from_record(record: Dict) -> Tuple[Optional[str], Insight]:
+    """Inverse of insight_to_record; explanation text comes from the shared template cache"""
+    insight_type = InsightType(record['insight_type'])
+    severity = SeverityLevel(record['severity'])
+    confidence = ConfidenceLevel(record['confidence'])
+
+    insight = Insight(
+        insight_id=record['insight_id'],
+        insight_type=insight_type,
+        severity=severity,
+        confidence=confidence,
+        contributing_factors=[ContributingFactor(**factor) for factor in record['contributing_factors']],
+        explanation_text=InsightDataStructure.get_explanation(insight_type, severity, confidence),
+        affected_minigames=record['affected_minigames'],
+        supporting_metrics=record['supporting_metrics']
+    )
+    return record['session_id'], insight
+
+class InsightWriter:
+    """Append insights to a JSON Lines file one record at a time.
+
+        with InsightWriter(path) as writer:
+            writer.write_all(engine.iter_session_insights(feature_df))
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> 'InsightWriter':
+        self._file = open(self.path, 'w')
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._file.close()
+        self._file = None
+
+    def write(self, insight: Insight, session_id: Optional[str] = None) -> None:
+        self._file.write(json.dumps(insight_to_record(insight, session_id)) + "\n")
+        self.count += 1
+
+    def write_all(self, session_insights: Iterable[Tuple[Optional[str], Insight]]) -> int:
+        """Drain an iterable of (session_id, Insight) pairs; returns how many were written"""
+        written = 0
+        for session_id, insight in session_insights:
+            self.write(insight, session_id)
+            written += 1
+        return written
+
+def iter_insights(path) -> Iterator[Tuple[Optional[str], Insight]]:
+    """Stream (session_id, Insight) pairs back from a JSON Lines file"""
+    with open(Path(path)) as f:
+        for line in f:
+            if line.strip():
+                yield insight_from_record(json.loads(line))
@@ -0,0 +1,147 @@
+import pandas as pd
+import numpy as np
+import joblib
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from pathlib import Path
+from typing import Dict, Optional
+from weakness_classifier import WeaknessClassifier
+
+class OnlineWeaknessClassifier(WeaknessClassifier):
+    """Streaming variant of WeaknessClassifier.
+
+    Logistic models are SGD-based (log loss) and updated with partial_fit,
+    and the scaler keeps running statistics, so each new batch of sessions
+    costs time proportional to the batch rather than to the full history.
+    Decision trees cannot be updated incrementally; they are rebuilt on
+    each full refit.
+    """
+
+    def __init__(self, random_state=42, n_jobs=-1, alpha=1e-4, refit_every: Optional[int] = None):
+        super().__init__(random_state=random_state, n_jobs=n_jobs)
+        self.alpha = alpha
+        self.refit_every = refit_every
+        self.batches_since_refit = 0
+        self.sessions_seen = 0
+        self.positive_counts = {}
+
+    def _new_model(self, model_type: str):
+        if model_type == 'logistic':
+            return SGDClassifier(loss='log_loss', alpha=self.alpha, random_state=self.random_state)
+        return super()._new_model(model_type)
+
+    def _prepare_batch(self, feature_df: pd.DataFrame) -> np.ndarray:
+        """Update the running scaler with a batch and return it scaled"""
+        features = feature_df.drop('session_id', axis=1)
+
+        if self.feature_names is None:
+            self.feature_names = features.columns.tolist()
+        else:
+            features = features.reindex(columns=self.feature_names)
+
+        # StandardScaler.partial_fit ignores NaN, so running means stay unbiased
+        self.scaler.partial_fit(features)
+
+        # A running median is not O(batch); the running mean is used as the fill value
+        self.feature_medians = pd.Series(np.nan_to_num(self.scaler.mean_), index=self.feature_names)
+        return self.scaler.transform(features.fillna(self.feature_medians))
+
+    def partial_fit(self, feature_df: pd.DataFrame, labels_df: pd.DataFrame) -> Dict:
+        """Update every weakness model with one new batch of sessions"""
+        X_scaled = self._prepare_batch(feature_df)
+        weakness_types = [col for col in labels_df.columns if col != 'session_id']
+
+        results = {}
+        for weakness in weakness_types:
+            y = labels_df[weakness].values
+
+            models = self.models.setdefault(weakness, {})
+            if 'logistic' not in models:
+                models['logistic'] = self._new_model('logistic')
+            models['logistic'].partial_fit(X_scaled, y, classes=np.array([0, 1]))
+
+            self.positive_counts[weakness] = self.positive_counts.get(weakness, 0) + int(y.sum())
+            results[weakness] = {
+                'batch_positive_cases': int(y.sum()),
+                'batch_size': len(y),
+                'positive_cases': self.positive_counts[weakness],
+                'total_cases': self.sessions_seen + len(y)
+            }
+
+        self.sessions_seen += len(X_scaled)
+        self.batches_since_refit += 1
+        return results
+
+    @property
+    def refit_due(self) -> bool:
+        """True once refit_every incremental batches have been applied since the last full refit"""
+        return self.refit_every is not None and self.batches_since_refit >= self.refit_every
+
+    def full_refit(self, feature_df: pd.DataFrame, labels_df: pd.DataFrame) -> Dict:
+        """Rebuild scaler, SGD models and decision trees from the full history.
+
+        Uses the batch training path (worker pool included), with SGD
+        logistic models in place of LogisticRegression.
+        """
+        self.scaler = StandardScaler()
+        self.models = {}
+        self.feature_names = None
+
+        results = self.train_weakness_models(feature_df, labels_df)
+
+        self.positive_counts = {weakness: result['positive_cases'] for weakness, result in results.items()
+                                if 'error' not in result}
+        self.sessions_seen = len(feature_df)
+        self.batches_since_refit = 0
+        return results
+
+    def drift_report(self, feature_df: pd.DataFrame, labels_df: pd.DataFrame) -> Dict:
+        """Compare the incremental models against a full refit on the same data.
+
+        Coefficients are compared in raw feature units (scaler folded in),
+        since the incremental and refit scalers differ.
+        """
+        reference = OnlineWeaknessClassifier(random_state=self.random_state, alpha=self.alpha)
+        reference.full_refit(feature_df, labels_df)
+
+        incremental_engine = self.export_inference_engine()
+        reference_engine = reference.export_inference_engine()
+
+        X = reference_engine.to_matrix(feature_df)
+        incremental_probs = incremental_engine.predict_proba(incremental_engine.to_matrix(feature_df))
+        reference_probs = reference_engine.predict_proba(X)
+
+        report = {}
+        for ref_idx, weakness in enumerate(reference_engine.weakness_names):
+            if weakness not in incremental_engine.weakness_names:
+                report[weakness] = {'error': 'No incremental model for this weakness'}
+                continue
+            inc_idx = incremental_engine.weakness_names.index(weakness)
+
+            inc_coef = incremental_engine.coef[:, inc_idx]
+            ref_coef = reference_engine.coef[:, ref_idx]
+            norm_product = np.linalg.norm(inc_coef) * np.linalg.norm(ref_coef)
+            prob_diff = np.abs(incremental_probs[:, inc_idx] - reference_probs[:, ref_idx])
+
+            report[weakness] = {
+                'coefficient_l2_distance': float(np.linalg.norm(inc_coef - ref_coef)),
+                'coefficient_cosine_similarity': float(inc_coef @ ref_coef / norm_product) if norm_product > 0 else 0.0,
+                'max_coefficient_change': float(np.max(np.abs(inc_coef - ref_coef))),
+                'intercept_change': float(incremental_engine.intercept[inc_idx] - reference_engine.intercept[ref_idx]),
+                'mean_probability_difference': float(prob_diff.mean()),
+                'max_probability_difference': float(prob_diff.max()),
+                'label_agreement': float(((incremental_probs[:, inc_idx] > 0.5) == (reference_probs[:, ref_idx] > 0.5)).mean())
+            }
+
+        return {
+            'sessions_compared': len(feature_df),
+            'batches_since_refit': self.batches_since_refit,
+            'per_weakness': report
+        }
+
+    def save(self, path) -> None:
+        joblib.dump(self, Path(path))
+
+    @staticmethod
+    def load(path) -> 'OnlineWeaknessClassifier':
+        return joblib.load(Path(path))
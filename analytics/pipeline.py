@@ -0,0 +1,172 @@
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from run_metrics import StageMetrics
+
+MODULE_DIR = Path(__file__).parent
+
+class Stage:
+    """One pipeline step with declared inputs, parameters and outputs.
+
+    func is called with the stage's inputs (artifacts produced by earlier
+    stages) and params as keyword arguments, and returns a dict holding
+    every declared output. modules lists the local modules whose source
+    is part of the stage's code version. runtime names params that change
+    how the stage runs but not what it returns (e.g. n_jobs); they are
+    passed like params when set but left out of the cache key. A func that takes
+    an artifact_dir argument gets a private directory for file outputs
+    kept with the cache entry.
+    """
+
+    def __init__(self, name: str, func: Callable[..., Dict[str, Any]], inputs: Sequence[str] = (),
+                 outputs: Sequence[str] = (), params: Sequence[str] = (), modules: Sequence[str] = (),
+                 runtime: Sequence[str] = ()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = list(params)
+        self.modules = list(modules)
+        self.runtime = list(runtime)
+        self._accepts = set(inspect.signature(func).parameters)
+
+    def code_version(self) -> str:
+        digest = hashlib.sha256(inspect.getsource(self.func).encode())
+        for module in sorted(self.modules):
+            digest.update((MODULE_DIR / f"{module}.py").read_bytes())
+        return digest.hexdigest()
+
+    def call(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        return self.func(**{name: value for name, value in values.items() if name in self._accepts})
+
+class PipelineRunner:
+    """Run stages in order, reusing cached outputs when nothing they depend on changed.
+
+    A stage's cache key hashes its name, code version, parameter values and
+    the cache keys of the stages producing its inputs, so keys for the
+    whole pipeline are known before anything runs and a change re-runs
+    only the stages downstream of it. Cached outputs are stored with joblib
+    under cache_dir/<stage>/<key>/ and loaded only when a stage that runs
+    (or the caller) asks for them. The newest `keep` entries per stage are
+    kept.
+
+    Every stage that runs is measured (see run_metrics.StageMetrics); the
+    records are in `metrics` after run(). With a profile_dir each stage
+    also runs under cProfile and writes profile_dir/<stage>.prof.
+    """
+
+    OUTPUTS_FILE = 'outputs.joblib'
+
+    def __init__(self, stages: List[Stage], cache_dir, keep: int = 2, profile_dir=None):
+        self.stages = stages
+        self.cache_dir = Path(cache_dir)
+        self.keep = keep
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.producers = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"Output {output} is produced by both {self.producers[output].name} and {stage.name}")
+                self.producers[output] = stage
+
+        self.keys = {}
+        self.report = []
+        self.metrics = []
+        self._loaded = {}
+
+    def run(self, params: Dict[str, Any], force: bool = False) -> List[Dict]:
+        """Execute stages whose cache entry is missing (every stage when force); returns the per-stage report"""
+        self.keys = self._plan(params)
+        self.report = []
+        self.metrics = []
+        self._loaded = {}
+
+        for stage in self.stages:
+            entry = self._entry_dir(stage)
+            if not force and (entry / self.OUTPUTS_FILE).exists():
+                # Mark as recently used so pruning keeps it
+                os.utime(entry)
+                print(f"\n[{stage.name}] reused cached outputs")
+                self.report.append({'stage': stage.name, 'status': 'reused', 'key': self.keys[stage.name]})
+                self.metrics.append({'stage': stage.name, 'status': 'reused'})
+                continue
+
+            inputs = {name: self.artifact(name) for name in stage.inputs}
+            values = dict(inputs)
+            values.update({name: params.get(name) for name in stage.params})
+            runtime = {name: params[name] for name in stage.runtime if name in params}
+            values.update(runtime)
+            entry.mkdir(parents=True, exist_ok=True)
+            values['artifact_dir'] = entry
+
+            measure = StageMetrics(stage.name, self._profile_path(stage))
+            try:
+                with measure:
+                    outputs = stage.call(values)
+            except BaseException:
+                self.metrics.append(measure.record)
+                shutil.rmtree(entry, ignore_errors=True)
+                raise
+            measure.rows(inputs, outputs)
+            if runtime:
+                measure.record['runtime'] = runtime
+            self.metrics.append(measure.record)
+
+            missing = set(stage.outputs) - set(outputs)
+            if missing:
+                raise ValueError(f"Stage {stage.name} did not return {sorted(missing)}")
+
+            import joblib
+            joblib.dump(outputs, entry / self.OUTPUTS_FILE)
+            self._loaded[stage.name] = outputs
+            self._prune(stage)
+            self.report.append({'stage': stage.name, 'status': 'ran', 'key': self.keys[stage.name]})
+
+        return self.report
+
+    def artifact(self, name: str) -> Any:
+        """An output of the last run, loaded from the cache on first access"""
+        stage = self.producers[name]
+        if stage.name not in self._loaded:
+            import joblib
+            self._loaded[stage.name] = joblib.load(self._entry_dir(stage) / self.OUTPUTS_FILE)
+        return self._loaded[stage.name][name]
+
+    def produces(self, name: str) -> bool:
+        return name in self.producers
+
+    def reused_stages(self) -> List[str]:
+        return [entry['stage'] for entry in self.report if entry['status'] == 'reused']
+
+    def _plan(self, params: Dict[str, Any]) -> Dict[str, str]:
+        keys = {}
+        for stage in self.stages:
+            for name in stage.inputs:
+                if name not in self.producers or self.producers[name].name not in keys:
+                    raise ValueError(f"Stage {stage.name} needs {name}, which no earlier stage produces")
+
+            payload = {
+                'stage': stage.name,
+                'code': stage.code_version(),
+                'params': {name: params.get(name) for name in stage.params},
+                'inputs': {name: keys[self.producers[name].name] for name in stage.inputs}
+            }
+            encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+            keys[stage.name] = hashlib.sha256(encoded).hexdigest()[:20]
+        return keys
+
+    def _profile_path(self, stage: Stage) -> Optional[Path]:
+        return self.profile_dir / f"{stage.name}.prof" if self.profile_dir else None
+
+    def _entry_dir(self, stage: Stage) -> Path:
+        return self.cache_dir / stage.name / self.keys[stage.name]
+
+    def _prune(self, stage: Stage) -> None:
+        entries = [path for path in (self.cache_dir / stage.name).iterdir() if path.is_dir()]
+        entries.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        for stale in entries[self.keep:]:
+            shutil.rmtree(stale, ignore_errors=True)
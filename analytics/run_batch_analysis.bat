@@ -0,0 +1,3 @@
+@echo off
+call venv\Scripts\activate
+python batch_analyze.py %*
\ No newline at end of file
@@ -0,0 +1,79 @@
+import cProfile
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB (None where unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss) / 2**20
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+def count_rows(value: Any) -> Optional[int]:
+    """Row count of a frame or array artifact; None for anything else"""
+    shape = getattr(value, 'shape', None)
+    if shape is not None and len(shape) >= 1:
+        return int(shape[0])
+    return None
+
+class StageMetrics:
+    """Measure one stage: wall time, CPU time, peak RSS and row counts.
+
+    Used as a context manager around the stage call. With a profile_path
+    the call also runs under cProfile and the stats are dumped there
+    (load them with pstats or snakeviz).
+    """
+
+    def __init__(self, name: str, profile_path: Optional[Path] = None):
+        self.name = name
+        self.profile_path = profile_path
+        self.record = {'stage': name, 'status': 'ran'}
+        self._profiler = None
+
+    def __enter__(self) -> 'StageMetrics':
+        self._rss_before = peak_rss_mb()
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        if self._profiler:
+            self._profiler.disable()
+            self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(str(self.profile_path))
+            self.record['profile'] = str(self.profile_path)
+
+        rss = peak_rss_mb()
+        self.record.update({
+            'wall_seconds': round(wall, 4),
+            'cpu_seconds': round(cpu, 4),
+            'peak_rss_mb': None if rss is None else round(rss, 1),
+            'peak_rss_growth_mb': None if rss is None else round(rss - self._rss_before, 1)
+        })
+        if exc_type is not None:
+            self.record['status'] = 'failed'
+
+    def rows(self, inputs: Dict[str, Any], outputs: Dict[str, Any]) -> None:
+        """Record row counts of the frame/array inputs and outputs"""
+        self.record['rows_in'] = _row_counts(inputs)
+        self.record['rows_out'] = _row_counts(outputs)
+
+def _row_counts(values: Dict[str, Any]) -> Dict[str, int]:
+    counts = {name: count_rows(value) for name, value in values.items()}
+    return {name: n for name, n in counts.items() if n is not None}
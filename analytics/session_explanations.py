@@ -0,0 +1,90 @@
+import numpy as np
+from pathlib import Path
+from typing import Dict, List
+
+class SessionExplanations:
+    """Top-k per-session logistic contributions stored as flat columns.
+
+    contribution[s, w, f] = coef[w, f] * x_scaled[s, f] is computed for all
+    sessions, weaknesses and features as one broadcast, and only the k
+    largest-magnitude contributors per (session, weakness) are kept:
+
+        feature_index  (n_sessions, n_weaknesses, k)  int16
+        contribution   (n_sessions, n_weaknesses, k)  float32
+    """
+
+    def __init__(self, session_ids: List[str], weakness_names: List[str], feature_names: List[str],
+                 feature_index: np.ndarray, contribution: np.ndarray):
+        self.session_ids = list(session_ids)
+        self.weakness_names = list(weakness_names)
+        self.feature_names = list(feature_names)
+        self.feature_index = feature_index
+        self.contribution = contribution
+        self._session_rows = None
+
+    @classmethod
+    def compute(cls, session_ids, weakness_names, feature_names, X_scaled: np.ndarray,
+                coef: np.ndarray, top_k: int = 3, chunk_size: int = 50_000) -> 'SessionExplanations':
+        """Batched contribution vectors from scaled features and a (n_weaknesses, n_features) coef matrix"""
+        n_sessions, n_features = X_scaled.shape
+        k = min(top_k, n_features)
+
+        feature_index = np.empty((n_sessions, len(weakness_names), k), dtype=np.int16)
+        contribution = np.empty((n_sessions, len(weakness_names), k), dtype=np.float32)
+
+        # Chunked only to bound the (chunk, weaknesses, features) temporary
+        for start in range(0, n_sessions, chunk_size):
+            stop = min(start + chunk_size, n_sessions)
+            contrib = X_scaled[start:stop, np.newaxis, :] * coef[np.newaxis, :, :]
+            magnitude = np.abs(contrib)
+
+            if k < n_features:
+                top = np.argpartition(-magnitude, k - 1, axis=2)[:, :, :k]
+            else:
+                top = np.broadcast_to(np.arange(n_features), magnitude.shape).copy()
+            order = np.argsort(-np.take_along_axis(magnitude, top, axis=2), axis=2)
+            top = np.take_along_axis(top, order, axis=2)
+
+            feature_index[start:stop] = top
+            contribution[start:stop] = np.take_along_axis(contrib, top, axis=2)
+
+        return cls(session_ids, weakness_names, feature_names, feature_index, contribution)
+
+    def explain_session(self, session_id) -> Dict[str, List[Dict]]:
+        """Personal top contributors for one session, keyed by weakness"""
+        if self._session_rows is None:
+            self._session_rows = {sid: row for row, sid in enumerate(self.session_ids)}
+        row = self._session_rows[session_id]
+
+        return {
+            weakness: [
+                {
+                    'feature': self.feature_names[f],
+                    'contribution': float(c),
+                    'interpretation': 'increases risk' if c > 0 else 'decreases risk'
+                }
+                for f, c in zip(self.feature_index[row, w], self.contribution[row, w])
+            ]
+            for w, weakness in enumerate(self.weakness_names)
+        }
+
+    def save(self, path) -> None:
+        np.savez_compressed(
+            Path(path),
+            session_ids=np.array(self.session_ids, dtype=str),
+            weakness_names=np.array(self.weakness_names),
+            feature_names=np.array(self.feature_names),
+            feature_index=self.feature_index,
+            contribution=self.contribution
+        )
+
+    @classmethod
+    def load(cls, path) -> 'SessionExplanations':
+        with np.load(Path(path)) as data:
+            return cls(
+                session_ids=data['session_ids'].tolist(),
+                weakness_names=data['weakness_names'].tolist(),
+                feature_names=data['feature_names'].tolist(),
+                feature_index=data['feature_index'],
+                contribution=data['contribution']
+            )
@@ -0,0 +1,39 @@
+import numpy as np
+from scipy.signal import lfilter
+
+def rolling_average(values: np.ndarray, window: int = 2) -> np.ndarray:
+    """Trailing rolling mean down axis 0 of a (sessions, metrics) array.
+
+    Uses a cumulative sum so each output is O(1) regardless of window.
+    The first window-1 rows keep their raw values, matching the legacy
+    list implementation.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = values.shape[0]
+    if n < window:
+        return values.copy()
+
+    cumsum = np.cumsum(values, axis=0)
+    smoothed = values.copy()
+    smoothed[window - 1] = cumsum[window - 1] / window
+    smoothed[window:] = (cumsum[window:] - cumsum[:-window]) / window
+    return smoothed
+
+def exponential_smoothing(values: np.ndarray, alpha: float = 0.3) -> np.ndarray:
+    """EWMA down axis 0 of a (sessions, metrics) array, seeded with the first row.
+
+    s[0] = x[0];  s[i] = alpha * x[i] + (1 - alpha) * s[i-1]
+
+    Evaluated as a first-order IIR filter over all metrics at once.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[0] == 0:
+        return values.copy()
+
+    decay = 1.0 - alpha
+    # Initial filter state so that the first output equals the first input
+    zi = (decay * values[0])[np.newaxis, ...]
+    smoothed, _ = lfilter([alpha], [1.0, -decay], values, axis=0, zi=zi)
+    # Seed exactly, not alpha * x0 + (1 - alpha) * x0
+    smoothed[0] = values[0]
+    return smoothed
@@ -0,0 +1,159 @@
+import csv
+import io
+import os
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+from feature_extractor import FeatureExtractor
+from session_aggregator import SessionAggregator
+
+class TelemetryFollower:
+    """Follow session CSVs while TelemetryLogger is still appending to them.
+
+    Each poll stats the directory and reads only the bytes appended since
+    the previous poll. A trailing line without its newline is left on disk
+    until the logger finishes it, so a half-written event is never parsed.
+
+    FeatureExtractor gives one attempt row per (session, minigame), so
+    events are buffered per minigame only while it is running. A poll
+    re-extracts just the minigames that received rows and re-aggregates
+    their sessions from the stored attempt rows; other sessions keep
+    their features. Once a minigame_end arrives the minigame's row is
+    final and its buffered events are dropped, so memory holds attempt
+    rows rather than raw events. Events for a minigame that has already
+    ended in that session (a replay) are ignored.
+
+    A file that was replaced is re-read from the start. Replacement is
+    detected when the file shrinks, its inode changes (written elsewhere
+    and renamed over), or its first bytes no longer match what was read
+    (rewritten in place to the same or a larger size). The prefix is only
+    re-read when the size or mtime moved.
+    """
+
+    PREFIX_BYTES = 256
+
+    def __init__(self, data_dir):
+        self.data_dir = Path(data_dir)
+        self.offsets: Dict[str, int] = {}
+        self.signatures: Dict[str, Tuple[int, int]] = {}
+        self.prefixes: Dict[str, bytes] = {}
+        self.headers: Dict[str, List[str]] = {}
+        self.file_sessions: Dict[str, Set[str]] = {}
+        self.open_events: Dict[Tuple[str, str], List[Dict]] = {}
+        self.attempts: Dict[str, Dict[str, Dict]] = {}
+        self.ended: Dict[str, Set[str]] = {}
+        self.features: Dict[str, Dict] = {}
+        self.event_count = 0
+
+        self.extractor = FeatureExtractor()
+        self.aggregator = SessionAggregator()
+
+    def poll(self) -> List[str]:
+        """Ingest newly appended lines; returns the ids of sessions that received events"""
+        touched = set()
+        with os.scandir(self.data_dir) as entries:
+            files = sorted((entry.name, entry.stat()) for entry in entries
+                           if entry.name.endswith('.csv') and entry.is_file())
+        for name, stat in files:
+            touched |= self._read_appended(name, stat)
+
+        if touched:
+            self._refresh(touched)
+        return sorted({session_id for session_id, _ in touched})
+
+    def session_features(self) -> pd.DataFrame:
+        """Current per-session features in the same layout as SessionAggregator"""
+        return pd.DataFrame(list(self.features.values()))
+
+    def _read_appended(self, name: str, stat: os.stat_result) -> Set[Tuple[str, str]]:
+        """Buffer the complete lines appended to one file; returns the (session, minigame) pairs they touched"""
+        size = stat.st_size
+        offset = self.offsets.get(name, 0)
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        previous = self.signatures.get(name)
+        if offset and (size != offset or signature != previous) and self._replaced(name, stat, offset, previous):
+            # Forget what the old file contributed and start over
+            sessions = self.file_sessions.pop(name, set())
+            for key in [key for key in self.open_events if key[0] in sessions]:
+                del self.open_events[key]
+            for session_id in sessions:
+                self.attempts.pop(session_id, None)
+                self.ended.pop(session_id, None)
+                self.features.pop(session_id, None)
+            self.headers.pop(name, None)
+            self.offsets.pop(name, None)
+            self.prefixes.pop(name, None)
+            offset = 0
+        self.signatures[name] = signature
+        if size == offset:
+            return set()
+
+        with open(self.data_dir / name, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read(size - offset)
+        complete = chunk[:chunk.rfind(b'\n') + 1]
+        if not complete:
+            return set()
+        self.offsets[name] = offset + len(complete)
+        if offset == 0:
+            self.prefixes[name] = complete[:self.PREFIX_BYTES]
+
+        rows = list(csv.reader(io.StringIO(complete.decode('utf-8-sig' if offset == 0 else 'utf-8'))))
+        if name not in self.headers:
+            self.headers[name] = rows.pop(0)
+        header = self.headers[name]
+
+        touched = set()
+        for row in rows:
+            if len(row) != len(header):
+                continue
+            event = dict(zip(header, row))
+            session_id = event['session_id'] = event.get('session_id') or 'unknown_session'
+            minigame_id = event.get('minigame_id', '')
+            if minigame_id in self.ended.get(session_id, ()):
+                continue
+            self.open_events.setdefault((session_id, minigame_id), []).append(event)
+            self.file_sessions.setdefault(name, set()).add(session_id)
+            touched.add((session_id, minigame_id))
+            self.event_count += 1
+        return touched
+
+    def _replaced(self, name: str, stat: os.stat_result, offset: int, previous: Tuple[int, int]) -> bool:
+        """Whether a file that changed since the last poll is a different file rather than appended to"""
+        if stat.st_size < offset or stat.st_ino != previous[0]:
+            return True
+        prefix = self.prefixes.get(name, b'')
+        with open(self.data_dir / name, 'rb') as f:
+            return f.read(len(prefix)) != prefix
+
+    def _refresh(self, minigames: Set[Tuple[str, str]]) -> None:
+        """Re-extract the touched minigames from their buffers and re-aggregate their sessions"""
+        minigames = sorted(minigames)
+        events = pd.DataFrame([event for key in minigames for event in self.open_events[key]])
+        events['timestamp_ms'] = pd.to_numeric(events['timestamp_ms'], errors='coerce')
+        rows = {(row['session_id'], row['minigame_id']): row
+                for row in self.extractor.extract_attempt_features(events).to_dict('records')}
+
+        for session_id, minigame_id in minigames:
+            session_attempts = self.attempts.setdefault(session_id, {})
+            if (session_id, minigame_id) in rows:
+                session_attempts[minigame_id] = rows[(session_id, minigame_id)]
+            else:
+                session_attempts.pop(minigame_id, None)
+            if any(event['event_type'] == 'minigame_end' for event in self.open_events[(session_id, minigame_id)]):
+                del self.open_events[(session_id, minigame_id)]
+                self.ended.setdefault(session_id, set()).add(minigame_id)
+
+        session_ids = sorted({session_id for session_id, _ in minigames})
+        attempts = [row for session_id in session_ids for row in self.attempts[session_id].values()]
+        aggregated = {}
+        if attempts:
+            aggregated = {row['session_id']: row
+                          for row in self.aggregator.aggregate_session_features(pd.DataFrame(attempts)).to_dict('records')}
+
+        # Updated sessions keep their position; sessions without attempts yet have no row
+        for session_id in session_ids:
+            if session_id in aggregated:
+                self.features[session_id] = aggregated[session_id]
+            else:
+                self.features.pop(session_id, None)
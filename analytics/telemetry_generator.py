@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import random
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Synthetic telemetry in the game's own format: one <session_id>.csv per
+# session, written the way TelemetryLogger does (header line, then one line
+# per event with the JSON payload quoted and its quotes doubled). Event types,
+# payload fields and timings follow the minigame controllers:
+#
+#   AntiAirController               anti_air_attempt {outcome, timing_ms}
+#   HitConfirmController            hit_confirm_attempt {outcome, timing_ms, was_hit_state}
+#   WhiffPunishController           whiff_punish_attempt {outcome, input_time_ms, phase_at_input, window_offset_ms}
+#   DefenseUnderPressureController  defense_attack_result per attack, then defense_string_complete
+#
+# Players have a per-minigame skill and learning rate, so outcomes, clusters
+# and trends carry signal rather than noise.
+
+HEADER = "session_id,minigame_id,event_type,timestamp_ms,payload\n"
+MINIGAMES = ['anti_air_reaction_test', 'hit_confirm_test', 'whiff_punish_test', 'defense_under_pressure_test']
+DEFAULT_START_TIME = 1700000000.0
+
+# DefenseUnderPressureController._attackStrings and its defense rules
+ATTACK_STRINGS = [['mid', 'low'], ['high', 'overhead'], ['low', 'mid', 'high'], ['overhead', 'low'],
+                  ['mid', 'overhead', 'low']]
+VALID_DEFENSES = {
+    'low': ['crouchblock'],
+    'mid': ['standblock', 'crouchblock'],
+    'high': ['standblock', 'crouchblock', 'crouch'],
+    'overhead': ['standblock']
+}
+EXPECTED_DEFENSE = {
+    'low': 'crouch_block',
+    'mid': 'stand_block,crouch_block',
+    'high': 'stand_block,crouch_block,crouch',
+    'overhead': 'stand_block'
+}
+DEFENSE_INPUTS = ['standblock', 'crouchblock', 'crouch', 'none']
+
+Event = Tuple[str, int, Optional[Dict]]
+
+class TelemetryGenerator:
+    """Deterministic generator of player sessions for a given seed.
+
+    Sessions are spread evenly over span_days; each belongs to one of
+    n_sessions / sessions_per_player players, whose skill moves by their
+    learning rate over the span.
+    """
+
+    def __init__(self, seed: int = 0, sessions_per_player: int = 25, span_days: float = 90.0,
+                 start_time: float = DEFAULT_START_TIME):
+        self.rng = random.Random(seed)
+        self.sessions_per_player = sessions_per_player
+        self.span_seconds = span_days * 86400
+        self.start_time = start_time
+
+    def generate(self, directory, n_sessions: int, player_map=None) -> Dict:
+        """Write n_sessions session files to directory; returns counts (and the player map path)"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        players = [self._player() for _ in range(max(1, round(n_sessions / self.sessions_per_player)))]
+        gap = self.span_seconds / max(n_sessions, 1)
+
+        event_count = 0
+        assignments = []
+        for i in range(n_sessions):
+            player_id = self.rng.randrange(len(players))
+            session_id = str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+            minigame_id = self.rng.choice(MINIGAMES)
+            skill = self._skill(players[player_id], minigame_id, i / max(n_sessions - 1, 1))
+            events = self.session_events(minigame_id, skill, players[player_id]['reaction_ms'])
+
+            path = directory / f"{session_id}.csv"
+            path.write_text(HEADER + ''.join(format_event(session_id, minigame_id, event) for event in events))
+            # mtime is when the last event was appended; the loader derives start_time from it
+            end_time = self.start_time + i * gap + self.rng.uniform(0, gap / 2) + events[-1][1] / 1000
+            os.utime(path, (end_time, end_time))
+
+            event_count += len(events)
+            assignments.append((session_id, f"p{player_id}"))
+
+        summary = {'sessions': n_sessions, 'events': event_count, 'players': len(players)}
+        if player_map:
+            with open(player_map, 'w') as f:
+                f.write("session_id,player_id\n")
+                f.writelines(f"{session_id},{player_id}\n" for session_id, player_id in assignments)
+            summary['player_map'] = str(player_map)
+        return summary
+
+    def session_events(self, minigame_id: str, skill: float, reaction_ms: float) -> List[Event]:
+        """(event_type, timestamp_ms, payload) for one session, start and end events included"""
+        start = self.rng.randint(5, 40)
+        if minigame_id == 'anti_air_reaction_test':
+            events = self._anti_air(start, skill, reaction_ms)
+        elif minigame_id == 'hit_confirm_test':
+            events = self._hit_confirm(start, skill, reaction_ms)
+        elif minigame_id == 'whiff_punish_test':
+            events = self._whiff_punish(start, skill, reaction_ms)
+        else:
+            events = self._defense(start, skill)
+        return [('minigame_start', start, {})] + events + [('minigame_end', events[-1][1], {})]
+
+    def _player(self) -> Dict:
+        return {
+            'skill': {minigame_id: self.rng.uniform(0.15, 0.85) for minigame_id in MINIGAMES},
+            'learning': {minigame_id: self.rng.gauss(0.1, 0.15) for minigame_id in MINIGAMES},
+            'reaction_ms': self.rng.uniform(110, 230)
+        }
+
+    @staticmethod
+    def _skill(player: Dict, minigame_id: str, progress: float) -> float:
+        return min(max(player['skill'][minigame_id] + player['learning'][minigame_id] * progress, 0.02), 0.98)
+
+    def _reaction(self, reaction_ms: float, limit: float) -> int:
+        return int(min(max(self.rng.gauss(reaction_ms, 40), 30), limit))
+
+    def _anti_air(self, start: int, skill: float, reaction_ms: float) -> List[Event]:
+        # The window opens once the threat crosses x=225 and lasts 300 ms
+        window_start = start + self.rng.randint(1500, 3500) + self.rng.randint(200, 320)
+        window_end = window_start + 300
+        if self.rng.random() < skill:
+            timing = self._reaction(reaction_ms, 299)
+            return [('anti_air_attempt', window_start + timing, {'outcome': 'success', 'timing_ms': timing})]
+
+        outcome = self.rng.choices(['early', 'late', 'missed'], weights=[0.35, 0.35, 0.3])[0]
+        if outcome == 'early':
+            return [('anti_air_attempt', window_start - self.rng.randint(20, 400), {'outcome': 'early', 'timing_ms': None})]
+        if outcome == 'late':
+            return [('anti_air_attempt', window_end + self.rng.randint(1, 250), {'outcome': 'late', 'timing_ms': None})]
+        # No input: the controller logs 'missed' every frame until the threat lands
+        first = window_end + self.rng.randint(1, 16)
+        return [('anti_air_attempt', first + frame * 16, {'outcome': 'missed', 'timing_ms': None})
+                for frame in range(self.rng.randint(1, 4))]
+
+    def _hit_confirm(self, start: int, skill: float, reaction_ms: float) -> List[Event]:
+        cue = start + self.rng.randint(1000, 3000)
+        is_hit = self.rng.random() > 0.5
+        correct = self.rng.random() < skill
+        pressed = is_hit == correct
+        if pressed:
+            timing = self._reaction(reaction_ms + 60, 499)
+            outcome = 'correct_hit_confirm' if is_hit else 'false_hit_confirm'
+            return [('hit_confirm_attempt', cue + timing,
+                     {'outcome': outcome, 'timing_ms': timing, 'was_hit_state': is_hit})]
+        outcome = 'missed_hit_confirm' if is_hit else 'correct_block'
+        return [('hit_confirm_attempt', cue + 500, {'outcome': outcome, 'timing_ms': None, 'was_hit_state': is_hit})]
+
+    def _whiff_punish(self, start: int, skill: float, reaction_ms: float) -> List[Event]:
+        # Startup 200 ms, active 150 ms, recovery 300 ms; no input by 800 ms is a missed punish
+        attack = start + self.rng.randint(1000, 3000)
+        active_end = attack + 350
+        if self.rng.random() < skill:
+            offset = self._reaction(reaction_ms - 40, 299)
+            return [self._whiff_event('correct_whiff_punish', active_end + offset, 'recovery', offset)]
+
+        outcome = self.rng.choices(['early_whiff_punish', 'unsafe_whiff_punish', 'late_whiff_punish', 'missed_punish'],
+                                   weights=[0.3, 0.3, 0.25, 0.15])[0]
+        if outcome == 'early_whiff_punish':
+            return [self._whiff_event(outcome, attack + self.rng.randint(0, 199), 'startup', None)]
+        if outcome == 'unsafe_whiff_punish':
+            return [self._whiff_event(outcome, attack + self.rng.randint(200, 349), 'active', None)]
+        if outcome == 'late_whiff_punish':
+            return [self._whiff_event(outcome, attack + self.rng.randint(650, 799), 'postrecovery', None)]
+        return [('whiff_punish_attempt', attack + 800,
+                 {'outcome': outcome, 'input_time_ms': None, 'phase_at_input': 'postrecovery', 'window_offset_ms': None})]
+
+    @staticmethod
+    def _whiff_event(outcome: str, input_time: int, phase: str, offset: Optional[int]) -> Event:
+        return ('whiff_punish_attempt', input_time,
+                {'outcome': outcome, 'input_time_ms': input_time, 'phase_at_input': phase, 'window_offset_ms': offset})
+
+    def _defense(self, start: int, skill: float) -> List[Event]:
+        # Each attack resolves 600 ms after it starts (400 startup + 200 impact); the next follows 300 ms later
+        attacks = self.rng.choice(ATTACK_STRINGS)
+        attack_start = start + self.rng.randint(1000, 2000)
+        events = []
+        for index, attack in enumerate(attacks):
+            if self.rng.random() < skill:
+                defense = self.rng.choice(VALID_DEFENSES[attack])
+            else:
+                defense = self.rng.choice([d for d in DEFENSE_INPUTS if d not in VALID_DEFENSES[attack]])
+            if defense not in VALID_DEFENSES[attack]:
+                outcome = 'hit_taken'
+            else:
+                outcome = 'correct_evade' if defense == 'crouch' else 'correct_block'
+
+            resolved = attack_start + 600 + self.rng.randint(0, 16)
+            events.append(('defense_attack_result', resolved, {
+                'attack_type': attack,
+                'expected_defense': EXPECTED_DEFENSE[attack],
+                'player_defense_input': defense,
+                'outcome': outcome,
+                'input_time_ms': resolved - attack_start,
+                'attack_index_in_string': index
+            }))
+            attack_start = resolved + 300
+        events.append(('defense_string_complete', attack_start,
+                       {'total_hits': len(attacks), 'successful_defenses': 0, 'string_success': False}))
+        return events
+
+def format_event(session_id: str, minigame_id: str, event: Event) -> str:
+    """One TelemetryLogger line: compact JSON payload, quoted, with quotes doubled"""
+    event_type, timestamp_ms, payload = event
+    payload_json = json.dumps(payload, separators=(',', ':')).replace('"', '""')
+    return f'{session_id},{minigame_id},{event_type},{timestamp_ms},"{payload_json}"\n'
+
+def generate_telemetry(directory, n_sessions: int, seed: int = 0, player_map=None, **options) -> Dict:
+    return TelemetryGenerator(seed=seed, **options).generate(directory, n_sessions, player_map=player_map)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic session telemetry in the game's CSV format")
+    parser.add_argument("telemetry_directory", help="directory to write <session_id>.csv files to")
+    parser.add_argument("--sessions", type=int, default=1000, help="number of sessions (default 1000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sessions-per-player", type=int, default=25,
+                        help="average sessions per synthetic player (default 25)")
+    parser.add_argument("--player-map", help="also write a session_id,player_id CSV here")
+    args = parser.parse_args()
+
+    summary = generate_telemetry(args.telemetry_directory, args.sessions, seed=args.seed,
+                                 player_map=args.player_map, sessions_per_player=args.sessions_per_player)
+    print(f"Wrote {summary['sessions']} sessions ({summary['events']} events, {summary['players']} players) "
+          f"to {args.telemetry_directory}")
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,117 @@
 import pandas as pd
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
 
 class TelemetryLoader:
-    def __init__(self, data_dir: str):
+    # One row per session file. start_time is wall-clock epoch seconds:
+    # timestamp_ms in the CSV is elapsed time since the session started, and the
+    # file's mtime is when its last event was appended, so
+    #   start_time = file_mtime - last_timestamp_ms / 1000
+    INDEX_COLUMNS = ['session_id', 'source_file', 'start_time', 'duration_ms', 'file_mtime', 'file_size']
+
+    def __init__(self, data_dir: str, index_path: Optional[str] = None):
         self.data_dir = Path(data_dir)
-    
+        self.index_path = Path(index_path) if index_path else None
+        self.session_index = None
+
     def load_session(self, session_file: str) -> pd.DataFrame:
         file_path = self.data_dir / session_file
         return pd.read_csv(file_path)
-    
+
     def load_all_sessions(self) -> pd.DataFrame:
+        chunks = list(self.iter_session_chunks())
+        return chunks[0] if chunks else pd.DataFrame()
+
+    def iter_session_chunks(self, max_bytes: Optional[int] = None,
+                            max_files: Optional[int] = None) -> Iterator[pd.DataFrame]:
+        """Events of consecutive session files, at most max_bytes of CSV and max_files files per chunk.
+
+        Files are never split, so every session is whole within one chunk
+        and a chunk holds at least one file. Without limits everything
+        comes as a single chunk. session_index is set once the iterator is
+        exhausted.
+        """
         csv_files = list(self.data_dir.glob("*.csv"))
         if not csv_files:
-            return pd.DataFrame()
-        
+            return
+
         sessions = []
+        chunk_size = 0
+        index_entries = []
         for file_path in csv_files:
+            size = file_path.stat().st_size
+            full = (max_bytes is not None and chunk_size + size > max_bytes) or \
+                (max_files is not None and len(sessions) >= max_files)
+            if sessions and full:
+                yield pd.concat(sessions, ignore_index=True)
+                sessions = []
+                chunk_size = 0
+
             df = pd.read_csv(file_path)
             sessions.append(df)
-        
-        return pd.concat(sessions, ignore_index=True)
\ No newline at end of file
+            chunk_size += size
+
+            # The events are already in memory, so indexing costs only a stat
+            entry = self._index_entry(file_path, df)
+            if entry:
+                index_entries.append(entry)
+
+        self.session_index = self._finalize_index(index_entries)
+        self._save_index()
+
+        yield pd.concat(sessions, ignore_index=True)
+
+    def load_session_index(self) -> pd.DataFrame:
+        """Session start times and source files, rescanning only new or changed files.
+
+        Files whose mtime and size match the persisted index are not re-read.
+        """
+        cached = {}
+        if self.index_path and self.index_path.exists():
+            persisted = pd.read_csv(self.index_path)
+            cached = {row['source_file']: row for row in persisted.to_dict('records')}
+
+        index_entries = []
+        for file_path in self.data_dir.glob("*.csv"):
+            stat = file_path.stat()
+            previous = cached.get(file_path.name)
+            if previous and previous['file_mtime'] == stat.st_mtime and previous['file_size'] == stat.st_size:
+                index_entries.append(previous)
+                continue
+
+            df = pd.read_csv(file_path, usecols=['session_id', 'timestamp_ms'])
+            entry = self._index_entry(file_path, df)
+            if entry:
+                index_entries.append(entry)
+
+        self.session_index = self._finalize_index(index_entries)
+        self._save_index()
+        return self.session_index
+
+    def _index_entry(self, file_path: Path, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        if df.empty or 'session_id' not in df.columns or df['session_id'].dropna().empty:
+            return None
+
+        stat = file_path.stat()
+        timestamps = pd.to_numeric(df['timestamp_ms'], errors='coerce') if 'timestamp_ms' in df.columns else pd.Series(dtype=float)
+        duration_ms = float(timestamps.max()) if timestamps.notna().any() else 0.0
+
+        return {
+            'session_id': df['session_id'].dropna().iloc[0],
+            'source_file': file_path.name,
+            'start_time': stat.st_mtime - duration_ms / 1000.0,
+            'duration_ms': duration_ms,
+            'file_mtime': stat.st_mtime,
+            'file_size': stat.st_size
+        }
+
+    def _finalize_index(self, index_entries: List[Dict[str, Any]]) -> pd.DataFrame:
+        index = pd.DataFrame(index_entries, columns=self.INDEX_COLUMNS)
+        return index.sort_values(['start_time', 'session_id']).reset_index(drop=True)
+
+    def _save_index(self):
+        if self.index_path is None or self.session_index is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.session_index.to_csv(self.index_path, index=False)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import contextlib
+import io
+import json
+import tempfile
+import urllib.error
+import urllib.request
+from pathlib import Path
+from analyze import run_analysis
+from analytics_service import AnalyticsService, start_server
+from test_batch_analyze import HEADER, write_tenant
+
+def _processed_tenant(root: Path) -> Path:
+    telemetry = write_tenant(root, "tenant", n_sessions=12)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_analysis(telemetry)
+    return telemetry
+
+def test_batch_scoring():
+    """Stored models score new sessions; bad CSVs fail alone"""
+    print("=== Analytics Service Batch Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = _processed_tenant(Path(tmp))
+        service = AnalyticsService(telemetry.parent / "processed")
+        info = service.describe()
+        assert info['cluster_method'] in ('kmeans', 'gmm')
+        assert info['trend_sessions'] == info['reference_sessions'] == 12
+
+        new_session = (telemetry / "tenant-4.csv").read_text().replace("tenant-4", "new-1")
+        responses = service.analyze_batch([new_session, "not,telemetry\n1,2\n"])
+
+        assert 'error' in responses[1]
+        session = responses[0]['sessions'][0]
+        assert session['session_id'] == 'new-1'
+        assert session['features']['anti_air_reaction_test_attempts'] == 1
+        assert 'cluster' in session and 'insights' in session
+        if service.weakness_engine:
+            assert set(session['weakness_probabilities']) == set(service.weakness_engine.weakness_names)
+        assert responses[0]['trends']['session_count'] == 13
+        json.dumps(responses)
+
+        # Re-posting a known session does not count it again
+        assert service.analyze(new_session)['trends']['session_count'] == 13
+        assert service.analyze((telemetry / "tenant-0.csv").read_text())['trends']['session_count'] == 13
+
+        # Two requests with the same session id in one batch each get their own result
+        repeat = new_session.replace("new-1", "new-2")
+        first, second = service.analyze_batch([repeat, repeat])
+        assert [s['session_id'] for s in first['sessions']] == ['new-2']
+        assert [s['session_id'] for s in second['sessions']] == ['new-2']
+        assert first['sessions'][0]['features'] == second['sessions'][0]['features'] == \
+            {**session['features'], 'session_id': 'new-2'}
+        assert second['trends']['session_count'] == 14
+
+        # Valid CSVs without any session get an empty result, not a missing one
+        no_ids = HEADER + ',anti_air_reaction_test,minigame_start,1000,"{}"\n'
+        empty, unnamed, scored = service.analyze_batch([HEADER, no_ids, repeat])
+        assert empty == {'sessions': [], 'trends': scored['trends']}
+        assert unnamed == {'sessions': [], 'trends': scored['trends']}
+        assert service.analyze(HEADER)['sessions'] == []
+
+    print(f"Scored session in cluster {session['cluster']['cluster']} with {len(session['insights'])} insights")
+
+def test_http_round_trip():
+    """POST /sessions and GET /health over a local HTTP server"""
+    print("\n=== Analytics Service HTTP Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = _processed_tenant(Path(tmp))
+        server, batcher = start_server(telemetry.parent / "processed", port=0)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            health = json.load(urllib.request.urlopen(f"{base}/health"))
+            assert health['status'] == 'ok'
+
+            body = (telemetry / "tenant-0.csv").read_bytes()
+            response = json.load(urllib.request.urlopen(urllib.request.Request(f"{base}/sessions", data=body)))
+            assert response['sessions'][0]['session_id'] == 'tenant-0'
+
+            empty = json.load(urllib.request.urlopen(urllib.request.Request(f"{base}/sessions", data=HEADER.encode())))
+            assert empty['sessions'] == []
+
+            try:
+                urllib.request.urlopen(urllib.request.Request(f"{base}/sessions", data=b"a,b\n"))
+                assert False, "invalid CSV should be rejected"
+            except urllib.error.HTTPError as e:
+                assert e.code == 400
+        finally:
+            server.shutdown()
+            server.server_close()
+            batcher.close()
+
+    print("HTTP endpoints OK")
+
+def main():
+    test_batch_scoring()
+    test_http_round_trip()
+    print("\nAnalytics service tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+from batch_analyze import expand_directories, run_batch, LOG_FILE
+
+HEADER = "session_id,minigame_id,event_type,timestamp_ms,payload\n"
+OUTCOMES = ['success', 'early', 'late']
+
+def write_tenant(root: Path, name: str, n_sessions: int = 8) -> Path:
+    """A tenant folder with anti-air sessions played an hour apart"""
+    telemetry = root / name / "telemetry"
+    telemetry.mkdir(parents=True)
+    for i in range(n_sessions):
+        outcome = OUTCOMES[i % len(OUTCOMES)]
+        payload = json.dumps({'outcome': outcome, 'timing_ms': 40.0 + i if outcome == 'success' else None})
+        path = telemetry / f"{name}-{i}.csv"
+        path.write_text(
+            HEADER +
+            f'{name}-{i},anti_air_reaction_test,minigame_start,1000,"{{}}"\n' +
+            f'{name}-{i},anti_air_reaction_test,anti_air_attempt,1500,"{payload.replace(chr(34), chr(34) * 2)}"\n' +
+            f'{name}-{i},anti_air_reaction_test,minigame_end,2000,"{{}}"\n'
+        )
+        os.utime(path, (1_700_000_000 + i * 3600,) * 2)
+    return telemetry
+
+def test_batch_isolates_tenants():
+    """Each tenant gets its own processed/ folder and a failing tenant does not stop the rest"""
+    print("=== Batch Analysis Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_tenant(root, "alpha")
+        write_tenant(root, "beta")
+        broken = root / "gamma" / "telemetry"
+        broken.mkdir(parents=True)
+        (broken / "bad.csv").write_text("session_id,minigame_id\nx,anti_air_reaction_test\n")
+
+        directories = expand_directories([str(root / "*" / "telemetry"), str(root / "alpha" / "telemetry")])
+        assert [d.parent.name for d in directories] == ['alpha', 'beta', 'gamma']
+
+        summary = run_batch(directories, workers=2)
+        assert (summary['succeeded'], summary['failed']) == (2, 1)
+        assert [record['status'] for record in summary['directories']] == ['ok', 'ok', 'failed']
+        assert summary['directories'][2]['error']
+        for name in ['alpha', 'beta']:
+            processed = root / name / "processed"
+            assert (processed / "session_features.csv").exists()
+            assert (processed / "insights.jsonl").exists()
+            assert "Analysis complete" in (processed / LOG_FILE).read_text()
+
+        # A second in-process pass reuses every cached stage
+        rerun = run_batch(directories[:2], workers=1)
+        assert all(record['stages_ran'] == [] for record in rerun['directories'])
+        print(f"{summary['succeeded']} tenants analyzed, {summary['failed']} failure isolated")
+
+def test_workers_share_the_cores():
+    """Each pooled run's joblib stages get cores // workers jobs, not every core"""
+    print("\n=== Batch Worker Jobs Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        directories = [write_tenant(root, "alpha"), write_tenant(root, "beta")]
+        with mock.patch('batch_analyze.os.cpu_count', return_value=8):
+            summary = run_batch(directories, workers=2, evaluate=True)
+        assert summary['succeeded'] == 2
+        assert summary['options']['n_jobs'] == 4
+        for name in ['alpha', 'beta']:
+            metrics = json.loads((root / name / "processed" / "run_metrics.json").read_text())
+            runtime = {record['stage']: record.get('runtime') for record in metrics['stages']}
+            assert runtime['classify'] == {'n_jobs': 4}, runtime
+            assert runtime['evaluate'] == {'n_jobs': 4}, runtime
+
+        with mock.patch('batch_analyze.os.cpu_count', return_value=2):
+            assert run_batch(directories, workers=4)['options']['n_jobs'] == 1
+        assert 'n_jobs' not in run_batch(directories, workers=1)['options']
+    print("Worker runs got n_jobs=4 of 8 cores")
+
+def test_shared_output_folder_rejected():
+    """Two telemetry folders with the same parent would overwrite each other's outputs"""
+    print("\n=== Batch Output Collision Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = Path(tmp) / "telemetry"
+        second = Path(tmp) / "telemetry_backup"
+        first.mkdir()
+        second.mkdir()
+        try:
+            run_batch([first, second])
+            assert False, "shared processed/ folder should be rejected"
+        except ValueError:
+            pass
+    print("Collision rejected")
+
+def main():
+    test_batch_isolates_tenants()
+    test_workers_share_the_cores()
+    test_shared_output_folder_rejected()
+    print("\nBatch analysis tests passed")
+
+if __name__ == "__main__":
+    main()
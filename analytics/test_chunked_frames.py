@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+import contextlib
+import filecmp
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+import numpy as np
+import pandas as pd
+import chunked_frames
+from chunked_frames import SpilledFrames, chunk_bytes, parse_memory_budget
+from telemetry_generator import generate_telemetry
+from analyze import run_analysis
+from columnar_store import read_table
+
+def test_parse_memory_budget():
+    print("Testing memory budget parsing...")
+
+    assert parse_memory_budget("512M") == 512 * 2**20
+    assert parse_memory_budget("2GB") == 2 * 2**30
+    assert parse_memory_budget("1.5g") == int(1.5 * 2**30)
+    assert parse_memory_budget("64") == 64 * 2**20
+    assert parse_memory_budget("100KiB") == 100 * 2**10
+    for invalid in ["", "lots", "-1G", "2X"]:
+        try:
+            parse_memory_budget(invalid)
+            assert False, invalid
+        except ValueError:
+            pass
+    print("✓ Units and bare megabytes parsed, junk rejected")
+
+def test_chunk_bytes():
+    print("\nTesting chunk sizing...")
+
+    budget = 1 * 2**30
+    plain = chunk_bytes(budget, n_sessions=0)
+    assert plain == budget // chunked_frames.WORKING_SET_PER_CSV_BYTE
+    # Resident memory and the session matrix come out of the budget
+    assert chunk_bytes(budget, n_sessions=100_000, resident_bytes=200 * 2**20) < plain
+    # A budget below the fixed cost still yields a usable chunk
+    assert chunk_bytes(2**20, n_sessions=1_000_000, resident_bytes=2**30) == chunked_frames.MIN_CHUNK_BYTES
+    print(f"✓ 1 GB budget reads {plain / 2**20:.0f} MB of CSV per chunk")
+
+def test_spilled_frames_match_concat():
+    print("\nTesting spilled chunks against pd.concat...")
+
+    chunks = [
+        pd.DataFrame({'session_id': ['a', 'b'], 'minigame_id': ['x', 'x'], 'attempts': [1, 2]}),
+        pd.DataFrame({'session_id': ['c'], 'minigame_id': ['y'], 'rate': [0.5]}),
+        pd.DataFrame({'session_id': ['d'], 'minigame_id': ['x'], 'attempts': [3], 'rate': [np.nan]})
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        spilled = SpilledFrames(Path(tmp) / "spill", "part")
+        for chunk in chunks:
+            spilled.append(chunk)
+
+        expected = pd.concat(chunks, ignore_index=True)
+        assert len(spilled) == 3
+        assert spilled.shape == (4, 4)
+        assert spilled.columns == list(expected.columns)
+        pd.testing.assert_frame_equal(spilled.to_frame(), expected)
+
+        spilled.to_csv(Path(tmp) / "streamed.csv")
+        expected.to_csv(Path(tmp) / "expected.csv", index=False)
+        assert (Path(tmp) / "streamed.csv").read_text() == (Path(tmp) / "expected.csv").read_text()
+    print("✓ Union of columns, dtypes and CSV text match")
+
+def _no_to_frame(self):
+    raise AssertionError("SpilledFrames.to_frame called in a memory-budget run")
+
+def test_chunked_run_matches_in_memory():
+    print("\nTesting an out-of-core run against the in-memory pipeline...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        outputs = {}
+        for mode, budget in [('memory', None), ('chunked', 1)]:
+            root = Path(tmp) / mode
+            generate_telemetry(root / "telemetry", 60, seed=11, player_map=root / "player_map.csv")
+            # Smallest possible chunks: every session file is its own chunk
+            original = chunked_frames.MIN_CHUNK_BYTES
+            chunked_frames.MIN_CHUNK_BYTES = 1
+            # Budget runs must never rebuild the attempts table in memory
+            original_to_frame = SpilledFrames.to_frame
+            if budget:
+                SpilledFrames.to_frame = _no_to_frame
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run_analysis(root / "telemetry", player_map=root / "player_map.csv", memory_budget=budget,
+                                 table_format="both")
+            finally:
+                chunked_frames.MIN_CHUNK_BYTES = original
+                SpilledFrames.to_frame = original_to_frame
+            outputs[mode] = root / "processed"
+
+        metrics = json.loads((outputs['chunked'] / "run_metrics.json").read_text())
+        load = next(record for record in metrics['stages'] if record['stage'] == 'load')
+        assert load['rows_out']['event_chunks'] > 0
+        assert len(list(outputs['chunked'].glob("stage_cache/load/*/events/*.joblib"))) == 60
+
+        for name in ["attempt_features.csv", "session_features.csv", "session_index.csv", "trend_analysis.json",
+                     "weakness_predictions.json", "cluster_interpretations.json", "insights.jsonl",
+                     "player_trends.jsonl"]:
+            assert filecmp.cmp(outputs['memory'] / name, outputs['chunked'] / name, shallow=False), name
+        for name in ["attempt_features", "session_features"]:
+            pd.testing.assert_frame_equal(read_table(outputs['memory'] / name), read_table(outputs['chunked'] / name))
+    print("✓ 60 single-session chunks give identical processed/ outputs, CSV and columnar")
+
+def main():
+    print("=== Chunked Frames Tests ===\n")
+
+    test_parse_memory_budget()
+    test_chunk_bytes()
+    test_spilled_frames_match_concat()
+    test_chunked_run_matches_in_memory()
+
+    print("\n=== All tests passed! ===")
+
+if __name__ == "__main__":
+    main()
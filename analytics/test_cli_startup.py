@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from analysis_stages import build_stages
+from benchmark_startup import ANALYZE, write_telemetry
+
+HEAVY_MODULES = ['sklearn', 'scipy', 'joblib']
+
+def test_validate_skips_heavy_imports():
+    """Importing analyze and running validate never loads the ML stack"""
+    print("=== CLI Startup Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = Path(tmp) / "telemetry"
+        telemetry.mkdir()
+        write_telemetry(telemetry)
+
+        # joblib is allowed after the run: a cold cache stores the validate outputs
+        script = (
+            "import sys, json\n"
+            f"sys.path.insert(0, {str(ANALYZE.parent)!r})\n"
+            "import analyze\n"
+            f"at_import = sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES!r})\n"
+            f"analyze.main(['validate', {str(telemetry)!r}])\n"
+            f"after_run = sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES[:2]!r})\n"
+            "print(json.dumps({'at_import': at_import, 'after_run': after_run}))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+
+        assert loaded['at_import'] == [], loaded['at_import']
+        assert loaded['after_run'] == [], loaded['after_run']
+        assert (Path(tmp) / "processed" / "stage_cache" / "validate").is_dir()
+        assert not (Path(tmp) / "processed" / "session_features.csv").exists()
+
+    print("validate ran without sklearn/scipy")
+
+def test_subcommand_stage_selection():
+    """Targets pull in their upstream stages and nothing downstream"""
+    print("\n=== Subcommand Stage Test ===")
+
+    def names(**kwargs):
+        return [stage.name for stage in build_stages(**kwargs)]
+
+    assert names(targets=['validate']) == ['load', 'validate']
+    assert names(targets=['validate', 'cluster']) == ['load', 'validate', 'extract', 'aggregate', 'select', 'cluster']
+    assert names(evaluate=True, targets=['classify', 'evaluate']) == [
+        'load', 'extract', 'aggregate', 'classify', 'evaluate'
+    ]
+    # Optional stages that were not requested stay out even when targeted
+    assert names(targets=['trends', 'player_trends']) == ['load', 'extract', 'aggregate', 'trends']
+    assert names() == names(targets=[stage for stage in names()])
+    print("Stage selection OK")
+
+def main():
+    test_validate_skips_heavy_imports()
+    test_subcommand_stage_selection()
+    print("\nCLI startup tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import tempfile
+import numpy as np
+from pathlib import Path
+from clustering import PlayerClustering
+from cluster_inference import ClusterInferenceEngine
+from feature_selector import FeatureSelector
+from test_weakness_classifier import create_test_data
+
+def _fit_clustering():
+    features = FeatureSelector().select_clustering_features(create_test_data())
+    clusterer = PlayerClustering()
+    results = clusterer.fit_clustering_models(features)
+    interpretations = clusterer.interpret_clusters(features, results)
+    return clusterer, features, interpretations
+
+def test_engine_matches_sklearn_models():
+    """Exported k-means and GMM engines assign the same clusters as sklearn"""
+    print("=== Cluster Inference Parity Test ===")
+
+    clusterer, features, interpretations = _fit_clustering()
+    X_scaled = clusterer.scaler.transform(features[clusterer.feature_names])
+    for method, model in [('kmeans', clusterer.best_kmeans), ('gmm', clusterer.best_gmm)]:
+        engine = clusterer.export_inference_engine(features, {**interpretations, 'method_used': method})
+        assert engine.method == method
+        assert np.array_equal(engine.predict(engine.to_matrix(features)), model.predict(X_scaled))
+
+    engine = clusterer.export_inference_engine(features, interpretations)
+    assignments = engine.assign(features)
+    assert {a['cluster'] for a in assignments.values()} <= set(range(len(engine.centers)))
+    print(f"Engines match sklearn ({interpretations['method_used']} chosen, {len(engine.centers)} clusters)")
+
+def test_engine_fills_missing_and_round_trips():
+    """NaN features take the training medians and a saved engine reloads unchanged"""
+    print("\n=== Cluster Inference Round Trip Test ===")
+
+    clusterer, features, interpretations = _fit_clustering()
+    for method in ['kmeans', 'gmm']:
+        engine = clusterer.export_inference_engine(features, {**interpretations, 'method_used': method})
+        X = engine.to_matrix(features)
+        X_missing = X.copy()
+        X_missing[:, 0] = np.nan
+        X_filled = X.copy()
+        X_filled[:, 0] = features[engine.feature_names[0]].median()
+        assert np.array_equal(engine.predict(X_missing), engine.predict(X_filled))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cluster_model.npz"
+            engine.save(path)
+            loaded = ClusterInferenceEngine.load(path)
+        assert loaded.method == method and loaded.descriptions == engine.descriptions
+        assert np.array_equal(loaded.predict(X), engine.predict(X))
+    print("Missing values and round trip OK")
+
+def main():
+    test_engine_matches_sklearn_models()
+    test_engine_fills_missing_and_round_trips()
+    print("\nCluster inference tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import columnar_store
+from columnar_store import write_table, write_table_chunks, read_table, list_partitions
+
+def create_attempts():
+    return pd.DataFrame({
+        'session_id': ['s1', 's2', 's3', 's4', 's5'],
+        'minigame_id': ['whiff_punish_test', 'anti_air_reaction_test', 'whiff_punish_test', None, 'anti_air_reaction_test'],
+        'outcome_late': [1, 0, 0, 1, 0],
+        'timing_error_ms': [np.nan, 42.5, np.nan, np.nan, 17.0],
+        'phase_at_input': ['recovery', None, 'startup', None, None],
+        'has_timing_data': [False, True, False, False, True]
+    })
+
+def test_round_trip_keeps_dtypes_and_order():
+    """Partitioned tables read back identical to the written frame"""
+    print("=== Columnar Store Round Trip Test ===")
+
+    attempts = create_attempts()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "attempt_features"
+        manifest = write_table(attempts, path, partition_by='minigame_id')
+
+        assert list_partitions(path) == ['anti_air_reaction_test', 'unknown', 'whiff_punish_test']
+        # Columns that are entirely missing in a partition are not stored
+        assert 'timing_error_ms' not in manifest['partitions']['whiff_punish_test']['columns']
+        pd.testing.assert_frame_equal(read_table(path), attempts)
+
+    print("Round trip OK")
+
+def test_selective_reads():
+    """Only the requested columns and partitions are loaded"""
+    print("\n=== Columnar Store Selective Read Test ===")
+
+    attempts = create_attempts()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "attempt_features"
+        write_table(attempts, path, partition_by='minigame_id')
+
+        subset = read_table(path, columns=['session_id', 'timing_error_ms'], partitions=['anti_air_reaction_test'])
+        assert list(subset.columns) == ['session_id', 'timing_error_ms']
+        assert subset['session_id'].tolist() == ['s2', 's5']
+        assert subset['timing_error_ms'].tolist() == [42.5, 17.0]
+
+        mapped = read_table(path, columns=['outcome_late'], mmap=True)
+        assert mapped['outcome_late'].tolist() == [1, 0, 0, 1, 0]
+
+        dated = write_table(attempts.drop(columns='minigame_id'), Path(tmp) / "by_date", partition_by='date',
+                            partition_values=['2024-01-01', '2024-01-02', '2024-01-01', None, '2024-01-02'])
+        assert sorted(dated['partitions']) == ['2024-01-01', '2024-01-02', 'unknown']
+
+        try:
+            read_table(path, columns=['missing_column'])
+            assert False, "unknown columns should raise"
+        except KeyError:
+            pass
+
+    print("Selective reads OK")
+
+def test_chunked_write_matches_whole_table():
+    """Writing chunk by chunk reads back as the concatenated table"""
+    print("\n=== Columnar Store Chunked Write Test ===")
+
+    attempts = create_attempts()
+    chunks = [attempts.iloc[:2], attempts.iloc[2:3], attempts.iloc[3:]]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "attempt_features"
+        manifest = write_table_chunks(iter(chunks), path, partition_by='minigame_id')
+
+        assert manifest['row_count'] == len(attempts)
+        assert list_partitions(path) == ['anti_air_reaction_test', 'unknown', 'whiff_punish_test']
+        assert len(manifest['partitions']['whiff_punish_test']['segments']) == 2
+        pd.testing.assert_frame_equal(read_table(path), attempts)
+        subset = read_table(path, columns=['session_id'], partitions=['anti_air_reaction_test'])
+        assert subset['session_id'].tolist() == ['s2', 's5']
+
+        # int in one chunk and float in another is stored as pd.concat types it
+        mixed = [pd.DataFrame({'x': [1, 2]}), pd.DataFrame({'x': [0.5]})]
+        write_table_chunks(mixed, Path(tmp) / "mixed")
+        pd.testing.assert_frame_equal(read_table(Path(tmp) / "mixed"), pd.concat(mixed, ignore_index=True))
+
+    print("Chunked writes OK")
+
+def test_failed_write_keeps_previous_table():
+    """The manifest only switches once a new version is complete"""
+    print("\n=== Columnar Store Atomic Write Test ===")
+
+    attempts = create_attempts()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "attempt_features"
+        write_table(attempts, path, partition_by='minigame_id')
+
+        original_save = columnar_store._save_column
+        def failing_save(part_dir, spec, values):
+            if spec['name'] == 'phase_at_input':
+                raise OSError("disk full")
+            original_save(part_dir, spec, values)
+
+        columnar_store._save_column = failing_save
+        try:
+            write_table(attempts.assign(outcome_late=9), path, partition_by='minigame_id')
+            assert False, "write should fail"
+        except OSError:
+            pass
+        finally:
+            columnar_store._save_column = original_save
+        pd.testing.assert_frame_equal(read_table(path), attempts)
+
+        # Successful rewrites keep the current and previous versions only
+        for late in [2, 3]:
+            write_table(attempts.assign(outcome_late=late), path, partition_by='minigame_id')
+        assert read_table(path, columns=['outcome_late'])['outcome_late'].unique().tolist() == [3]
+        assert len([p for p in path.iterdir() if p.is_dir()]) == 2
+
+    print("Atomic writes OK")
+
+def main():
+    test_round_trip_keeps_dtypes_and_order()
+    test_selective_reads()
+    test_chunked_write_matches_whole_table()
+    test_failed_write_keeps_previous_table()
+    print("\nColumnar store tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+import numpy as np
+from feature_dictionary import FEATURE_DICTIONARY
+from feature_schema import FEATURE_SCHEMA, MINIGAMES
+
+def test_schema_compiled():
+    """Every dictionary entry compiles to a spec with a minigame and direction"""
+    print("=== Feature Schema Test ===")
+
+    assert FEATURE_SCHEMA.names == list(FEATURE_DICTIONARY)
+    for i, spec in enumerate(FEATURE_SCHEMA.specs):
+        assert spec.index == i
+        assert spec.minigame in MINIGAMES
+        assert spec.name.startswith(spec.minigame)
+
+    spec = FEATURE_SCHEMA.get('hit_confirm_test_false_confirm_rate')
+    assert (spec.minigame, spec.category, spec.direction) == ('hit_confirm_test', 'false_confirm_rate', 'lower_is_better')
+    assert FEATURE_SCHEMA.get('whiff_punish_test_attempts').dtype == 'int64'
+    assert FEATURE_SCHEMA.get('session_id') is None
+    print(f"Compiled {len(FEATURE_SCHEMA.specs)} feature specs")
+
+def test_column_lookups():
+    """Category filters keep column order and skip unknown columns"""
+    print("\n=== Feature Schema Lookup Test ===")
+
+    columns = ['session_id', 'whiff_punish_test_late_rate', 'anti_air_reaction_test_success_rate',
+               'hit_confirm_test_missed_confirm_rate', 'anti_air_reaction_test_late_rate', 'custom_late_rate']
+
+    assert list(FEATURE_SCHEMA.index_of(columns)[[0, 5]]) == [-1, -1]
+    assert FEATURE_SCHEMA.columns_in(columns, ['late_rate', 'miss_rate']) == [
+        'whiff_punish_test_late_rate', 'anti_air_reaction_test_late_rate'
+    ]
+    assert np.array_equal(FEATURE_SCHEMA.lower_is_better(columns), [False, True, False, True, True, False])
+    print("Lookups OK")
+
+def main():
+    test_schema_compiled()
+    test_column_lookups()
+    print("\nFeature schema tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import json
+import tempfile
+import numpy as np
+from pathlib import Path
+from insight_contract import InsightType, InsightVocabulary, InsightDataStructure
+from insight_engine import InsightEngine
+from trend_analyzer import TrendAnalyzer
+from weakness_inference import WeaknessInferenceEngine
+from test_weakness_inference import _train_classifier
+from test_trend_analyzer import create_trend_test_data
+
+def test_vocabulary_indexes():
+    """Indexed lookups match a scan of DEFINITIONS"""
+    print("=== Insight Vocabulary Index Test ===")
+
+    for source in ["weakness_classifier", "trend_analyzer", "clustering", "feature_extractor", "unknown"]:
+        scanned = [t for t, d in InsightVocabulary.DEFINITIONS.items() if source in d["ml_sources"]]
+        assert InsightVocabulary.get_insights_by_ml_source(source) == scanned
+
+    assert InsightVocabulary.get_insights_by_metric("whiff_punish_test_miss_rate") == [
+        InsightType.LATE_REACTIONS, InsightType.MISSED_OPPORTUNITIES
+    ]
+    print("Source and metric indexes OK")
+
+def test_session_insights():
+    """Weakness probabilities and feature percentiles become valid insights"""
+    print("\n=== Session Insight Generation Test ===")
+
+    classifier, test_df = _train_classifier()
+    inference = WeaknessInferenceEngine.from_classifier(classifier)
+    probabilities = inference.predict_proba(inference.to_matrix(test_df))
+
+    engine = InsightEngine()
+    insights = engine.generate_session_insights(test_df, probabilities, inference.weakness_names)
+    assert insights
+
+    for session_id, insight in insights:
+        assert session_id in set(test_df['session_id'])
+        assert InsightDataStructure.validate_insight(insight) == []
+
+    # Sessions 3-5 were built with high false confirm rates
+    mixup = {sid for sid, insight in insights if insight.insight_type == InsightType.POOR_MIXUP_DEFENSE}
+    assert {'test_session_3', 'test_session_4', 'test_session_5'} & mixup
+
+    # Without a classifier the feature-derived confidence still applies
+    feature_only = engine.generate_session_insights(test_df)
+    assert all(InsightDataStructure.validate_insight(insight) == [] for _, insight in feature_only)
+
+    # A session scored against the rest as reference matches its place in the full batch
+    with_reference = engine.generate_session_insights(test_df.iloc[[4]], probabilities[[4]], inference.weakness_names,
+                                                      reference_df=test_df.drop(index=4))
+    batch_session_4 = [insight for sid, insight in insights if sid == 'test_session_4']
+    assert [insight.insight_id for _, insight in with_reference] == [insight.insight_id for insight in batch_session_4]
+
+    print(f"Generated {len(insights)} insights for {len(test_df)} sessions")
+
+def test_trend_insights_jsonl():
+    """Trend insights and the JSONL writer"""
+    print("\n=== Trend Insight / JSONL Test ===")
+
+    trend_results = TrendAnalyzer().analyze_trends(create_trend_test_data())
+    engine = InsightEngine()
+    trend_insights = engine.generate_trend_insights(trend_results)
+    assert trend_insights
+    assert {insight.insight_type for insight in trend_insights} <= set(InsightEngine.TREND_INSIGHTS.values())
+
+    classifier, test_df = _train_classifier()
+    session_insights = engine.generate_session_insights(test_df)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "insights.jsonl"
+        written = engine.write_jsonl(path, session_insights, trend_insights)
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+
+    assert written == len(records) == len(session_insights) + len(trend_insights)
+    assert records[-1]['session_id'] is None
+    assert records[0]['insight_type'] in {t.value for t in InsightType}
+    print(f"Wrote {written} insight records")
+
+def main():
+    test_vocabulary_indexes()
+    test_session_insights()
+    test_trend_insights_jsonl()
+    print("\nInsight engine tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import tempfile
+import types
+from pathlib import Path
+from insight_contract import InsightType, SeverityLevel, ConfidenceLevel, InsightDataStructure
+from insight_engine import InsightEngine
+from insight_io import InsightWriter, iter_insights
+from trend_analyzer import TrendAnalyzer
+from test_weakness_classifier import create_test_data
+from test_trend_analyzer import create_trend_test_data
+
+def test_compact_insights():
+    """Insights are slotted and share explanation strings"""
+    print("=== Compact Insight Test ===")
+
+    engine = InsightEngine()
+    insights = engine.generate_session_insights(create_test_data())
+    _, first = insights[0]
+
+    assert not hasattr(first, '__dict__')
+    assert not hasattr(first.contributing_factors[0], '__dict__')
+
+    same_text = [insight for _, insight in insights
+                 if (insight.insight_type, insight.severity, insight.confidence) ==
+                 (first.insight_type, first.severity, first.confidence)]
+    assert all(insight.explanation_text is first.explanation_text for insight in same_text)
+
+    explanation = InsightDataStructure.get_explanation(
+        InsightType.LATE_REACTIONS, SeverityLevel.HIGH, ConfidenceLevel.ESTABLISHED
+    )
+    assert explanation == InsightDataStructure._generate_explanation(
+        InsightType.LATE_REACTIONS, SeverityLevel.HIGH, ConfidenceLevel.ESTABLISHED,
+        {"name": "Late Reactions", "definition": explanation.split(". ", 1)[1]}
+    )
+    print(f"{len(insights)} insights share {len(InsightDataStructure._EXPLANATIONS)} explanation strings")
+
+def test_streaming_round_trip():
+    """A generator streams through the writer and reads back unchanged"""
+    print("\n=== Insight JSONL Streaming Test ===")
+
+    engine = InsightEngine()
+    sessions = create_test_data()
+    stream = engine.iter_session_insights(sessions)
+    assert isinstance(stream, types.GeneratorType)
+
+    trend_insights = engine.generate_trend_insights(TrendAnalyzer().analyze_trends(create_trend_test_data()))
+    expected = engine.generate_session_insights(sessions) + [(None, insight) for insight in trend_insights]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "insights.jsonl"
+        written = engine.write_jsonl(path, stream, trend_insights)
+
+        reader = iter_insights(path)
+        assert isinstance(reader, types.GeneratorType)
+        loaded = list(reader)
+
+        with InsightWriter(Path(tmp) / "copy.jsonl") as writer:
+            writer.write_all(iter_insights(path))
+        assert (Path(tmp) / "copy.jsonl").read_text() == path.read_text()
+
+    assert written == len(expected) == len(loaded)
+    assert loaded == expected
+    print(f"Round-tripped {written} insights")
+
+def main():
+    test_compact_insights()
+    test_streaming_round_trip()
+    print("\nInsight I/O tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+import pandas as pd
+import numpy as np
+from online_weakness_classifier import OnlineWeaknessClassifier
+from test_weakness_classifier import create_test_data
+
+def create_stream(batches: int = 4):
+    """Repeat the synthetic sessions as a stream of batches"""
+    frames = []
+    for b in range(batches):
+        batch = create_test_data()
+        batch['session_id'] = [f'batch{b}_{sid}' for sid in batch['session_id']]
+        frames.append(batch)
+    return frames
+
+def test_partial_fit_stream():
+    """Batches update models and running counts incrementally"""
+    print("=== Online Weakness Classifier Test ===")
+    
+    classifier = OnlineWeaknessClassifier(refit_every=3)
+    for batch in create_stream():
+        labels = classifier.define_weakness_labels(batch)
+        results = classifier.partial_fit(batch, labels)
+    
+    assert classifier.sessions_seen == 40
+    assert classifier.refit_due
+    assert results['poor_mixup_defense']['total_cases'] == 40
+    
+    predictions = classifier.predict_weaknesses(batch)
+    assert set(predictions) == set(labels.columns) - {'session_id'}
+    print(f"Streamed {classifier.sessions_seen} sessions into {len(classifier.models)} models")
+
+def test_full_refit_and_drift_report():
+    """Full refit resets the refit counter; drift report compares to a refit"""
+    stream = create_stream()
+    history = pd.concat(stream, ignore_index=True)
+    
+    classifier = OnlineWeaknessClassifier(refit_every=2)
+    for batch in stream:
+        classifier.partial_fit(batch, classifier.define_weakness_labels(batch))
+    
+    history_labels = classifier.define_weakness_labels(history)
+    report = classifier.drift_report(history, history_labels)
+    assert report['sessions_compared'] == len(history)
+    for weakness, drift in report['per_weakness'].items():
+        assert 0.0 <= drift['label_agreement'] <= 1.0
+        print(f"  {weakness}: cosine {drift['coefficient_cosine_similarity']:.3f}, "
+              f"mean |dp| {drift['mean_probability_difference']:.3f}")
+    
+    classifier.full_refit(history, history_labels)
+    assert not classifier.refit_due
+    assert all('decision_tree' in models for models in classifier.models.values())
+    assert classifier.explain_weakness_predictions(history, history_labels)
+
+def main():
+    test_partial_fit_stream()
+    test_full_refit_and_drift_report()
+    print("\nOnline weakness classifier tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import tempfile
+from pathlib import Path
+from pipeline import Stage, PipelineRunner
+
+CALLS = []
+
+def source_stage(size):
+    CALLS.append('source')
+    return {'numbers': list(range(size))}
+
+def square_stage(numbers):
+    CALLS.append('square')
+    return {'squares': [n * n for n in numbers]}
+
+def summary_stage(squares, threshold, artifact_dir):
+    CALLS.append('summary')
+    path = Path(artifact_dir) / "summary.txt"
+    path.write_text(str(sum(1 for s in squares if s > threshold)))
+    return {'summary_file': path}
+
+def build_runner(cache_dir):
+    return PipelineRunner([
+        Stage('source', source_stage, params=['size'], outputs=['numbers']),
+        Stage('square', square_stage, inputs=['numbers'], outputs=['squares']),
+        Stage('summary', summary_stage, inputs=['squares'], params=['threshold'], outputs=['summary_file'])
+    ], cache_dir=cache_dir)
+
+def test_rerun_reuses_unchanged_stages():
+    """Only stages downstream of a changed parameter run again"""
+    print("=== Pipeline Cache Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        CALLS.clear()
+        build_runner(tmp).run({'size': 5, 'threshold': 3})
+        assert CALLS == ['source', 'square', 'summary']
+
+        CALLS.clear()
+        runner = build_runner(tmp)
+        runner.run({'size': 5, 'threshold': 3})
+        assert CALLS == []
+        assert runner.reused_stages() == ['source', 'square', 'summary']
+        assert runner.artifact('squares') == [0, 1, 4, 9, 16]
+
+        CALLS.clear()
+        runner.run({'size': 5, 'threshold': 10})
+        assert CALLS == ['summary']
+        assert Path(runner.artifact('summary_file')).read_text() == '1'
+
+        CALLS.clear()
+        runner.run({'size': 6, 'threshold': 10})
+        assert CALLS == ['source', 'square', 'summary']
+
+        # Switching back hits the entries that are still cached (two per stage)
+        CALLS.clear()
+        runner.run({'size': 5, 'threshold': 10})
+        assert CALLS == []
+        assert len(list((Path(tmp) / 'summary').iterdir())) == 2
+
+    print("Reuse and invalidation OK")
+
+def test_failed_stage_is_not_cached():
+    """A stage that raises leaves no cache entry behind"""
+    print("\n=== Pipeline Failure Test ===")
+
+    def failing_stage(numbers):
+        raise RuntimeError("boom")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = PipelineRunner([
+            Stage('source', source_stage, params=['size'], outputs=['numbers']),
+            Stage('fail', failing_stage, inputs=['numbers'], outputs=['nothing'])
+        ], cache_dir=tmp)
+        try:
+            runner.run({'size': 3})
+            assert False, "stage error should propagate"
+        except RuntimeError:
+            pass
+        assert not any((Path(tmp) / 'fail').iterdir())
+
+    print("Failure handling OK")
+
+def main():
+    test_rerun_reuses_unchanged_stages()
+    test_failed_stage_is_not_cached()
+    print("\nPipeline tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import json
+import tempfile
+import pandas as pd
+from pathlib import Path
+from trend_analyzer import TrendAnalyzer
+from test_trend_analyzer import create_trend_test_data
+
+def create_player_sessions(n_players: int = 5):
+    """Same synthetic trend history for several players, plus one with a single session"""
+    frames = []
+    for p in range(n_players):
+        player_df = create_trend_test_data()
+        player_df['session_id'] = [f'player{p}_{sid}' for sid in player_df['session_id']]
+        player_df['player_id'] = f'player_{p}'
+        frames.append(player_df)
+    
+    lone = create_trend_test_data().head(1)
+    lone['player_id'] = 'player_lone'
+    frames.append(lone)
+    return pd.concat(frames, ignore_index=True)
+
+def test_one_record_per_player():
+    """Per-player mode matches single-player analysis and writes JSONL"""
+    print("=== Per-Player Trend Test ===")
+    
+    sessions = create_player_sessions()
+    analyzer = TrendAnalyzer()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = Path(tmp) / "player_trends.jsonl"
+        records = analyzer.analyze_player_trends(sessions, output_path=output_path, n_jobs=2, players_per_task=2)
+        written = [json.loads(line) for line in output_path.read_text().splitlines()]
+    
+    assert len(records) == len(written) == 6
+    by_player = {record['player_id']: record for record in written}
+    assert 'error' in by_player['player_lone']
+    
+    expected = analyzer.analyze_trends(create_trend_test_data())
+    assert by_player['player_0']['trend_classifications'] == expected['trend_classifications']
+    print(f"Analyzed {len(records)} players")
+
+def main():
+    test_one_record_per_player()
+    print("\nPer-player trend tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import pstats
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from pipeline import Stage, PipelineRunner
+from run_metrics import StageMetrics, count_rows, peak_rss_mb
+
+def frame_stage(size):
+    return {'frame': pd.DataFrame({'x': np.arange(size)})}
+
+def filter_stage(frame):
+    return {'kept': frame[frame['x'] % 2 == 0], 'label': 'even'}
+
+def test_stage_metrics_record():
+    """Timings, memory and row counts are recorded for a measured block"""
+    print("=== Stage Metrics Test ===")
+
+    assert count_rows(pd.DataFrame({'a': [1, 2, 3]})) == 3
+    assert count_rows(np.zeros((4, 2))) == 4
+    assert count_rows({'a': 1}) is None and count_rows(np.float64(1.0)) is None
+
+    with StageMetrics('busy') as measure:
+        sum(i * i for i in range(200_000))
+    measure.rows({'frame': np.zeros(10), 'threshold': 0.5}, {'kept': np.zeros(3)})
+
+    record = measure.record
+    assert record['status'] == 'ran'
+    assert record['wall_seconds'] > 0 and record['cpu_seconds'] > 0
+    assert (record['rows_in'], record['rows_out']) == ({'frame': 10}, {'kept': 3})
+    if peak_rss_mb() is not None:
+        assert record['peak_rss_mb'] > 0 and record['peak_rss_growth_mb'] >= 0
+    print(f"Measured {record['wall_seconds']:.4f}s wall, {record['cpu_seconds']:.4f}s CPU")
+
+def test_runner_metrics_and_profiles():
+    """PipelineRunner measures stages that run and profiles them on request"""
+    print("\n=== Pipeline Metrics Test ===")
+
+    stages = [
+        Stage('frame', frame_stage, params=['size'], outputs=['frame']),
+        Stage('filter', filter_stage, inputs=['frame'], outputs=['kept', 'label'])
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = PipelineRunner(stages, cache_dir=Path(tmp) / "cache")
+        runner.run({'size': 10})
+        assert [record['stage'] for record in runner.metrics] == ['frame', 'filter']
+        assert runner.metrics[1]['rows_in'] == {'frame': 10}
+        assert runner.metrics[1]['rows_out'] == {'kept': 5}
+
+        runner.run({'size': 10})
+        assert [record['status'] for record in runner.metrics] == ['reused', 'reused']
+
+        # Profiling re-runs cached stages so every stage gets a profile
+        profile_dir = Path(tmp) / "profiles"
+        profiled = PipelineRunner(stages, cache_dir=Path(tmp) / "cache", profile_dir=profile_dir)
+        profiled.run({'size': 10}, force=True)
+        assert [record['status'] for record in profiled.metrics] == ['ran', 'ran']
+        stats = pstats.Stats(str(profile_dir / "filter.prof"))
+        assert any(name == 'filter_stage' for (_, _, name) in stats.stats)
+
+    print("Runner metrics and profiles OK")
+
+def main():
+    test_stage_metrics_record()
+    test_runner_metrics_and_profiles()
+    print("\nRun metrics tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import tempfile
+import numpy as np
+from pathlib import Path
+from weakness_classifier import WeaknessClassifier
+from session_explanations import SessionExplanations
+from test_weakness_classifier import create_test_data
+
+def test_top_contributions_match_per_session_loop():
+    """Batched top-k equals the naive per-session ranking"""
+    print("=== Session Explanations Test ===")
+    
+    test_df = create_test_data()
+    classifier = WeaknessClassifier()
+    labels_df = classifier.define_weakness_labels(test_df)
+    classifier.train_weakness_models(test_df, labels_df)
+    
+    explanations = classifier.explain_sessions(test_df, top_k=3)
+    X_scaled = classifier._prepare_features(test_df)
+    
+    for w, weakness in enumerate(explanations.weakness_names):
+        coef = classifier.models[weakness]['logistic'].coef_[0]
+        for row in range(len(test_df)):
+            contrib = coef * X_scaled[row]
+            expected = np.argsort(-np.abs(contrib))[:3]
+            assert list(explanations.feature_index[row, w]) == list(expected)
+            assert np.allclose(explanations.contribution[row, w], contrib[expected], atol=1e-5)
+    
+    first = explanations.explain_session('test_session_0')
+    print(f"  test_session_0 {explanations.weakness_names[0]}: {first[explanations.weakness_names[0]][0]['feature']}")
+
+def test_round_trip():
+    """Columnar file reloads with the same lookups"""
+    test_df = create_test_data()
+    classifier = WeaknessClassifier()
+    labels_df = classifier.define_weakness_labels(test_df)
+    classifier.train_weakness_models(test_df, labels_df)
+    explanations = classifier.explain_sessions(test_df)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "weakness_session_explanations.npz"
+        explanations.save(path)
+        loaded = SessionExplanations.load(path)
+    
+    assert loaded.explain_session('test_session_5') == explanations.explain_session('test_session_5')
+
+def main():
+    test_top_contributions_match_per_session_loop()
+    test_round_trip()
+    print("\nSession explanation tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import numpy as np
+from smoothing import rolling_average, exponential_smoothing
+
+def legacy_rolling_average(values, window=2):
+    """List implementation the vectorized engine replaced"""
+    if len(values) < window:
+        return values
+    smoothed = []
+    for i in range(len(values)):
+        if i < window - 1:
+            smoothed.append(values[i])
+        else:
+            smoothed.append(sum(values[i-window+1:i+1]) / window)
+    return smoothed
+
+def legacy_exponential_smoothing(values, alpha=0.3):
+    """List implementation the vectorized engine replaced"""
+    if not values:
+        return []
+    smoothed = [values[0]]
+    for i in range(1, len(values)):
+        smoothed.append(alpha * values[i] + (1 - alpha) * smoothed[i-1])
+    return smoothed
+
+def test_matches_legacy_lists():
+    """2-D engine reproduces the per-metric list outputs"""
+    print("=== Smoothing Engine Test ===")
+    
+    rng = np.random.default_rng(7)
+    data = rng.uniform(0, 100, size=(200, 6))
+    
+    for window in (1, 2, 5):
+        rolling = rolling_average(data, window=window)
+        for col in range(data.shape[1]):
+            expected = legacy_rolling_average(data[:, col].tolist(), window=window)
+            assert np.allclose(rolling[:, col], expected, rtol=1e-12, atol=1e-9)
+    
+    for alpha in (0.1, 0.3, 0.9):
+        exponential = exponential_smoothing(data, alpha=alpha)
+        for col in range(data.shape[1]):
+            expected = legacy_exponential_smoothing(data[:, col].tolist(), alpha=alpha)
+            assert np.allclose(exponential[:, col], expected, rtol=1e-12, atol=1e-9)
+    
+    print("Rolling and exponential smoothing match legacy lists")
+
+def test_short_series():
+    """Series shorter than the window are returned unchanged"""
+    single = np.array([[3.0, 4.0]])
+    assert np.array_equal(rolling_average(single, window=2), single)
+    assert np.array_equal(exponential_smoothing(single), single)
+
+def main():
+    test_matches_legacy_lists()
+    test_short_series()
+    print("\nSmoothing tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+import contextlib
+import io
+import tempfile
+import pandas as pd
+from pathlib import Path
+from analyze import follow_telemetry
+from feature_extractor import FeatureExtractor
+from session_aggregator import SessionAggregator
+from telemetry_follower import TelemetryFollower
+from telemetry_loader import TelemetryLoader
+
+HEADER = "session_id,minigame_id,event_type,timestamp_ms,payload\n"
+
+def hit_confirm_lines(session_id: str, outcome: str) -> list:
+    return [
+        HEADER,
+        f'{session_id},hit_confirm_test,minigame_start,1000,{{}}\n',
+        f'{session_id},hit_confirm_test,hit_confirm_attempt,1500,"{{""outcome"": ""{outcome}"", ""timing_ms"": 200}}"\n',
+        f'{session_id},hit_confirm_test,minigame_end,2000,{{}}\n'
+    ]
+
+def append(path: Path, text: str):
+    with open(path, 'a', newline='') as f:
+        f.write(text)
+
+def test_partial_lines_wait_for_newline():
+    """A half-written event is not parsed until its line is complete"""
+    print("=== Telemetry Follow Partial Line Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        path = directory / "s1.csv"
+        lines = hit_confirm_lines("s1", "false_confirm")
+        follower = TelemetryFollower(directory)
+
+        append(path, lines[0] + lines[1])
+        assert follower.poll() == ['s1']
+        assert follower.session_features().empty  # no attempt yet
+
+        append(path, lines[2][:30])
+        assert follower.poll() == []
+        assert follower.event_count == 1
+
+        append(path, lines[2][30:])
+        assert follower.poll() == ['s1']
+        features = follower.session_features()
+        assert features['hit_confirm_test_false_confirm_rate'].tolist() == [1.0]
+        assert follower.poll() == []
+
+    print("Partial lines handled")
+
+def test_only_changed_sessions_refresh():
+    """New lines re-aggregate their own session; a rewritten file is re-read"""
+    print("\n=== Telemetry Follow Incremental Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for session_id, outcome in [("a", "correct_block"), ("b", "missed_confirm")]:
+            append(directory / f"{session_id}.csv", "".join(hit_confirm_lines(session_id, outcome)))
+
+        follower = TelemetryFollower(directory)
+        assert follower.poll() == ['a', 'b']
+        before_b = dict(follower.features['b'])
+
+        append(directory / "a.csv", 'a,anti_air_reaction_test,anti_air_attempt,2500,"{""outcome"": ""early""}"\n')
+        assert follower.poll() == ['a']
+        assert follower.features['a']['anti_air_reaction_test_early_rate'] == 1.0
+        assert follower.features['b'] == before_b
+        assert follower.session_features()['session_id'].tolist() == ['a', 'b']
+
+        (directory / "a.csv").write_text("".join(hit_confirm_lines("a", "correct_block")[:2]))
+        assert follower.poll() == ['a']
+        assert 'a' not in follower.features
+
+    print("Incremental refresh OK")
+
+def test_replaced_file_is_reread():
+    """A file swapped for another as large or larger is re-read, not treated as appended"""
+    print("\n=== Telemetry Follow Replacement Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        path = directory / "s.csv"
+        append(path, "".join(hit_confirm_lines("old", "correct_block")))
+        follower = TelemetryFollower(directory)
+        assert follower.poll() == ['old']
+
+        # Rewritten in place with a longer session under another id
+        path.write_text("".join(hit_confirm_lines("newer", "false_confirm")))
+        assert follower.poll() == ['newer']
+        assert list(follower.features) == ['newer']
+        assert follower.features['newer']['hit_confirm_test_false_confirm_rate'] == 1.0
+
+        # Written elsewhere and renamed over the followed file
+        staged = directory / "staged.tmp"
+        staged.write_text("".join(hit_confirm_lines("renamed", "missed_confirm")) +
+                          'renamed,anti_air_reaction_test,anti_air_attempt,2500,"{""outcome"": ""early""}"\n')
+        staged.replace(path)
+        assert follower.poll() == ['renamed']
+        assert list(follower.features) == ['renamed']
+        assert follower.attempts.keys() == follower.ended.keys() == {'renamed'}
+        assert list(follower.open_events) == [('renamed', 'anti_air_reaction_test')]  # no minigame_end yet
+
+    print("Replaced files re-read")
+
+def test_ended_minigames_drop_their_events():
+    """Only running minigames are re-extracted, and their events are dropped at minigame_end"""
+    print("\n=== Telemetry Follow Buffer Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        path = directory / "s.csv"
+        follower = TelemetryFollower(directory)
+        extracted = []
+        extract = follower.extractor.extract_attempt_features
+        follower.extractor.extract_attempt_features = lambda events: extracted.append(len(events)) or extract(events)
+
+        append(path, "".join(hit_confirm_lines("s", "false_confirm")))
+        assert follower.poll() == ['s']
+        assert not follower.open_events and follower.ended == {'s': {'hit_confirm_test'}}
+
+        # A second minigame is extracted from its own events only, and a malformed row is not counted
+        append(path, 's,anti_air_reaction_test,minigame_start,2500,{}\nnot,enough\n')
+        follower.poll()
+        append(path, 's,anti_air_reaction_test,anti_air_attempt,2600,"{""outcome"": ""early""}"\n')
+        follower.poll()
+        assert extracted == [3, 1, 2]
+        assert follower.event_count == 5
+        features = follower.features['s']
+        assert features['hit_confirm_test_false_confirm_rate'] == 1.0
+        assert features['anti_air_reaction_test_early_rate'] == 1.0
+
+        append(path, 's,anti_air_reaction_test,minigame_end,3000,{}\n')
+        follower.poll()
+        assert not follower.open_events
+        assert set(follower.attempts['s']) == {'hit_confirm_test', 'anti_air_reaction_test'}
+
+        # A replayed minigame in the same session is ignored
+        append(path, "".join(hit_confirm_lines("s", "correct_block")[1:]))
+        assert follower.poll() == []
+        assert pd.Series(follower.features['s']).equals(pd.Series(features))
+        assert follower.event_count == 6
+
+    print("Running minigames buffered, ended ones compacted")
+
+def test_follow_matches_batch_pipeline():
+    """Following a directory to the end gives the batch session features"""
+    print("\n=== Telemetry Follow Parity Test ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = Path(tmp) / "telemetry"
+        telemetry.mkdir()
+        outcomes = ["correct_block", "false_confirm", "missed_confirm"]
+        texts = {f"s{i}": "".join(hit_confirm_lines(f"s{i}", outcomes[i % 3])) for i in range(6)}
+
+        # Interleave appends across files in uneven chunks, polling in between
+        follower = TelemetryFollower(telemetry)
+        for start in range(0, max(len(text) for text in texts.values()), 37):
+            for session_id, text in texts.items():
+                append(telemetry / f"{session_id}.csv", text[start:start + 37])
+            follower.poll()
+
+        events = TelemetryLoader(telemetry).load_all_sessions()
+        batch = SessionAggregator().aggregate_session_features(FeatureExtractor().extract_attempt_features(events))
+        live = follower.session_features()[batch.columns]
+        pd.testing.assert_frame_equal(live.sort_values('session_id').reset_index(drop=True),
+                                      batch.sort_values('session_id').reset_index(drop=True), check_dtype=False)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            follow_telemetry(telemetry, interval=0, max_polls=1)
+        written = pd.read_csv(Path(tmp) / "processed" / "live_session_features.csv")
+        assert sorted(written['session_id']) == sorted(batch['session_id'])
+
+    print(f"Live features match batch for {len(batch)} sessions")
+
+def main():
+    test_partial_lines_wait_for_newline()
+    test_only_changed_sessions_refresh()
+    test_replaced_file_is_reread()
+    test_ended_minigames_drop_their_events()
+    test_follow_matches_batch_pipeline()
+    print("\nTelemetry follow tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import csv
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+
+import pandas as pd
+from telemetry_generator import generate_telemetry, format_event, MINIGAMES
+from telemetry_loader import TelemetryLoader
+from validator import TelemetryValidator
+from feature_extractor import FeatureExtractor
+
+ATTEMPT_EVENTS = {
+    'anti_air_reaction_test': {'anti_air_attempt'},
+    'hit_confirm_test': {'hit_confirm_attempt'},
+    'whiff_punish_test': {'whiff_punish_attempt'},
+    'defense_under_pressure_test': {'defense_attack_result', 'defense_string_complete'}
+}
+
+def test_logger_line_format():
+    print("Testing TelemetryLogger line format...")
+
+    line = format_event('s1', 'hit_confirm_test',
+                        ('hit_confirm_attempt', 1520, {'outcome': 'correct_block', 'timing_ms': None, 'was_hit_state': False}))
+    assert line == ('s1,hit_confirm_test,hit_confirm_attempt,1520,'
+                    '"{""outcome"":""correct_block"",""timing_ms"":null,""was_hit_state"":false}"\n')
+    row = next(csv.reader([line]))
+    assert json.loads(row[4]) == {'outcome': 'correct_block', 'timing_ms': None, 'was_hit_state': False}
+    print("✓ Compact JSON payload is quoted with doubled quotes")
+
+def test_generated_sessions_pass_pipeline():
+    print("\nTesting generated sessions through loader, validator and extractor...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = Path(tmp) / "telemetry"
+        summary = generate_telemetry(telemetry, 80, seed=3, player_map=Path(tmp) / "player_map.csv")
+        assert summary['sessions'] == 80
+        assert len(list(telemetry.glob("*.csv"))) == 80
+
+        loader = TelemetryLoader(telemetry)
+        events = loader.load_all_sessions()
+        assert len(events) == summary['events']
+        assert loader.session_index['start_time'].is_monotonic_increasing
+
+        result = TelemetryValidator().validate(events)
+        assert result.is_valid(), result.errors
+        assert not result.warnings, result.warnings
+
+        attempts = events[~events['event_type'].isin(['minigame_start', 'minigame_end'])]
+        for minigame_id, event_types in ATTEMPT_EVENTS.items():
+            assert set(attempts.loc[attempts['minigame_id'] == minigame_id, 'event_type']) == event_types
+
+        attempts_df = FeatureExtractor().extract_attempt_features(events)
+        assert len(attempts_df) == 80
+        assert set(attempts_df['minigame_id']) == set(MINIGAMES)
+
+        player_map = pd.read_csv(Path(tmp) / "player_map.csv")
+        assert set(player_map['session_id']) == set(events['session_id'])
+        assert player_map['player_id'].nunique() == summary['players']
+    print("✓ All four minigames load, validate and extract")
+
+def test_payloads_follow_controllers():
+    print("\nTesting payload fields against the controllers...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_telemetry(tmp, 200, seed=5)
+        events = TelemetryLoader(tmp).load_all_sessions()
+
+    payloads = events.assign(payload=events['payload'].map(json.loads))
+    fields = {
+        'anti_air_attempt': {'outcome', 'timing_ms'},
+        'hit_confirm_attempt': {'outcome', 'timing_ms', 'was_hit_state'},
+        'whiff_punish_attempt': {'outcome', 'input_time_ms', 'phase_at_input', 'window_offset_ms'},
+        'defense_attack_result': {'attack_type', 'expected_defense', 'player_defense_input', 'outcome',
+                                  'input_time_ms', 'attack_index_in_string'},
+        'defense_string_complete': {'total_hits', 'successful_defenses', 'string_success'}
+    }
+    for event_type, expected in fields.items():
+        rows = payloads.loc[payloads['event_type'] == event_type, 'payload']
+        assert len(rows) > 0, event_type
+        assert all(set(payload) == expected for payload in rows), event_type
+
+    anti_air = payloads.loc[payloads['event_type'] == 'anti_air_attempt', 'payload']
+    assert all((p['timing_ms'] is not None) == (p['outcome'] == 'success') for p in anti_air)
+    assert all(0 <= p['timing_ms'] < 300 for p in anti_air if p['outcome'] == 'success')
+
+    whiff = payloads.loc[payloads['event_type'] == 'whiff_punish_attempt', 'payload']
+    assert {p['outcome'] for p in whiff} <= {'correct_whiff_punish', 'early_whiff_punish', 'unsafe_whiff_punish',
+                                             'late_whiff_punish', 'missed_punish'}
+    assert all(p['phase_at_input'] == 'recovery' for p in whiff if p['outcome'] == 'correct_whiff_punish')
+
+    defense = payloads.loc[payloads['event_type'] == 'defense_attack_result', 'payload']
+    assert all((p['outcome'] == 'correct_evade') == (p['player_defense_input'] == 'crouch') for p in defense
+               if p['outcome'] != 'hit_taken')
+    print("✓ Payload fields and outcome rules match")
+
+def test_deterministic_for_seed():
+    print("\nTesting seeded output is reproducible...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second, other = Path(tmp) / "a", Path(tmp) / "b", Path(tmp) / "c"
+        generate_telemetry(first, 20, seed=7)
+        generate_telemetry(second, 20, seed=7)
+        generate_telemetry(other, 20, seed=8)
+
+        def contents(directory):
+            return {path.name: (path.read_text(), path.stat().st_mtime) for path in directory.glob("*.csv")}
+
+        assert contents(first) == contents(second)
+        assert contents(first).keys() != contents(other).keys()
+    print("✓ Same seed, same files and mtimes")
+
+def main():
+    print("=== Telemetry Generator Tests ===\n")
+
+    test_logger_line_format()
+    test_generated_sessions_pass_pipeline()
+    test_payloads_follow_controllers()
+    test_deterministic_for_seed()
+
+    print("\n=== All tests passed! ===")
+
+if __name__ == "__main__":
+    main()
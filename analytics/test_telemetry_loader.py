@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import os
+import tempfile
+import pandas as pd
+from pathlib import Path
+from telemetry_loader import TelemetryLoader
+from trend_analyzer import TrendAnalyzer
+from test_trend_analyzer import create_trend_test_data
+
+HEADER = "session_id,minigame_id,event_type,timestamp_ms,payload\n"
+
+def write_session(directory: Path, session_id: str, end_time: float, duration_ms: float):
+    """Telemetry file whose last event lands at end_time (epoch seconds)"""
+    path = directory / f"{session_id}.csv"
+    path.write_text(
+        HEADER +
+        f'{session_id},anti_air_reaction_test,minigame_start,1000,"{{}}"\n' +
+        f'{session_id},anti_air_reaction_test,minigame_end,{duration_ms},"{{}}"\n'
+    )
+    os.utime(path, (end_time, end_time))
+    return path
+
+def test_index_orders_by_wall_clock_start():
+    """Start time comes from file mtime minus elapsed session time"""
+    print("=== Session Index Test ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = Path(tmp) / "telemetry"
+        telemetry.mkdir()
+        # GUID-like ids whose lexical order disagrees with play order
+        write_session(telemetry, "f1", end_time=1_700_000_000, duration_ms=5000)
+        write_session(telemetry, "a2", end_time=1_700_003_600, duration_ms=5000)
+        write_session(telemetry, "c3", end_time=1_700_007_200, duration_ms=60000)
+        
+        index_path = Path(tmp) / "processed" / "session_index.csv"
+        loader = TelemetryLoader(telemetry, index_path=index_path)
+        loader.load_all_sessions()
+        
+        assert loader.session_index['session_id'].tolist() == ['f1', 'a2', 'c3']
+        assert loader.session_index.loc[0, 'start_time'] == 1_700_000_000 - 5.0
+        assert index_path.exists()
+        
+        # A fresh loader reuses the persisted rows for unchanged files
+        reloaded = TelemetryLoader(telemetry, index_path=index_path).load_session_index()
+        pd.testing.assert_frame_equal(reloaded, loader.session_index)
+        print(f"Indexed {len(reloaded)} sessions in start-time order")
+
+def test_trends_follow_session_index():
+    """TrendAnalyzer orders sessions by index start time, not session_id"""
+    sessions = create_trend_test_data()
+    reversed_index = pd.DataFrame({
+        'session_id': sessions['session_id'],
+        'start_time': list(range(len(sessions), 0, -1))
+    })
+    
+    analyzer = TrendAnalyzer()
+    ordered = analyzer._order_sessions(sessions, reversed_index)
+    assert ordered['session_id'].tolist() == sessions['session_id'].tolist()[::-1]
+    
+    by_id = analyzer.analyze_trends(sessions)
+    by_time = analyzer.analyze_trends(sessions, reversed_index)
+    success = 'anti_air_reaction_test_success_rate'
+    assert by_id['trend_classifications'][success] == 'improving'
+    assert by_time['trend_classifications'][success] == 'regressing'
+
+def main():
+    test_index_orders_by_wall_clock_start()
+    test_trends_follow_session_index()
+    print("\nSession index tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import numpy as np
+from weakness_classifier import WeaknessClassifier
+from test_weakness_classifier import create_test_data
+
+def test_fired_rules_match_tree_leaves():
+    """Batch rule evaluation lands every session in the same leaf as sklearn"""
+    print("=== Compiled Tree Rules Test ===")
+    
+    test_df = create_test_data()
+    classifier = WeaknessClassifier()
+    labels_df = classifier.define_weakness_labels(test_df)
+    classifier.train_weakness_models(test_df, labels_df)
+    
+    X_scaled = classifier._prepare_features(test_df)
+    for weakness, models in classifier.models.items():
+        rule_table = classifier._get_rule_table(weakness)
+        fired = rule_table.fired_rules(X_scaled)
+        leaves = models['decision_tree'].apply(X_scaled.astype(np.float32))
+        assert np.array_equal(rule_table.leaf_nodes[fired], leaves)
+        
+        # Compiled once, then reused
+        assert classifier._get_rule_table(weakness) is rule_table
+        print(f"  {weakness}: {len(rule_table.rule_texts)} rules")
+
+def test_session_rules_in_explanations():
+    """Explanations carry a rule index for every session"""
+    test_df = create_test_data()
+    classifier = WeaknessClassifier()
+    labels_df = classifier.define_weakness_labels(test_df)
+    classifier.train_weakness_models(test_df, labels_df)
+    
+    explanations = classifier.explain_weakness_predictions(test_df, labels_df)
+    for weakness, explanation in explanations.items():
+        assert set(explanation['session_rules']) == set(test_df['session_id'])
+        for rule_index in explanation['session_rules'].values():
+            assert explanation['rules'][rule_index]['rule'].startswith("IF ")
+
+def main():
+    test_fired_rules_match_tree_leaves()
+    test_session_rules_in_explanations()
+    print("\nCompiled tree rule tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import tempfile
+import numpy as np
+from pathlib import Path
+from trend_analyzer import TrendAnalyzer
+from trend_series import TrendSeries
+from test_trend_analyzer import create_trend_test_data
+
+def test_series_store_round_trip():
+    """Series saved as .npy reopen memory-mapped with the legacy values"""
+    print("=== Trend Series Store Test ===")
+    
+    sessions = create_trend_test_data()
+    analyzer = TrendAnalyzer()
+    legacy = analyzer.analyze_trends(sessions)
+    compact = analyzer.analyze_trends(sessions, include_series=False)
+    
+    assert 'smoothed_data' not in compact
+    assert compact['trend_classifications'] == legacy['trend_classifications']
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        compact['series'].save(Path(tmp) / "trend_series")
+        store = TrendSeries.open(Path(tmp) / "trend_series")
+        
+        assert isinstance(store.arrays['raw_values'], np.memmap)
+        assert store.arrays['raw_values'].shape == (len(sessions), len(store.metric_names))
+        # Each metric is one contiguous row of the file
+        assert np.load(Path(tmp) / "trend_series" / "raw_values.npy", mmap_mode='r').shape == \
+            (len(store.metric_names), len(sessions))
+        assert all(store.series(metric).flags['C_CONTIGUOUS'] for metric in store.metric_names)
+        assert store.session_ids == sessions['session_id'].tolist()
+        for metric, data in legacy['smoothed_data'].items():
+            for kind in TrendSeries.KINDS:
+                assert np.allclose(store.series(metric, kind), data[kind])
+        del store
+    
+    print(f"Stored {len(legacy['smoothed_data'])} metrics x {len(sessions)} sessions")
+
+def main():
+    test_series_store_round_trip()
+    print("\nTrend series tests passed")
+
+if __name__ == "__main__":
+    main()
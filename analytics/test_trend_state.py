@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import contextlib
+import io
+import json
+import tempfile
+import numpy as np
+from pathlib import Path
+from analyze import run_analysis
+from test_batch_analyze import write_tenant
+from trend_analyzer import TrendAnalyzer
+from trend_state import TrendState
+from test_trend_analyzer import create_trend_test_data
+
+def _assert_same_trends(state_result, batch_result):
+    assert state_result['trend_classifications'] == batch_result['trend_classifications']
+    for metric, summary in batch_result['trend_summaries']['per_metric'].items():
+        incremental = state_result['trend_summaries']['per_metric'][metric]
+        assert incremental['trend'] == summary['trend']
+        assert np.isclose(incremental['end_value'], summary['end_value'])
+    assert state_result['trend_summaries']['overall'] == batch_result['trend_summaries']['overall']
+
+def test_update_matches_full_recompute():
+    """Bootstrapping on history then updating per session equals a batch run"""
+    print("=== Incremental Trend State Test ===")
+    
+    sessions = create_trend_test_data()
+    state = TrendState.from_history(sessions.iloc[:2])
+    for session in sessions.iloc[2:].to_dict('records'):
+        state.update(session)
+    
+    _assert_same_trends(state.summarize(), TrendAnalyzer().analyze_trends(sessions))
+    print(f"State after {state.session_count} sessions matches batch trends")
+
+def test_state_from_empty_and_round_trip():
+    """Updating from nothing and reloading from disk keep the same trends"""
+    sessions = create_trend_test_data()
+    state = TrendState()
+    for session in sessions.to_dict('records'):
+        state.update(session)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trend_state.json"
+        state.save(path)
+        loaded = TrendState.load(path)
+    
+    _assert_same_trends(loaded.summarize(), TrendAnalyzer().analyze_trends(sessions))
+    assert loaded.rolling_average('anti_air_reaction_test_success_rate') == state.rolling_average('anti_air_reaction_test_success_rate')
+
+def test_statistical_method_is_persisted_and_rejected():
+    """A statistical analyzer survives save/load and is not summarized by thresholds"""
+    sessions = create_trend_test_data()
+    analyzer = TrendAnalyzer(classification_method='statistical', significance=0.01)
+    state = TrendState.from_history(sessions, analyzer=analyzer)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trend_state.json"
+        state.save(path)
+        loaded = TrendState.load(path)
+
+    assert loaded.analyzer.classification_method == 'statistical'
+    assert loaded.analyzer.significance == 0.01
+    summary = loaded.summarize()
+    assert 'statistical' in summary['error'] and 'trend_classifications' not in summary
+    print("Statistical state persisted and rejected by summarize")
+
+def test_recent_ids_window_is_bounded():
+    """Re-sent sessions inside the id window are skipped; the persisted window stays fixed-size"""
+    sessions = create_trend_test_data().to_dict('records')
+    state = TrendState(recent_id_limit=3)
+    for session in sessions:
+        assert state.update(session)
+    assert list(state.recent_ids) == [session['session_id'] for session in sessions[-3:]]
+
+    assert not state.update(sessions[-1])
+    assert state.session_count == len(sessions)
+    # Older than the window: counted again
+    assert state.update(sessions[0])
+    assert state.session_count == len(sessions) + 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trend_state.json"
+        state.save(path)
+        saved = json.loads(path.read_text())
+        loaded = TrendState.load(path)
+    assert len(saved['recent_ids']) == 3
+    assert not loaded.update(sessions[0])
+    assert loaded.update(sessions[1])
+    print("Recent session id window bounded at 3")
+
+def test_pipeline_state_uses_configured_threshold():
+    """trend_state.json keeps the --trend-threshold the run was given"""
+    with tempfile.TemporaryDirectory() as tmp:
+        telemetry = write_tenant(Path(tmp), "tenant", n_sessions=6)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_analysis(telemetry, trend_threshold=0.25)
+        saved = json.loads((telemetry.parent / "processed" / "trend_state.json").read_text())
+
+    assert saved['trend_thresholds']['improving'] == 0.25
+    assert saved['trend_thresholds']['regressing'] == -0.25
+    print("Pipeline trend state keeps the configured threshold")
+
+def main():
+    test_update_matches_full_recompute()
+    test_state_from_empty_and_round_trip()
+    test_statistical_method_is_persisted_and_rejected()
+    test_recent_ids_window_is_bounded()
+    test_pipeline_state_uses_configured_threshold()
+    print("\nTrend state tests passed")
+
+if __name__ == "__main__":
+    main()
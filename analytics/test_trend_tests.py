@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import tracemalloc
+import numpy as np
+import pandas as pd
+from scipy import stats
+from trend_tests import ols_trend, mann_kendall
+from trend_analyzer import TrendAnalyzer
+from test_player_trends import create_player_sessions
+
+def naive_mann_kendall_s(series):
+    s = 0
+    for i in range(len(series)):
+        for j in range(i + 1, len(series)):
+            s += np.sign(series[j] - series[i])
+    return s
+
+def test_batched_statistics_match_per_series():
+    """Batched OLS/Mann-Kendall equal per-series results, including NaN padding"""
+    print("=== Statistical Trend Test ===")
+    
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=(4, 12, 5)).cumsum(axis=1)
+    values[1, 9:, :] = np.nan  # shorter history for player 1
+    
+    ols = ols_trend(values)
+    mk = mann_kendall(values, chunk_size=3)
+    
+    for p in range(values.shape[0]):
+        for m in range(values.shape[2]):
+            series = values[p, :, m]
+            valid = ~np.isnan(series)
+            slope, _ = np.polyfit(np.arange(len(series))[valid], series[valid], 1)
+            assert np.isclose(ols['slope'][p, m], slope)
+            assert ols['ci_low'][p, m] <= slope <= ols['ci_high'][p, m]
+            assert mk['s'][p, m] == naive_mann_kendall_s(series[valid])
+    
+    print("Batched statistics match per-series computation")
+
+def test_mann_kendall_memory_is_bounded():
+    """S for a long single series without materialising every session pair"""
+    rng = np.random.default_rng(5)
+    n_sessions = 12000
+    values = rng.normal(size=(n_sessions, 2)).cumsum(axis=0)
+    values[::50, 1] = np.nan
+
+    # All pairs at once would need 72M pairs x 2 metrics x 8 bytes per temporary (> 1 GB)
+    tracemalloc.start()
+    mk = mann_kendall(values)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 16 * 2**20, f"peak {peak / 2**20:.0f} MB"
+
+    # Without ties, S is Kendall's tau against session order times the pair count
+    for m in range(values.shape[1]):
+        valid = ~np.isnan(values[:, m])
+        n = valid.sum()
+        tau = stats.kendalltau(np.arange(n), values[valid, m]).statistic
+        assert mk['s'][m] == round(tau * n * (n - 1) / 2)
+    print(f"Mann-Kendall over {n_sessions} sessions peaked at {peak / 2**20:.1f} MB")
+
+def test_player_statistics_table():
+    """One row per player x metric with significance-based labels"""
+    sessions = create_player_sessions(n_players=3)
+    table = TrendAnalyzer(classification_method='statistical').analyze_player_trend_statistics(sessions)
+    
+    metrics = table['metric'].nunique()
+    assert len(table) == 4 * metrics
+    lone = table[table['player_id'] == 'player_lone']
+    assert (lone['trend'] == 'insufficient_data').all()
+    
+    player = table[table['player_id'] == 'player_0'].set_index('metric')['trend']
+    assert player['anti_air_reaction_test_success_rate'] == 'improving'
+    assert player['hit_confirm_test_false_confirm_rate'] == 'regressing'
+
+def test_skewed_histories_are_not_padded_to_the_longest():
+    """One long history neither pads short players to its length nor changes their statistics"""
+    rng = np.random.default_rng(7)
+    lengths = {'veteran': 3000, **{f'casual_{p}': 3 + p % 5 for p in range(300)}}
+    sessions = pd.concat([
+        pd.DataFrame({
+            'player_id': player,
+            'session_id': [f'{player}_{i}' for i in range(n)],
+            'anti_air_reaction_test_success_rate': rng.uniform(0.2, 0.9, n).cumsum() / np.arange(1, n + 1),
+            'hit_confirm_test_false_confirm_rate': rng.uniform(0.0, 0.5, n)
+        })
+        for player, n in lengths.items()
+    ], ignore_index=True)
+    analyzer = TrendAnalyzer(classification_method='statistical')
+
+    tracemalloc.start()
+    table = analyzer.analyze_player_trend_statistics(sessions)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # Padding everyone to 3000 sessions would need 301 x 3000 x 2 x 8 bytes (> 14 MB) per array
+    assert peak < 8 * 2**20, f"peak {peak / 2**20:.1f} MB"
+    assert len(table) == 2 * len(lengths)
+    assert table.groupby('player_id')['n'].max().to_dict() == lengths
+
+    # Same rows when every group is split to one player
+    analyzer.MAX_PADDED_CELLS = 1
+    pd.testing.assert_frame_equal(analyzer.analyze_player_trend_statistics(sessions), table)
+    print(f"Skewed histories peaked at {peak / 2**20:.1f} MB")
+
+def main():
+    test_batched_statistics_match_per_series()
+    test_mann_kendall_memory_is_bounded()
+    test_player_statistics_table()
+    test_skewed_histories_are_not_padded_to_the_longest()
+    print("\nStatistical trend tests passed")
+
+if __name__ == "__main__":
+    main()
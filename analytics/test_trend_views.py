@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from trend_series import TrendSeries
+from trend_views import MultiResolutionTrends, SECONDS_PER_DAY
+
+def create_long_series(n_sessions=2500, sessions_per_day=5, seed=3):
+    """Long synthetic history: a few sessions a day starting on a Monday"""
+    rng = np.random.default_rng(seed)
+    raw = np.column_stack([
+        np.linspace(0.3, 0.8, n_sessions) + rng.normal(0, 0.05, n_sessions),
+        rng.normal(120, 15, n_sessions)
+    ])
+    series = TrendSeries(['aa_success_rate', 'aa_mean_timing_error'],
+                         [f'session_{i:05d}' for i in range(n_sessions)],
+                         {kind: raw for kind in TrendSeries.KINDS})
+    monday = 4 * SECONDS_PER_DAY
+    start_times = monday + (np.arange(n_sessions) // sessions_per_day) * SECONDS_PER_DAY + \
+        (np.arange(n_sessions) % sessions_per_day) * 3600.0
+    return series, start_times
+
+def test_bucket_aggregates():
+    """Every resolution matches a groupby over the same buckets"""
+    print("=== Trend Views Aggregate Test ===")
+
+    series, start_times = create_long_series()
+    views = MultiResolutionTrends.build(series, start_times)
+
+    assert views.resolutions() == ['session', 'day', '10_sessions', 'week', '100_sessions', '1000_sessions']
+
+    raw = pd.DataFrame(series.arrays['raw_values'], columns=series.metric_names)
+    days = (start_times // SECONDS_PER_DAY).astype(int)
+    for name, keys in [('100_sessions', np.arange(len(raw)) // 100), ('day', days), ('week', (days + 3) // 7)]:
+        expected = raw.groupby(keys)['aa_success_rate'].agg(['min', 'mean', 'max', 'count'])
+        level = views.levels[name]
+        assert np.array_equal(level['count'], expected['count'])
+        for stat in ('min', 'mean', 'max'):
+            assert np.allclose(level[stat][:, 0], expected[stat])
+
+    # 5 sessions a day, 7 days a week, starting on a Monday
+    assert set(views.levels['week']['count'][:-1]) == {35}
+    print(f"Built {len(views.levels)} resolutions over {len(raw)} sessions")
+
+def test_query_point_budget():
+    """Queries return the finest resolution that fits the budget"""
+    print("\n=== Trend Views Query Test ===")
+
+    series, start_times = create_long_series()
+    views = MultiResolutionTrends.build(series, start_times)
+
+    full = views.query('aa_success_rate', max_points=100)
+    assert full['resolution'] == 'week'
+    assert len(full['mean']) <= 100
+
+    one_week = views.query('aa_success_rate', start=start_times[0], end=start_times[0] + 6.5 * SECONDS_PER_DAY,
+                           max_points=50)
+    assert one_week['resolution'] == 'session'
+    assert len(one_week['mean']) == 35
+
+    recent = views.query('aa_mean_timing_error', start=start_times[-500], max_points=60)
+    assert recent['resolution'] == '10_sessions'
+    assert recent['bucket_end'][-1] == start_times[-1]
+
+    # Without start times only the session-count resolutions exist
+    untimed = MultiResolutionTrends.build(series)
+    assert 'day' not in untimed.levels and untimed.time_axis == 'session_position'
+
+    print(f"Full history: {len(full['mean'])} points at {full['resolution']} resolution")
+
+def test_round_trip():
+    """Saved views load back with identical buckets"""
+    print("\n=== Trend Views Store Test ===")
+
+    series, start_times = create_long_series(n_sessions=300)
+    views = MultiResolutionTrends.build(series, start_times)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        views.save(Path(tmp) / "trend_views")
+        loaded = MultiResolutionTrends.load(Path(tmp) / "trend_views")
+
+    assert loaded.resolutions() == views.resolutions()
+    assert loaded.query('aa_success_rate', max_points=20) == views.query('aa_success_rate', max_points=20)
+    print("Round trip OK")
+
+def main():
+    test_bucket_aggregates()
+    test_query_point_budget()
+    test_round_trip()
+    print("\nTrend views tests passed")
+
+if __name__ == "__main__":
+    main()
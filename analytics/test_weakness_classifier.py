@@ -37,8 +37,26 @@ def create_test_data():
     
     return pd.DataFrame(sessions)
 
+def test_parallel_training_matches_sequential():
+    """Models trained on the worker pool equal those trained in-process"""
+    test_df = create_test_data()
+    fitted = {}
+    for n_jobs in [1, 2, -1]:
+        classifier = WeaknessClassifier(n_jobs=n_jobs)
+        classifier.train_weakness_models(test_df, classifier.define_weakness_labels(test_df))
+        engine = classifier.export_inference_engine()
+        fitted[n_jobs] = (engine.weakness_names, engine.coef, engine.predict_proba(engine.to_matrix(test_df)))
+
+    for n_jobs in [2, -1]:
+        assert fitted[n_jobs][0] == fitted[1][0]
+        assert np.array_equal(fitted[n_jobs][1], fitted[1][1])
+        assert np.array_equal(fitted[n_jobs][2], fitted[1][2])
+    print(f"n_jobs=1, 2 and -1 give identical models for {len(fitted[1][0])} weaknesses")
+
 def main():
-    print("=== Weakness Classification Test ===")
+    test_parallel_training_matches_sequential()
+
+    print("\n=== Weakness Classification Test ===")
     
     # Create test data
     test_df = create_test_data()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import tempfile
+from pathlib import Path
+from weakness_classifier import WeaknessClassifier
+from weakness_evaluation import WeaknessEvaluator
+from test_online_weakness_classifier import create_stream
+import pandas as pd
+
+def test_cross_validation_report():
+    """Report carries per-fold metrics and calibration for both model types"""
+    print("=== Weakness Evaluation Test ===")
+    
+    sessions = pd.concat(create_stream(), ignore_index=True)
+    labels = WeaknessClassifier().define_weakness_labels(sessions)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        evaluator = WeaknessEvaluator(n_splits=3, cache_dir=tmp)
+        report = evaluator.evaluate(sessions, labels)
+        cached_files = list(Path(tmp).glob("folds_*.npy"))
+        
+        # Second run reuses the cached splits and gives identical scores
+        again = WeaknessEvaluator(n_splits=3, cache_dir=tmp).evaluate(sessions, labels)
+    
+    assert cached_files
+    assert report == again
+    
+    for weakness, result in report['per_weakness'].items():
+        if 'error' in result:
+            print(f"  {weakness}: {result['error']}")
+            continue
+        for model_type, scores in result['models'].items():
+            assert 0.0 <= scores['auc']['mean'] <= 1.0
+            assert 'brier_score' in scores['calibration']
+        print(f"  {weakness}: logistic AUC {result['models']['logistic']['auc']['mean']:.3f}")
+
+def main():
+    test_cross_validation_report()
+    print("\nWeakness evaluation tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+import tempfile
+import numpy as np
+from pathlib import Path
+from weakness_classifier import WeaknessClassifier
+from weakness_inference import WeaknessInferenceEngine
+from test_weakness_classifier import create_test_data
+
+def _train_classifier():
+    test_df = create_test_data()
+    classifier = WeaknessClassifier()
+    labels_df = classifier.define_weakness_labels(test_df)
+    classifier.train_weakness_models(test_df, labels_df)
+    return classifier, test_df
+
+def test_engine_matches_logistic_models():
+    """Folded engine must reproduce sklearn predict_proba"""
+    print("=== Inference Engine Parity Test ===")
+    
+    classifier, test_df = _train_classifier()
+    engine = classifier.export_inference_engine()
+    
+    expected = classifier.predict_weaknesses(test_df)
+    actual = engine.predict_weaknesses(test_df)
+    
+    assert set(actual) == set(expected)
+    for weakness, session_probs in expected.items():
+        for session_id, prob in session_probs.items():
+            assert abs(actual[weakness][session_id] - prob) < 1e-9
+    
+    print(f"Engine matches sklearn for {len(expected)} weaknesses")
+
+def test_engine_fills_missing_with_training_medians():
+    """NaN features are replaced with training medians"""
+    classifier, test_df = _train_classifier()
+    engine = classifier.export_inference_engine()
+    
+    X = engine.to_matrix(test_df)
+    X_missing = X.copy()
+    X_missing[:, 0] = np.nan
+    X_filled = X.copy()
+    X_filled[:, 0] = classifier.feature_medians.iloc[0]
+    
+    assert np.allclose(engine.predict_proba(X_missing), engine.predict_proba(X_filled))
+
+def test_engine_round_trip():
+    """Saved engine reloads with identical predictions"""
+    classifier, test_df = _train_classifier()
+    engine = classifier.export_inference_engine()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "weakness_inference.npz"
+        engine.save(path)
+        loaded = WeaknessInferenceEngine.load(path)
+    
+    X = engine.to_matrix(test_df)
+    assert loaded.weakness_names == engine.weakness_names
+    assert np.array_equal(loaded.predict_proba(X), engine.predict_proba(X))
+
+def main():
+    test_engine_matches_logistic_models()
+    test_engine_fills_missing_with_training_medians()
+    test_engine_round_trip()
+    print("\nInference engine tests passed")
+
+if __name__ == "__main__":
+    main()
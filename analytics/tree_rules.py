@@ -0,0 +1,83 @@
+import numpy as np
+from typing import List
+
+class CompiledTreeRules:
+    """Decision tree flattened into a vectorized rule table.
+
+    Each root-to-leaf path becomes one rule row of (feature index,
+    threshold, direction) conditions, padded to the tree depth. Rules are
+    stored in the same left-first order as a recursive walk, so the
+    positive rule texts match the legacy extraction exactly.
+    """
+
+    LE = -1   # feature <= threshold
+    GT = 1    # feature > threshold
+    PAD = 0   # unused condition slot
+
+    def __init__(self, tree_model, feature_names: List[str]):
+        self.tree_model = tree_model
+        self.feature_names = list(feature_names)
+
+        tree = tree_model.tree_
+        paths = []
+        leaves = []
+
+        # Iterative DFS, pushing the right child first so left paths come out first
+        stack = [(0, [])]
+        while stack:
+            node, conditions = stack.pop()
+            left, right = tree.children_left[node], tree.children_right[node]
+            if left != right:
+                feature = int(tree.feature[node])
+                threshold = float(tree.threshold[node])
+                stack.append((right, conditions + [(feature, threshold, self.GT)]))
+                stack.append((left, conditions + [(feature, threshold, self.LE)]))
+            else:
+                paths.append(conditions)
+                leaves.append(node)
+
+        n_rules = len(paths)
+        depth = max(1, max(len(p) for p in paths))
+
+        self.features = np.zeros((n_rules, depth), dtype=np.intp)
+        self.thresholds = np.zeros((n_rules, depth), dtype=np.float64)
+        self.directions = np.full((n_rules, depth), self.PAD, dtype=np.int8)
+        for i, conditions in enumerate(paths):
+            for j, (feature, threshold, direction) in enumerate(conditions):
+                self.features[i, j] = feature
+                self.thresholds[i, j] = threshold
+                self.directions[i, j] = direction
+
+        self.leaf_nodes = np.array(leaves, dtype=np.intp)
+        values = tree.value[self.leaf_nodes, 0, :]
+        totals = values.sum(axis=1, keepdims=True)
+        self.leaf_probabilities = np.divide(values, totals, out=np.zeros_like(values), where=totals > 0)
+        self.is_positive = (values.shape[1] > 1) & (values[:, -1] > values[:, 0])
+        self.rule_texts = [self._format(conditions) for conditions in paths]
+
+    def _format(self, conditions) -> str:
+        parts = []
+        for feature, threshold, direction in conditions:
+            op = '<=' if direction == self.LE else '>'
+            parts.append(f"{self.feature_names[feature]} {op} {threshold:.3f}")
+        return " AND ".join(parts)
+
+    def positive_rules(self, limit: int = 3) -> List[str]:
+        """Text rules for leaves predicting the weakness"""
+        return [f"IF {self.rule_texts[i]} THEN weakness likely" for i in np.flatnonzero(self.is_positive)[:limit]]
+
+    def fired_rules(self, X: np.ndarray) -> np.ndarray:
+        """Index of the rule each row satisfies, evaluated for the whole batch at once"""
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        # (n_sessions, n_rules, depth) gather of the tested feature values
+        values = X[:, self.features].astype(np.float64)
+        satisfied = np.where(
+            self.directions == self.LE, values <= self.thresholds,
+            np.where(self.directions == self.GT, values > self.thresholds, True)
+        )
+        return satisfied.all(axis=2).argmax(axis=1)
+
+    def describe(self, rule_index: int) -> str:
+        outcome = 'weakness likely' if self.is_positive[rule_index] else 'weakness unlikely'
+        return f"IF {self.rule_texts[rule_index]} THEN {outcome}"
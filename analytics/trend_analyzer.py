@@ -2,121 +2,266 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 from datetime import datetime
+from smoothing import rolling_average, exponential_smoothing
+from trend_tests import ols_trend, mann_kendall, classify_significant_trends
+from trend_series import TrendSeries
+from trend_views import MultiResolutionTrends
+from feature_schema import FEATURE_SCHEMA
+from joblib import Parallel, delayed
+from pathlib import Path
 import json
 
 class TrendAnalyzer:
-    def __init__(self):
+    CLASSIFICATION_METHODS = ('threshold', 'statistical')
+    # Trend metric groups in output order: feature categories and missing-value fill rule
+    TREND_METRIC_GROUPS = [
+        (['success_rate'], 'zero'),
+        (['timing_consistency'], 'median'),
+        (['early_rate', 'late_rate', 'false_confirm_rate'], 'zero')
+    ]
+    METRIC_TYPES = {
+        'success_rate': 'Success rate',
+        'timing_consistency': 'Timing consistency',
+        'early_rate': 'Early input tendency',
+        'late_rate': 'Late input tendency',
+        'false_confirm_rate': 'False confirm rate'
+    }
+    
+    # Largest (players, sessions, metrics) array packed for batched player statistics
+    MAX_PADDED_CELLS = 2**22
+    
+    def __init__(self, classification_method: str = 'threshold', significance: float = 0.05):
+        if classification_method not in self.CLASSIFICATION_METHODS:
+            raise ValueError(f"Unknown classification method: {classification_method}")
+        
         self.trend_thresholds = {
             'improving': 0.1,    # 10% improvement threshold
             'regressing': -0.1,  # 10% regression threshold
             'flat': 0.05         # Within 5% considered flat
         }
+        # 'statistical' classifies by OLS slope CI + Mann-Kendall significance
+        self.classification_method = classification_method
+        self.significance = significance
+        
+    def analyze_trends(self, sessions_df: pd.DataFrame, session_index: pd.DataFrame = None,
+                       include_series: bool = True) -> Dict:
+        """Analyze improvement trends across all sessions
         
-    def analyze_trends(self, sessions_df: pd.DataFrame) -> Dict:
-        """Analyze improvement trends across all sessions"""
+        With include_series=False the smoothed series are returned as a
+        TrendSeries under 'series' instead of as nested lists under
+        'smoothed_data'.
+        """
         if len(sessions_df) < 2:
             return {'error': 'Need at least 2 sessions for trend analysis'}
             
-        # Order sessions by timestamp (using session_id as proxy for now)
-        ordered_sessions = self._order_sessions(sessions_df)
+        # Order sessions by wall-clock start time from the telemetry session index
+        ordered_sessions = self._order_sessions(sessions_df, session_index)
         
         # Extract key metrics for trend analysis
         trend_metrics = self._select_trend_metrics(ordered_sessions)
         
         # Apply smoothing techniques
-        smoothed_metrics = self._apply_smoothing(trend_metrics)
+        series = self._smooth_series(trend_metrics, ordered_sessions['session_id'].tolist())
+        smoothed_metrics = series.smoothed_views() if series else {}
         
         # Classify trends
-        trend_classifications = self._classify_trends(smoothed_metrics)
+        trend_statistics = None
+        if self.classification_method == 'statistical':
+            trend_classifications, trend_statistics = self._classify_trends_statistically(trend_metrics)
+        else:
+            trend_classifications = self._classify_trends(smoothed_metrics)
         
         # Generate trend summaries
         trend_summaries = self._generate_trend_summaries(trend_classifications, smoothed_metrics)
         
-        return {
+        results = {
             'session_count': len(ordered_sessions),
             'metrics_analyzed': list(trend_metrics.keys()),
             'trend_classifications': trend_classifications,
-            'trend_summaries': trend_summaries,
-            'smoothed_data': smoothed_metrics
+            'trend_summaries': trend_summaries
         }
+        if include_series:
+            results['smoothed_data'] = series.to_lists() if series else {}
+        else:
+            results['series'] = series
+        if trend_statistics is not None:
+            results['trend_statistics'] = trend_statistics
+        return results
+
+    def build_trend_views(self, series: TrendSeries, session_index: pd.DataFrame = None) -> MultiResolutionTrends:
+        """Per-session, per-N-session, per-day and per-week min/mean/max views of a series.
+
+        Day and week buckets need every session's start time from the index;
+        otherwise only the session-count resolutions are built.
+        """
+        start_times = None
+        if session_index is not None and 'start_time' in session_index.columns:
+            index = session_index.drop_duplicates('session_id').set_index('session_id')['start_time']
+            start_times = pd.Series(series.session_ids).map(index).to_numpy(dtype=np.float64)
+        return MultiResolutionTrends.build(series, start_times)
+
+    def analyze_player_trend_statistics(self, sessions_df: pd.DataFrame, player_key: str = 'player_id',
+                                        session_index: pd.DataFrame = None) -> pd.DataFrame:
+        """Significance-based trends for every player x metric in batched array operations.
+        
+        Players are grouped by history length (powers of two) and each
+        group is packed into a (players, sessions, metrics) array padded
+        with NaN, so the OLS and Mann-Kendall tests run over whole groups
+        at once while padding stays under 2x a player's own length. Groups
+        are split so no packed array exceeds MAX_PADDED_CELLS values.
+        Returns one row per (player, metric).
+        """
+        if player_key not in sessions_df.columns:
+            raise ValueError(f"Player key column '{player_key}' not found in sessions")
+        
+        ordered = self._order_sessions(sessions_df, session_index)
+        metric_names = list(self._trend_metric_columns(ordered.columns))
+        
+        player_codes, player_ids = pd.factorize(ordered[player_key])
+        positions = ordered.groupby(player_codes).cumcount().to_numpy()
+        data = ordered[metric_names].to_numpy(dtype=np.float64)
+        lengths = np.bincount(player_codes, minlength=len(player_ids))
+        lower_is_better = FEATURE_SCHEMA.lower_is_better(metric_names)
+        
+        results = {}
+        local = np.full(len(player_ids), -1)
+        for group in _length_groups(lengths, len(metric_names), self.MAX_PADDED_CELLS):
+            local[group] = np.arange(len(group))
+            rows = local[player_codes] >= 0
+            values = np.full((len(group), lengths[group].max(), len(metric_names)), np.nan)
+            values[local[player_codes[rows]], positions[rows]] = data[rows]
+            local[group] = -1
+            
+            ols = ols_trend(values, confidence=1 - self.significance)
+            mk = mann_kendall(values)
+            group_results = {
+                'n': ols['n'], 'slope': ols['slope'], 'ci_low': ols['ci_low'], 'ci_high': ols['ci_high'],
+                'mk_s': mk['s'], 'mk_z': mk['z'], 'p_value': mk['p_value'],
+                'trend': classify_significant_trends(ols, mk, lower_is_better, self.significance)
+            }
+            for name, result in group_results.items():
+                if name not in results:
+                    results[name] = np.empty((len(player_ids), len(metric_names)), dtype=result.dtype)
+                results[name][group] = result
+        
+        return pd.DataFrame({
+            player_key: np.repeat(np.asarray(player_ids), len(metric_names)),
+            'metric': np.tile(metric_names, len(player_ids)),
+            **{name: result.ravel() for name, result in results.items()}
+        })
+    
+    def analyze_player_trends(self, sessions_df: pd.DataFrame, player_key: str = 'player_id',
+                              output_path=None, n_jobs: int = -1, players_per_task: int = 200,
+                              session_index: pd.DataFrame = None) -> List[Dict]:
+        """Analyze each player's session history as its own time series.
+        
+        Players are batched into tasks and spread over a process pool. Each
+        finished batch is appended to output_path (JSON Lines, one record
+        per player) as soon as it completes.
+        """
+        if player_key not in sessions_df.columns:
+            raise ValueError(f"Player key column '{player_key}' not found in sessions")
+        
+        player_frames = [
+            (player_id, player_df.drop(columns=player_key))
+            for player_id, player_df in sessions_df.groupby(player_key, sort=False)
+        ]
+        batches = [
+            player_frames[i:i + players_per_task]
+            for i in range(0, len(player_frames), players_per_task)
+        ]
+        
+        if session_index is not None:
+            session_index = session_index[['session_id', 'start_time']]
+        
+        results = Parallel(n_jobs=n_jobs, return_as='generator')(
+            delayed(_analyze_player_batch)(self, batch, self._batch_index(session_index, batch))
+            for batch in batches
+        )
+        
+        records = []
+        output_file = open(Path(output_path), 'w') if output_path else None
+        try:
+            for batch_records in results:
+                records.extend(batch_records)
+                if output_file:
+                    for record in batch_records:
+                        output_file.write(json.dumps(record) + "\n")
+        finally:
+            if output_file:
+                output_file.close()
+        
+        return records
+    
+    def _batch_index(self, session_index: pd.DataFrame, batch: List[Tuple]) -> pd.DataFrame:
+        """Only ship the index rows a worker batch needs"""
+        if session_index is None:
+            return None
+        batch_sessions = pd.concat([player_df['session_id'] for _, player_df in batch])
+        return session_index[session_index['session_id'].isin(batch_sessions)]
+    
+    def _order_sessions(self, df: pd.DataFrame, session_index: pd.DataFrame = None) -> pd.DataFrame:
+        """Order sessions chronologically by their start time in the session index.
+        
+        Session IDs are random GUIDs, so without an index (or for sessions
+        missing from it) ordering falls back to session_id, after all indexed
+        sessions.
+        """
+        if session_index is None or 'start_time' not in session_index.columns:
+            return df.sort_values('session_id').reset_index(drop=True)
+        
+        start_times = df['session_id'].map(session_index.drop_duplicates('session_id').set_index('session_id')['start_time'])
+        order = np.lexsort((df['session_id'].astype(str).to_numpy(), start_times.fillna(np.inf).to_numpy()))
+        return df.iloc[order].reset_index(drop=True)
     
-    def _order_sessions(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Order sessions chronologically (using session_id as timestamp proxy)"""
-        # For now, assume session_id contains timestamp info or use row order
-        # In real implementation, would parse actual timestamps
-        return df.sort_values('session_id').reset_index(drop=True)
+    def _trend_metric_columns(self, column_names) -> Dict[str, str]:
+        """Candidate trend columns in category order, mapped to their missing-value fill rule"""
+        column_names = list(column_names)
+        columns = {}
+        for categories, fill_rule in self.TREND_METRIC_GROUPS:
+            for col in FEATURE_SCHEMA.columns_in(column_names, categories):
+                columns[col] = fill_rule
+        return columns
     
-    def _select_trend_metrics(self, df: pd.DataFrame) -> Dict[str, List[float]]:
+    def _select_trend_metrics(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
         """Select key metrics for trend analysis"""
         metrics = {}
         
-        # Success rates (performance metrics)
-        success_cols = [col for col in df.columns if 'success_rate' in col or 'correct_rate' in col]
-        for col in success_cols:
-            if col in df.columns:
-                values = df[col].fillna(0).tolist()
-                if any(v > 0 for v in values):  # Only include if has data
-                    metrics[col] = values
-        
-        # Consistency metrics (lower is better)
-        consistency_cols = [col for col in df.columns if 'std' in col and 'timing' in col]
-        for col in consistency_cols:
-            if col in df.columns:
-                values = df[col].fillna(df[col].median()).tolist()
-                if any(v > 0 for v in values):
-                    metrics[col] = values
-        
-        # Error rates (lower is better)
-        error_cols = [col for col in df.columns if any(x in col for x in ['early_rate', 'late_rate', 'false_confirm_rate'])]
-        for col in error_cols:
-            if col in df.columns:
-                values = df[col].fillna(0).tolist()
-                if any(v > 0 for v in values):
-                    metrics[col] = values
+        for col, fill_rule in self._trend_metric_columns(df.columns).items():
+            fill_value = df[col].median() if fill_rule == 'median' else 0
+            values = df[col].fillna(fill_value).to_numpy(dtype=np.float64)
+            if (values > 0).any():  # Only include if has data
+                metrics[col] = values
         
         return metrics
     
-    def _apply_smoothing(self, metrics: Dict[str, List[float]]) -> Dict[str, Dict]:
-        """Apply smoothing techniques to metrics"""
-        smoothed = {}
+    def _smooth_series(self, metrics: Dict[str, np.ndarray], session_ids: List[str]) -> TrendSeries:
+        """Apply smoothing techniques to all metrics at once"""
+        metric_names = list(metrics.keys())
+        if not metric_names or len(metrics[metric_names[0]]) < 2:
+            return None
         
-        for metric_name, values in metrics.items():
-            if len(values) < 2:
-                continue
-                
-            smoothed[metric_name] = {
-                'raw_values': values,
-                'rolling_average': self._rolling_average(values, window=2),
-                'exponential_smoothing': self._exponential_smoothing(values, alpha=0.3),
-                'simple_delta': values[-1] - values[0] if len(values) >= 2 else 0
-            }
-        
-        return smoothed
+        # (sessions, metrics) matrix smoothed column-wise in one pass per technique
+        raw = np.column_stack([metrics[name] for name in metric_names])
+        return TrendSeries(metric_names, session_ids, {
+            'raw_values': raw,
+            'rolling_average': rolling_average(raw, window=2),
+            'exponential_smoothing': exponential_smoothing(raw, alpha=0.3)
+        })
+    
+    def _apply_smoothing(self, metrics: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+        """Apply smoothing techniques to metrics (legacy list layout)"""
+        length = len(next(iter(metrics.values()))) if metrics else 0
+        series = self._smooth_series(metrics, list(range(length)))
+        return series.to_lists() if series else {}
     
     def _rolling_average(self, values: List[float], window: int = 2) -> List[float]:
         """Calculate rolling average"""
-        if len(values) < window:
-            return values
-            
-        smoothed = []
-        for i in range(len(values)):
-            if i < window - 1:
-                smoothed.append(values[i])
-            else:
-                avg = sum(values[i-window+1:i+1]) / window
-                smoothed.append(avg)
-        return smoothed
+        return rolling_average(np.asarray(values, dtype=np.float64), window=window).tolist()
     
     def _exponential_smoothing(self, values: List[float], alpha: float = 0.3) -> List[float]:
         """Apply exponential smoothing"""
-        if not values:
-            return []
-            
-        smoothed = [values[0]]
-        for i in range(1, len(values)):
-            smoothed_val = alpha * values[i] + (1 - alpha) * smoothed[i-1]
-            smoothed.append(smoothed_val)
-        return smoothed
+        return exponential_smoothing(np.asarray(values, dtype=np.float64), alpha=alpha).tolist()
     
     def _classify_trends(self, smoothed_metrics: Dict[str, Dict]) -> Dict[str, str]:
         """Classify trends as improving, flat, or regressing"""
@@ -129,37 +274,65 @@ class TrendAnalyzer:
                 
             # Use exponential smoothing for trend classification
             smoothed_values = data['exponential_smoothing']
-            start_val = smoothed_values[0]
-            end_val = smoothed_values[-1]
-            
-            # Calculate relative change
-            if start_val == 0:
-                relative_change = 1.0 if end_val > 0 else 0.0
-            else:
-                relative_change = (end_val - start_val) / abs(start_val)
-            
-            # Classify based on metric type and change direction
-            is_lower_better = any(x in metric_name for x in ['std', 'error', 'early_rate', 'late_rate', 'false_confirm'])
-            
-            if is_lower_better:
-                # For metrics where lower is better (errors, variance)
-                if relative_change <= -self.trend_thresholds['improving']:
-                    classifications[metric_name] = 'improving'
-                elif relative_change >= self.trend_thresholds['improving']:
-                    classifications[metric_name] = 'regressing'
-                else:
-                    classifications[metric_name] = 'flat'
-            else:
-                # For metrics where higher is better (success rates)
-                if relative_change >= self.trend_thresholds['improving']:
-                    classifications[metric_name] = 'improving'
-                elif relative_change <= self.trend_thresholds['regressing']:
-                    classifications[metric_name] = 'regressing'
-                else:
-                    classifications[metric_name] = 'flat'
+            classifications[metric_name] = self._classify_change(metric_name, smoothed_values[0], smoothed_values[-1])
         
         return classifications
     
+    def _classify_trends_statistically(self, metrics: Dict[str, np.ndarray]) -> Tuple[Dict[str, str], Dict[str, Dict]]:
+        """Classify all metrics at once from OLS slope CIs and Mann-Kendall tests"""
+        metric_names = list(metrics.keys())
+        if not metric_names:
+            return {}, {}
+        
+        values = np.column_stack([metrics[name] for name in metric_names])
+        ols = ols_trend(values, confidence=1 - self.significance)
+        mk = mann_kendall(values)
+        lower_is_better = FEATURE_SCHEMA.lower_is_better(metric_names)
+        labels = classify_significant_trends(ols, mk, lower_is_better, self.significance)
+        
+        classifications = dict(zip(metric_names, labels.tolist()))
+        statistics = {
+            name: {
+                'slope': self._json_float(ols['slope'][i]),
+                'slope_ci': [self._json_float(ols['ci_low'][i]), self._json_float(ols['ci_high'][i])],
+                'mann_kendall_s': float(mk['s'][i]),
+                'mann_kendall_z': self._json_float(mk['z'][i]),
+                'p_value': self._json_float(mk['p_value'][i])
+            }
+            for i, name in enumerate(metric_names)
+        }
+        return classifications, statistics
+    
+    def _json_float(self, value: float):
+        return None if np.isnan(value) else float(value)
+    
+    def _is_lower_better(self, metric_name: str) -> bool:
+        return bool(FEATURE_SCHEMA.lower_is_better([metric_name])[0])
+    
+    def _classify_change(self, metric_name: str, start_val: float, end_val: float) -> str:
+        """Classify one metric from its first and last smoothed values"""
+        # Calculate relative change
+        if start_val == 0:
+            relative_change = 1.0 if end_val > 0 else 0.0
+        else:
+            relative_change = (end_val - start_val) / abs(start_val)
+        
+        # Classify based on metric type and change direction
+        if self._is_lower_better(metric_name):
+            # For metrics where lower is better (errors, variance)
+            if relative_change <= -self.trend_thresholds['improving']:
+                return 'improving'
+            elif relative_change >= self.trend_thresholds['improving']:
+                return 'regressing'
+            return 'flat'
+        
+        # For metrics where higher is better (success rates)
+        if relative_change >= self.trend_thresholds['improving']:
+            return 'improving'
+        elif relative_change <= self.trend_thresholds['regressing']:
+            return 'regressing'
+        return 'flat'
+    
     def _generate_trend_summaries(self, classifications: Dict[str, str], smoothed_data: Dict[str, Dict]) -> Dict[str, Dict]:
         """Generate human-readable trend summaries"""
         summaries = {}
@@ -231,15 +404,34 @@ class TrendAnalyzer:
     
     def _get_metric_type(self, metric_name: str) -> str:
         """Get human-readable metric type"""
-        if 'success_rate' in metric_name or 'correct_rate' in metric_name:
-            return 'Success rate'
-        elif 'timing_error_std' in metric_name:
-            return 'Timing consistency'
-        elif 'early_rate' in metric_name:
-            return 'Early input tendency'
-        elif 'late_rate' in metric_name:
-            return 'Late input tendency'
-        elif 'false_confirm_rate' in metric_name:
-            return 'False confirm rate'
+        spec = FEATURE_SCHEMA.get(metric_name)
+        return self.METRIC_TYPES.get(spec.category, 'Performance metric') if spec else 'Performance metric'
+
+def _analyze_player_batch(analyzer: TrendAnalyzer, batch: List[Tuple], session_index: pd.DataFrame = None) -> List[Dict]:
+    """Trend records for a batch of players (runs in a worker process)"""
+    records = []
+    for player_id, player_df in batch:
+        result = analyzer.analyze_trends(player_df, session_index, include_series=False)
+        record = {'player_id': player_id.item() if hasattr(player_id, 'item') else player_id}
+        if 'error' in result:
+            record['session_count'] = len(player_df)
+            record['error'] = result['error']
         else:
-            return 'Performance metric'
\ No newline at end of file
+            record['session_count'] = result['session_count']
+            record['metrics_analyzed'] = result['metrics_analyzed']
+            record['trend_classifications'] = result['trend_classifications']
+            record['trend_summaries'] = result['trend_summaries']
+            if 'trend_statistics' in result:
+                record['trend_statistics'] = result['trend_statistics']
+        records.append(record)
+    return records
+
+def _length_groups(lengths: np.ndarray, n_metrics: int, max_cells: int) -> List[np.ndarray]:
+    """Player codes grouped by history length bucket (powers of two), split to at most max_cells padded values"""
+    buckets = np.ceil(np.log2(np.maximum(lengths, 1))).astype(np.int64)
+    groups = []
+    for bucket in np.unique(buckets):
+        players = np.flatnonzero(buckets == bucket)
+        per_group = max(1, max_cells // (int(lengths[players].max()) * max(n_metrics, 1)))
+        groups.extend(players[i:i + per_group] for i in range(0, len(players), per_group))
+    return groups
@@ -0,0 +1,95 @@
+import numpy as np
+import json
+from pathlib import Path
+from typing import Dict, List
+
+class TrendSeries:
+    """Smoothed trend series kept as (sessions, metrics) arrays.
+
+    On disk this is a directory of plain .npy files (one per series kind)
+    plus a small JSON manifest, so consumers can memory-map a series and
+    read only the metrics they need:
+
+        trend_series/
+            manifest.json              metric names, session ids, shape
+            raw_values.npy
+            rolling_average.npy
+            exponential_smoothing.npy
+
+    Each file holds the transpose, (metrics, sessions), so one metric's
+    series is a contiguous row of the file rather than a strided column.
+    Opened stores expose the transposed memmap, keeping `arrays` in
+    (sessions, metrics) order for callers.
+    """
+
+    KINDS = ('raw_values', 'rolling_average', 'exponential_smoothing')
+    MANIFEST = 'manifest.json'
+    LAYOUT = 'metrics_by_sessions'
+
+    def __init__(self, metric_names: List[str], session_ids: List[str], arrays: Dict[str, np.ndarray]):
+        self.metric_names = list(metric_names)
+        self.session_ids = list(session_ids)
+        self.arrays = arrays
+        self._columns = {name: i for i, name in enumerate(self.metric_names)}
+
+    def series(self, metric_name: str, kind: str = 'exponential_smoothing') -> np.ndarray:
+        """One metric's series; a lazy contiguous view when the store is memory-mapped"""
+        return self.arrays[kind][:, self._columns[metric_name]]
+
+    def smoothed_views(self) -> Dict[str, Dict]:
+        """Per-metric dict in the legacy smoothed_data layout, backed by array views"""
+        raw = self.arrays['raw_values']
+        return {
+            name: {
+                'raw_values': raw[:, i],
+                'rolling_average': self.arrays['rolling_average'][:, i],
+                'exponential_smoothing': self.arrays['exponential_smoothing'][:, i],
+                'simple_delta': float(raw[-1, i] - raw[0, i])
+            }
+            for i, name in enumerate(self.metric_names)
+        }
+
+    def to_lists(self) -> Dict[str, Dict]:
+        """Legacy JSON-ready smoothed_data with Python lists"""
+        return {
+            name: {
+                'raw_values': data['raw_values'].tolist(),
+                'rolling_average': data['rolling_average'].tolist(),
+                'exponential_smoothing': data['exponential_smoothing'].tolist(),
+                'simple_delta': data['simple_delta']
+            }
+            for name, data in self.smoothed_views().items()
+        }
+
+    def save(self, directory) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        for kind in self.KINDS:
+            np.save(directory / f"{kind}.npy", np.ascontiguousarray(self.arrays[kind].T, dtype=np.float64))
+
+        manifest = {
+            'metric_names': self.metric_names,
+            'session_ids': [str(sid) for sid in self.session_ids],
+            'shape': list(self.arrays['raw_values'].shape),
+            'kinds': list(self.KINDS),
+            'layout': self.LAYOUT
+        }
+        with open(directory / self.MANIFEST, 'w') as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def open(cls, directory, mmap_mode: str = 'r') -> 'TrendSeries':
+        """Open a saved store; arrays are memory-mapped unless mmap_mode is None"""
+        directory = Path(directory)
+        with open(directory / cls.MANIFEST) as f:
+            manifest = json.load(f)
+
+        arrays = {
+            kind: np.load(directory / f"{kind}.npy", mmap_mode=mmap_mode)
+            for kind in manifest['kinds']
+        }
+        # Stores written before the layout was recorded are (sessions, metrics)
+        if manifest.get('layout') == cls.LAYOUT:
+            arrays = {kind: values.T for kind, values in arrays.items()}
+        return cls(manifest['metric_names'], manifest['session_ids'], arrays)
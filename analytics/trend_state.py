@@ -0,0 +1,217 @@
+import pandas as pd
+import numpy as np
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, Optional
+from smoothing import exponential_smoothing
+from trend_analyzer import TrendAnalyzer
+
+class TrendState:
+    """Persisted per-metric trend state, updated in O(1) per new session.
+
+    For every candidate trend metric it keeps the running EWMA, the
+    rolling-window buffer, the first smoothed value (the EWMA seed), the
+    session count and the value used to fill missing entries. Trend
+    classifications only need the first and latest smoothed values, so
+    they can be refreshed right after a session ends without touching the
+    history.
+
+    Missing values for median-filled metrics use the median at the time
+    the state was built from history; a running median is not O(1).
+
+    The ids of the last recent_id_limit folded sessions are kept as well,
+    so a session sent again soon after (a retried upload, or one near the
+    end of the history) is not counted twice. The window keeps the state
+    a fixed size; a session re-sent after more than recent_id_limit newer
+    sessions is counted again.
+
+    Only the threshold classification can be kept this way: the
+    statistical method tests the whole series (Mann-Kendall compares every
+    pair of sessions), so summarize() reports an error for it instead of
+    silently falling back to thresholds.
+    """
+
+    RECENT_ID_LIMIT = 10000
+
+    def __init__(self, alpha: float = 0.3, window: int = 2, analyzer: Optional[TrendAnalyzer] = None,
+                 recent_id_limit: int = RECENT_ID_LIMIT):
+        self.alpha = alpha
+        self.window = window
+        self.analyzer = analyzer or TrendAnalyzer()
+        self.session_count = 0
+        self.last_session_id = None
+        self.recent_id_limit = recent_id_limit
+        self.recent_ids = deque(maxlen=recent_id_limit)
+        self._recent_set = set()
+        self.metrics = {}
+
+    @classmethod
+    def from_history(cls, sessions_df: pd.DataFrame, session_index: pd.DataFrame = None,
+                     alpha: float = 0.3, window: int = 2, analyzer: Optional[TrendAnalyzer] = None) -> 'TrendState':
+        """Bootstrap the state from the full ordered session history (one-time cost)"""
+        state = cls(alpha=alpha, window=window, analyzer=analyzer)
+        ordered = state.analyzer._order_sessions(sessions_df, session_index)
+        columns = state.analyzer._trend_metric_columns(ordered.columns)
+
+        state.session_count = len(ordered)
+        state.last_session_id = ordered['session_id'].iloc[-1] if len(ordered) else None
+        for session_id in ordered['session_id'].dropna().astype(str).iloc[-state.recent_id_limit:]:
+            state._remember(session_id)
+        if not columns or ordered.empty:
+            return state
+
+        fill_values = {
+            col: (float(np.nan_to_num(ordered[col].median())) if fill_rule == 'median' else 0.0)
+            for col, fill_rule in columns.items()
+        }
+        raw = np.column_stack([
+            ordered[col].fillna(fill_values[col]).to_numpy(dtype=np.float64) for col in columns
+        ])
+        ewma = exponential_smoothing(raw, alpha=alpha)[-1]
+
+        for i, (col, fill_rule) in enumerate(columns.items()):
+            state.metrics[col] = {
+                'fill_rule': fill_rule,
+                'fill_value': fill_values[col],
+                'first_smoothed': float(raw[0, i]),
+                'ewma': float(ewma[i]),
+                'window_buffer': raw[-window:, i].tolist(),
+                'has_data': bool((raw[:, i] > 0).any())
+            }
+
+        return state
+
+    def update(self, session: Dict) -> bool:
+        """Fold one new session's aggregated features into every metric.
+
+        Returns False, leaving the state unchanged, for a session id that
+        has already been folded in.
+        """
+        session_id = session.get('session_id')
+        if session_id is not None and str(session_id) in self._recent_set:
+            return False
+
+        for col, fill_rule in self.analyzer._trend_metric_columns(session.keys()).items():
+            if col not in self.metrics:
+                self._add_metric(col, fill_rule, session.get(col))
+
+        for col, metric in self.metrics.items():
+            value = session.get(col)
+            if value is None or pd.isna(value):
+                value = metric['fill_value']
+            value = float(value)
+
+            if self.session_count == 0:
+                metric['first_smoothed'] = value
+                metric['ewma'] = value
+            else:
+                metric['ewma'] = self.alpha * value + (1 - self.alpha) * metric['ewma']
+
+            buffer = deque(metric['window_buffer'], maxlen=self.window)
+            buffer.append(value)
+            metric['window_buffer'] = list(buffer)
+            metric['has_data'] = metric['has_data'] or value > 0
+
+        self.session_count += 1
+        self.last_session_id = session_id
+        if session_id is not None:
+            self._remember(str(session_id))
+        return True
+
+    def _remember(self, session_id: str) -> None:
+        if session_id in self._recent_set or not self.recent_id_limit:
+            return
+        if len(self.recent_ids) == self.recent_id_limit:
+            self._recent_set.discard(self.recent_ids[0])
+        self.recent_ids.append(session_id)
+        self._recent_set.add(session_id)
+
+    def _add_metric(self, col: str, fill_rule: str, value) -> None:
+        """Start tracking a metric first seen in a new session.
+
+        Earlier sessions are treated as they would be in a batch run: 0 for
+        zero-filled metrics, and this first value for median-filled ones
+        (the median of a single observation).
+        """
+        if fill_rule == 'median' and value is not None and not pd.isna(value):
+            fill_value = float(value)
+        else:
+            fill_value = 0.0
+
+        self.metrics[col] = {
+            'fill_rule': fill_rule,
+            'fill_value': fill_value,
+            'first_smoothed': fill_value,
+            'ewma': fill_value,
+            'window_buffer': [fill_value] * min(self.session_count, self.window),
+            'has_data': fill_value > 0
+        }
+
+    def rolling_average(self, metric_name: str) -> float:
+        """Latest rolling mean from the window buffer"""
+        buffer = self.metrics[metric_name]['window_buffer']
+        if len(buffer) < self.window:
+            return buffer[-1]
+        return sum(buffer) / self.window
+
+    def summarize(self) -> Dict:
+        """Current trend classifications and summaries, O(1) per metric"""
+        if self.session_count < 2:
+            return {'error': 'Need at least 2 sessions for trend analysis'}
+        if self.analyzer.classification_method != 'threshold':
+            return {'error': f"Incremental trends support only threshold classification, "
+                             f"not '{self.analyzer.classification_method}'; rerun the batch analysis"}
+
+        active = [col for col, metric in self.metrics.items() if metric['has_data']]
+        classifications = {
+            col: self.analyzer._classify_change(col, self.metrics[col]['first_smoothed'], self.metrics[col]['ewma'])
+            for col in active
+        }
+        endpoints = {
+            col: {'exponential_smoothing': [self.metrics[col]['first_smoothed'], self.metrics[col]['ewma']]}
+            for col in active
+        }
+
+        return {
+            'session_count': self.session_count,
+            'metrics_analyzed': active,
+            'trend_classifications': classifications,
+            'trend_summaries': self.analyzer._generate_trend_summaries(classifications, endpoints)
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            'alpha': self.alpha,
+            'window': self.window,
+            'trend_thresholds': self.analyzer.trend_thresholds,
+            'classification_method': self.analyzer.classification_method,
+            'significance': self.analyzer.significance,
+            'session_count': self.session_count,
+            'last_session_id': self.last_session_id,
+            'recent_id_limit': self.recent_id_limit,
+            'recent_ids': list(self.recent_ids),
+            'metrics': self.metrics
+        }
+
+    def save(self, path) -> None:
+        with open(Path(path), 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path) -> 'TrendState':
+        with open(Path(path)) as f:
+            data = json.load(f)
+
+        # States saved before the method was recorded were always threshold-based
+        analyzer = TrendAnalyzer(classification_method=data.get('classification_method', 'threshold'),
+                                 significance=data.get('significance', 0.05))
+        analyzer.trend_thresholds = data['trend_thresholds']
+        state = cls(alpha=data['alpha'], window=data['window'], analyzer=analyzer,
+                    recent_id_limit=data.get('recent_id_limit', cls.RECENT_ID_LIMIT))
+        state.session_count = data['session_count']
+        state.last_session_id = data['last_session_id']
+        for session_id in data.get('recent_ids', []):
+            state._remember(session_id)
+        state.metrics = data['metrics']
+        return state
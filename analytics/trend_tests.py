@@ -0,0 +1,111 @@
+import numpy as np
+from scipy import stats
+from typing import Dict
+
+def ols_trend(values: np.ndarray, confidence: float = 0.95) -> Dict[str, np.ndarray]:
+    """OLS slope against session order with a confidence interval, batched.
+
+    values has shape (..., sessions, metrics) - e.g. (sessions, metrics) for
+    one player or (players, sessions, metrics) for many - and may contain
+    NaN padding for shorter histories. Every statistic has the input shape
+    with the sessions axis removed.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    n_sessions = values.shape[-2]
+
+    # Session order as x, broadcast to the value shape
+    x = np.arange(n_sessions, dtype=np.float64).reshape((n_sessions, 1))
+    x = np.broadcast_to(x, values.shape)
+
+    n = valid.sum(axis=-2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.where(valid, x, 0).sum(axis=-2) / n
+        y_mean = np.where(valid, values, 0).sum(axis=-2) / n
+
+        dx = np.where(valid, x - x_mean[..., np.newaxis, :], 0)
+        dy = np.where(valid, values - y_mean[..., np.newaxis, :], 0)
+
+        sxx = (dx * dx).sum(axis=-2)
+        slope = (dx * dy).sum(axis=-2) / sxx
+        intercept = y_mean - slope * x_mean
+
+        residuals = dy - dx * slope[..., np.newaxis, :]
+        dof = n - 2
+        residual_var = (residuals * residuals).sum(axis=-2) / dof
+        std_error = np.sqrt(residual_var / sxx)
+        t_crit = stats.t.ppf(0.5 + confidence / 2, np.maximum(dof, 1))
+
+    ci_low = slope - t_crit * std_error
+    ci_high = slope + t_crit * std_error
+    insufficient = n < 3
+
+    return {
+        'n': n,
+        'slope': np.where(insufficient, np.nan, slope),
+        'intercept': np.where(insufficient, np.nan, intercept),
+        'std_error': np.where(insufficient, np.nan, std_error),
+        'ci_low': np.where(insufficient, np.nan, ci_low),
+        'ci_high': np.where(insufficient, np.nan, ci_high)
+    }
+
+def mann_kendall(values: np.ndarray, chunk_size: int = 256) -> Dict[str, np.ndarray]:
+    """Mann-Kendall S statistic, Z score and two-sided p-value, batched.
+
+    Same shape convention as ols_trend. S sums sign(y_j - y_i) over all
+    session pairs i < j, accumulated one lag (j - i) at a time so the
+    working set stays the size of the input rather than the number of
+    pairs; the leading (player) axis is processed chunk_size players at
+    a time. The variance ignores tie correction.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    squeeze = values.ndim == 2
+    if squeeze:
+        values = values[np.newaxis]
+
+    n_sessions = values.shape[-2]
+    s = np.zeros(values.shape[:-2] + values.shape[-1:], dtype=np.float64)
+    for start in range(0, values.shape[0], chunk_size):
+        chunk = values[start:start + chunk_size]
+        total = s[start:start + chunk_size]
+        for lag in range(1, n_sessions):
+            # sign(y_j - y_i) for every pair lag apart; comparisons with NaN are false, so NaN pairs add 0
+            later, earlier = chunk[:, lag:, :], chunk[:, :-lag, :]
+            total += np.count_nonzero(later > earlier, axis=1)
+            total -= np.count_nonzero(later < earlier, axis=1)
+
+    n = (~np.isnan(values)).sum(axis=-2).astype(np.float64)
+    variance = n * (n - 1) * (2 * n + 5) / 18.0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.where(s > 0, (s - 1) / np.sqrt(variance), np.where(s < 0, (s + 1) / np.sqrt(variance), 0.0))
+    p_value = 2 * stats.norm.sf(np.abs(z))
+
+    insufficient = n < 3
+    result = {
+        'n': n.astype(int),
+        's': s,
+        'z': np.where(insufficient, np.nan, z),
+        'p_value': np.where(insufficient, np.nan, p_value)
+    }
+    if squeeze:
+        result = {key: value[0] for key, value in result.items()}
+    return result
+
+def classify_significant_trends(ols: Dict[str, np.ndarray], mk: Dict[str, np.ndarray],
+                                lower_is_better: np.ndarray, significance: float = 0.05) -> np.ndarray:
+    """Label every (player, metric) cell from the batched test results.
+
+    A trend is significant when the Mann-Kendall p-value is below the
+    significance level and the OLS confidence interval excludes zero;
+    otherwise the metric is flat. Direction comes from the slope sign
+    and whether lower values are better for the metric.
+    """
+    slope = ols['slope']
+    significant = (mk['p_value'] < significance) & ((ols['ci_low'] > 0) | (ols['ci_high'] < 0))
+    getting_better = np.where(lower_is_better, slope < 0, slope > 0)
+
+    labels = np.full(slope.shape, 'flat', dtype=object)
+    labels[significant & getting_better] = 'improving'
+    labels[significant & ~getting_better] = 'regressing'
+    labels[np.isnan(slope) | np.isnan(mk['p_value'])] = 'insufficient_data'
+    return labels
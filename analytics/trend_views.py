@@ -0,0 +1,121 @@
+import numpy as np
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SECONDS_PER_DAY = 86400.0
+
+class MultiResolutionTrends:
+    """Min/mean/max bucket aggregates of trend series at several resolutions.
+
+    Sessions are already in chronological order, so every bucket is a
+    contiguous row range and each resolution is one reduceat pass over the
+    (sessions, metrics) array. Resolutions run from finest to coarsest:
+    per-session, per-N-session buckets, then per-day and per-week when
+    session start times are known.
+
+    query() picks the finest resolution whose bucket count in the
+    requested range fits the point budget, so plotting cost depends on
+    the budget rather than on history length.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, metric_names: List[str], levels: Dict[str, Dict[str, np.ndarray]], time_axis: str):
+        self.metric_names = list(metric_names)
+        self.levels = levels
+        self.time_axis = time_axis
+        self._columns = {name: i for i, name in enumerate(self.metric_names)}
+
+    @classmethod
+    def build(cls, series, start_times: Optional[np.ndarray] = None, kind: str = 'raw_values',
+              session_buckets=(10, 100, 1000)) -> 'MultiResolutionTrends':
+        """Aggregate one TrendSeries kind at every resolution"""
+        values = np.asarray(series.arrays[kind], dtype=np.float64)
+        n_sessions = values.shape[0]
+        positions = np.arange(n_sessions)
+
+        has_times = start_times is not None and not np.isnan(start_times).any()
+        # Bucket edges are reported in epoch seconds when known, else in session positions
+        axis = np.asarray(start_times, dtype=np.float64) if has_times else positions.astype(np.float64)
+
+        bucket_ids = {'session': positions}
+        for size in session_buckets:
+            if size < n_sessions:
+                bucket_ids[f'{size}_sessions'] = positions // size
+        if has_times:
+            days = np.floor(axis / SECONDS_PER_DAY).astype(np.int64)
+            bucket_ids['day'] = days
+            # Epoch day 0 is a Thursday; +3 aligns weeks to Monday
+            bucket_ids['week'] = (days + 3) // 7
+
+        levels = {name: cls._aggregate(values, ids, axis) for name, ids in bucket_ids.items()}
+        return cls(series.metric_names, levels, 'epoch_seconds' if has_times else 'session_position')
+
+    @staticmethod
+    def _aggregate(values: np.ndarray, bucket_ids: np.ndarray, axis: np.ndarray) -> Dict[str, np.ndarray]:
+        starts = np.flatnonzero(np.r_[True, bucket_ids[1:] != bucket_ids[:-1]])
+        ends = np.r_[starts[1:], len(bucket_ids)]
+        counts = ends - starts
+
+        return {
+            'bucket_start': axis[starts],
+            'bucket_end': axis[ends - 1],
+            'count': counts,
+            'min': np.minimum.reduceat(values, starts, axis=0),
+            'mean': np.add.reduceat(values, starts, axis=0) / counts[:, np.newaxis],
+            'max': np.maximum.reduceat(values, starts, axis=0)
+        }
+
+    def resolutions(self) -> List[str]:
+        """Resolution names from finest to coarsest"""
+        return sorted(self.levels, key=lambda name: -len(self.levels[name]['count']))
+
+    def query(self, metric_name: str, start: float = None, end: float = None, max_points: int = 500) -> Dict:
+        """Buckets for one metric over [start, end] at the finest resolution within max_points"""
+        column = self._columns[metric_name]
+        chosen = None
+        for name in self.resolutions():
+            level = self.levels[name]
+            lo = 0 if start is None else int(np.searchsorted(level['bucket_end'], start, side='left'))
+            hi = len(level['count']) if end is None else int(np.searchsorted(level['bucket_start'], end, side='right'))
+            chosen = (name, level, lo, hi)
+            if hi - lo <= max_points:
+                break
+
+        name, level, lo, hi = chosen
+        return {
+            'metric': metric_name,
+            'resolution': name,
+            'time_axis': self.time_axis,
+            'bucket_start': level['bucket_start'][lo:hi].tolist(),
+            'bucket_end': level['bucket_end'][lo:hi].tolist(),
+            'count': level['count'][lo:hi].tolist(),
+            'min': level['min'][lo:hi, column].tolist(),
+            'mean': level['mean'][lo:hi, column].tolist(),
+            'max': level['max'][lo:hi, column].tolist()
+        }
+
+    def save(self, directory) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, level in self.levels.items():
+            np.savez(directory / f"{name}.npz", **level)
+        with open(directory / self.MANIFEST, 'w') as f:
+            json.dump({
+                'metric_names': self.metric_names,
+                'resolutions': list(self.levels),
+                'time_axis': self.time_axis
+            }, f)
+
+    @classmethod
+    def load(cls, directory) -> 'MultiResolutionTrends':
+        directory = Path(directory)
+        with open(directory / cls.MANIFEST) as f:
+            manifest = json.load(f)
+
+        levels = {}
+        for name in manifest['resolutions']:
+            with np.load(directory / f"{name}.npz") as data:
+                levels[name] = {key: data[key] for key in data.files}
+        return cls(manifest['metric_names'], levels, manifest['time_axis'])
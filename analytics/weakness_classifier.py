@@ -4,22 +4,41 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report
+from joblib import Parallel, delayed
+from tree_rules import CompiledTreeRules
+from feature_schema import FEATURE_SCHEMA
 from typing import Dict, List, Tuple
 import json
 
+def _new_weakness_model(model_type: str, random_state: int):
+    if model_type == 'logistic':
+        return LogisticRegression(random_state=random_state, max_iter=1000)
+    # Shallow tree for interpretability
+    return DecisionTreeClassifier(max_depth=3, random_state=random_state)
+
+def _fit_weakness_model(weakness: str, model_type: str, model, X: np.ndarray, y: np.ndarray):
+    """Fit one unfitted model for one weakness label (runs on a worker)"""
+    model.fit(X, y)
+    return weakness, model_type, model
+
 class WeaknessClassifier:
-    def __init__(self, random_state=42):
+    MODEL_TYPES = ('logistic', 'decision_tree')
+    
+    def __init__(self, random_state=42, n_jobs=-1):
         self.random_state = random_state
+        self.n_jobs = n_jobs
         self.scaler = StandardScaler()
         self.models = {}
         self.feature_names = None
+        self.feature_medians = None
+        self.rule_tables = {}
         
     def define_weakness_labels(self, df: pd.DataFrame) -> pd.DataFrame:
         """Define binary weakness labels based on feature thresholds"""
         labels_df = df[['session_id']].copy()
         
         # Inconsistent Timing - high variance in timing metrics
-        timing_cols = [col for col in df.columns if 'timing_error_std' in col or 'window_offset_std' in col]
+        timing_cols = FEATURE_SCHEMA.columns_in(df.columns, ['timing_consistency', 'window_consistency'])
         if timing_cols:
             timing_variance = df[timing_cols].mean(axis=1, skipna=True)
             labels_df['inconsistent_timing'] = (timing_variance > timing_variance.quantile(0.7)).astype(int)
@@ -33,7 +52,7 @@ class WeaknessClassifier:
             labels_df['poor_mixup_defense'] = 0
             
         # Late Punish Tendency - high late/miss rates in whiff punish
-        late_cols = [col for col in df.columns if 'late_rate' in col or 'miss_rate' in col]
+        late_cols = FEATURE_SCHEMA.columns_in(df.columns, ['late_rate', 'miss_rate'])
         if late_cols:
             late_tendency = df[late_cols].mean(axis=1, skipna=True)
             labels_df['late_punish_tendency'] = (late_tendency > late_tendency.quantile(0.6)).astype(int)
@@ -41,7 +60,7 @@ class WeaknessClassifier:
             labels_df['late_punish_tendency'] = 0
             
         # Impatient Player - high early rates across minigames
-        early_cols = [col for col in df.columns if 'early_rate' in col]
+        early_cols = FEATURE_SCHEMA.columns_in(df.columns, ['early_rate'])
         if early_cols:
             early_tendency = df[early_cols].mean(axis=1, skipna=True)
             labels_df['impatient_player'] = (early_tendency > early_tendency.quantile(0.7)).astype(int)
@@ -52,19 +71,12 @@ class WeaknessClassifier:
     
     def train_weakness_models(self, feature_df: pd.DataFrame, labels_df: pd.DataFrame) -> Dict:
         """Train logistic regression and decision tree models for each weakness"""
-        # Prepare features
-        features = feature_df.drop('session_id', axis=1)
-        self.feature_names = features.columns.tolist()
-        
-        # Handle missing values
-        features = features.fillna(features.median())
-        
-        # Scale features
-        X_scaled = self.scaler.fit_transform(features)
+        X_scaled = self._prepare_features(feature_df, fit=True)
         
         results = {}
         weakness_types = [col for col in labels_df.columns if col != 'session_id']
         
+        trainable = []
         for weakness in weakness_types:
             y = labels_df[weakness].values
             
@@ -72,20 +84,8 @@ class WeaknessClassifier:
             if y.sum() == 0:
                 results[weakness] = {'error': 'No positive cases found'}
                 continue
-                
-            # Train Logistic Regression
-            lr_model = LogisticRegression(random_state=self.random_state, max_iter=1000)
-            lr_model.fit(X_scaled, y)
-            
-            # Train Decision Tree (shallow for interpretability)
-            dt_model = DecisionTreeClassifier(max_depth=3, random_state=self.random_state)
-            dt_model.fit(X_scaled, y)
-            
-            self.models[weakness] = {
-                'logistic': lr_model,
-                'decision_tree': dt_model
-            }
             
+            trainable.append((weakness, y))
             results[weakness] = {
                 'positive_cases': int(y.sum()),
                 'total_cases': len(y),
@@ -93,28 +93,66 @@ class WeaknessClassifier:
                 'logistic_trained': True,
                 'decision_tree_trained': True
             }
+        
+        # Every (weakness, model type) fit is independent - run them on worker
+        # processes so training time scales with cores, not with the number of
+        # labels. lbfgs spends much of its time in Python holding the GIL, so
+        # threads would not help; joblib memory-maps large X_scaled for workers.
+        fitted = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fit_weakness_model)(weakness, model_type, self._new_model(model_type), X_scaled, y)
+            for weakness, y in trainable
+            for model_type in self.MODEL_TYPES
+        )
+        
+        for weakness, _ in trainable:
+            self.models[weakness] = {}
+        for weakness, model_type, model in fitted:
+            self.models[weakness][model_type] = model
             
         return results
     
+    def _new_model(self, model_type: str):
+        """Unfitted estimator for one model type; subclasses swap in other estimators"""
+        return _new_weakness_model(model_type, self.random_state)
+    
+    def _prepare_features(self, feature_df: pd.DataFrame, fit: bool = False) -> np.ndarray:
+        """Fill missing values and scale features.
+        
+        Medians and scaler statistics are computed once during training and
+        reused for every later transform, so predictions never depend on the
+        batch being scored.
+        """
+        features = feature_df.drop('session_id', axis=1)
+        
+        if fit:
+            self.feature_names = features.columns.tolist()
+            # Columns with no data at all (e.g. std over a single attempt) fall back to 0
+            self.feature_medians = features.median().fillna(0.0)
+        else:
+            features = features.reindex(columns=self.feature_names)
+        
+        features = features.fillna(self.feature_medians)
+        
+        if fit:
+            return self.scaler.fit_transform(features)
+        return self.scaler.transform(features)
+    
     def explain_weakness_predictions(self, feature_df: pd.DataFrame, labels_df: pd.DataFrame) -> Dict:
         """Generate explanations for weakness predictions"""
         explanations = {}
-        features = feature_df.drop('session_id', axis=1)
+        X_scaled = self._prepare_features(feature_df) if self.models else None
+        session_ids = feature_df['session_id'].tolist()
         
         for weakness, models in self.models.items():
             if 'logistic' not in models:
                 continue
                 
             lr_model = models['logistic']
-            dt_model = models['decision_tree']
             
             # Logistic regression feature importance
             feature_weights = dict(zip(self.feature_names, lr_model.coef_[0]))
             top_features = sorted(feature_weights.items(), key=lambda x: abs(x[1]), reverse=True)[:5]
             
-            # Decision tree rules
-            tree_rules = self._extract_tree_rules(dt_model, self.feature_names)
-            
             explanations[weakness] = {
                 'description': self._get_weakness_description(weakness),
                 'key_indicators': [
@@ -125,16 +163,57 @@ class WeaknessClassifier:
                     }
                     for feat, weight in top_features
                 ],
-                'decision_rules': tree_rules
+                'decision_rules': []
             }
             
+            # Decision tree rules (online models may not have a tree until their first full refit)
+            rule_table = self._get_rule_table(weakness)
+            if rule_table is not None:
+                fired = rule_table.fired_rules(X_scaled)
+                explanations[weakness]['decision_rules'] = rule_table.positive_rules()
+                explanations[weakness]['rules'] = [
+                    {
+                        'rule': rule_table.describe(i),
+                        'weakness_likely': bool(rule_table.is_positive[i])
+                    }
+                    for i in range(len(rule_table.rule_texts))
+                ]
+                # Per-session explanation is an index into 'rules'
+                explanations[weakness]['session_rules'] = dict(zip(session_ids, fired.tolist()))
+            
         return explanations
     
+    def explain_sessions(self, feature_df: pd.DataFrame, top_k: int = 3):
+        """Per-session top-k logistic contributions (coefficient x scaled value) for every weakness"""
+        from session_explanations import SessionExplanations
+        
+        weakness_names = [w for w, models in self.models.items() if 'logistic' in models]
+        coef = np.vstack([self.models[w]['logistic'].coef_[0] for w in weakness_names])
+        
+        return SessionExplanations.compute(
+            feature_df['session_id'].tolist(),
+            weakness_names,
+            self.feature_names,
+            self._prepare_features(feature_df),
+            coef,
+            top_k=top_k
+        )
+    
+    def _get_rule_table(self, weakness: str):
+        """Compile a weakness tree into a rule table once, reusing it until the tree is replaced"""
+        dt_model = self.models.get(weakness, {}).get('decision_tree')
+        if dt_model is None:
+            return None
+        
+        rule_table = self.rule_tables.get(weakness)
+        if rule_table is None or rule_table.tree_model is not dt_model:
+            rule_table = CompiledTreeRules(dt_model, self.feature_names)
+            self.rule_tables[weakness] = rule_table
+        return rule_table
+    
     def predict_weaknesses(self, feature_df: pd.DataFrame) -> Dict:
         """Predict weakness probabilities for new sessions"""
-        features = feature_df.drop('session_id', axis=1)
-        features = features.fillna(features.median())
-        X_scaled = self.scaler.transform(features)
+        X_scaled = self._prepare_features(feature_df)
         
         predictions = {}
         session_ids = feature_df['session_id'].values
@@ -150,28 +229,14 @@ class WeaknessClassifier:
             
         return predictions
     
+    def export_inference_engine(self):
+        """Export trained logistic models as a stacked NumPy inference engine"""
+        from weakness_inference import WeaknessInferenceEngine
+        return WeaknessInferenceEngine.from_classifier(self)
+    
     def _extract_tree_rules(self, tree_model, feature_names: List[str]) -> List[str]:
         """Extract human-readable rules from decision tree"""
-        tree = tree_model.tree_
-        rules = []
-        
-        def recurse(node, depth, condition=""):
-            if tree.children_left[node] != tree.children_right[node]:  # Not a leaf
-                feature = feature_names[tree.feature[node]]
-                threshold = tree.threshold[node]
-                
-                left_condition = f"{condition} AND {feature} <= {threshold:.3f}" if condition else f"{feature} <= {threshold:.3f}"
-                right_condition = f"{condition} AND {feature} > {threshold:.3f}" if condition else f"{feature} > {threshold:.3f}"
-                
-                recurse(tree.children_left[node], depth + 1, left_condition)
-                recurse(tree.children_right[node], depth + 1, right_condition)
-            else:  # Leaf node
-                value = tree.value[node][0]
-                if len(value) > 1 and value[1] > value[0]:  # Positive class
-                    rules.append(f"IF {condition} THEN weakness likely")
-                    
-        recurse(0, 0)
-        return rules[:3]  # Return top 3 rules
+        return CompiledTreeRules(tree_model, feature_names).positive_rules()
     
     def _get_weakness_description(self, weakness: str) -> str:
         descriptions = {
@@ -0,0 +1,159 @@
+import pandas as pd
+import numpy as np
+import hashlib
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+from sklearn.metrics import precision_score, recall_score, roc_auc_score, brier_score_loss
+from sklearn.calibration import calibration_curve
+from joblib import Parallel, delayed
+from pathlib import Path
+from typing import Dict, List, Optional
+from weakness_classifier import WeaknessClassifier, _fit_weakness_model, _new_weakness_model
+
+def _evaluate_fold(weakness: str, model_type: str, fold: int, X: np.ndarray, y: np.ndarray,
+                   test_mask: np.ndarray, random_state: int):
+    """Fit on the training folds and score the held-out fold (runs on a worker)"""
+    X_train, X_test = X[~test_mask], X[test_mask]
+
+    # Preprocessing is fit on the training folds only to avoid leakage
+    with np.errstate(all='ignore'):
+        medians = np.nan_to_num(np.nanmedian(X_train, axis=0)) if np.isnan(X_train).any() else None
+    if medians is not None:
+        X_train = np.where(np.isnan(X_train), medians, X_train)
+        X_test = np.where(np.isnan(X_test), medians, X_test)
+
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+    X_test = scaler.transform(X_test)
+
+    model = _new_weakness_model(model_type, random_state)
+    _, _, model = _fit_weakness_model(weakness, model_type, model, X_train, y[~test_mask])
+    return weakness, model_type, fold, model.predict_proba(X_test)[:, 1]
+
+class FoldCache:
+    """Stores stratified fold assignments on disk, keyed by the label vector"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory = {}
+
+    def _key(self, y: np.ndarray, n_splits: int, random_state: int) -> str:
+        digest = hashlib.sha1(np.ascontiguousarray(y, dtype=np.int8).tobytes())
+        digest.update(f"{n_splits}:{random_state}".encode())
+        return digest.hexdigest()[:16]
+
+    def get_fold_ids(self, y: np.ndarray, n_splits: int, random_state: int) -> np.ndarray:
+        """Return a per-session fold id vector, computing and caching it on first use"""
+        key = self._key(y, n_splits, random_state)
+        if key in self._memory:
+            return self._memory[key]
+
+        path = self.cache_dir / f"folds_{key}.npy" if self.cache_dir else None
+        if path is not None and path.exists():
+            fold_ids = np.load(path)
+        else:
+            fold_ids = np.empty(len(y), dtype=np.int16)
+            splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+            for fold, (_, test_idx) in enumerate(splitter.split(np.zeros(len(y)), y)):
+                fold_ids[test_idx] = fold
+            if path is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                np.save(path, fold_ids)
+
+        self._memory[key] = fold_ids
+        return fold_ids
+
+class WeaknessEvaluator:
+    """Stratified k-fold cross-validation for the weakness models.
+
+    Every (weakness, fold, model type) fit is independent and runs on a
+    shared worker pool. Fold assignments are cached so nightly re-runs on
+    unchanged labels skip the split step.
+    """
+
+    def __init__(self, n_splits: int = 5, random_state: int = 42, n_jobs: int = -1,
+                 cache_dir=None, calibration_bins: int = 10):
+        self.n_splits = n_splits
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.calibration_bins = calibration_bins
+        self.fold_cache = FoldCache(cache_dir)
+
+    def evaluate(self, feature_df: pd.DataFrame, labels_df: pd.DataFrame) -> Dict:
+        """Cross-validate logistic and tree models for every weakness label"""
+        X = feature_df.drop('session_id', axis=1).to_numpy(dtype=np.float64)
+        weakness_types = [col for col in labels_df.columns if col != 'session_id']
+
+        report = {}
+        tasks = []
+        fold_ids_by_weakness = {}
+        for weakness in weakness_types:
+            y = labels_df[weakness].to_numpy(dtype=int)
+            minority = int(min(y.sum(), len(y) - y.sum()))
+            n_splits = min(self.n_splits, minority)
+
+            if n_splits < 2:
+                report[weakness] = {'error': 'Not enough cases of each class for cross-validation'}
+                continue
+
+            fold_ids = self.fold_cache.get_fold_ids(y, n_splits, self.random_state)
+            fold_ids_by_weakness[weakness] = (y, fold_ids, n_splits)
+
+            for fold in range(n_splits):
+                test_mask = fold_ids == fold
+                for model_type in WeaknessClassifier.MODEL_TYPES:
+                    tasks.append((weakness, model_type, fold, X, y, test_mask, self.random_state))
+
+        fold_results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_evaluate_fold)(*task) for task in tasks
+        )
+
+        oof = {}
+        for weakness, model_type, fold, probabilities in fold_results:
+            y, fold_ids, _ = fold_ids_by_weakness[weakness]
+            target = oof.setdefault((weakness, model_type), np.empty(len(y)))
+            target[fold_ids == fold] = probabilities
+
+        for weakness, (y, fold_ids, n_splits) in fold_ids_by_weakness.items():
+            report[weakness] = {
+                'n_splits': n_splits,
+                'positive_cases': int(y.sum()),
+                'total_cases': len(y),
+                'models': {
+                    model_type: self._score_model(y, fold_ids, n_splits, oof[(weakness, model_type)])
+                    for model_type in WeaknessClassifier.MODEL_TYPES
+                }
+            }
+
+        return {
+            'session_count': len(feature_df),
+            'n_splits': self.n_splits,
+            'random_state': self.random_state,
+            'per_weakness': report
+        }
+
+    def _score_model(self, y: np.ndarray, fold_ids: np.ndarray, n_splits: int, probabilities: np.ndarray) -> Dict:
+        """Per-fold precision/recall/AUC plus pooled out-of-fold calibration"""
+        predicted = (probabilities >= 0.5).astype(int)
+
+        fold_scores = {'precision': [], 'recall': [], 'auc': []}
+        for fold in range(n_splits):
+            mask = fold_ids == fold
+            fold_scores['precision'].append(precision_score(y[mask], predicted[mask], zero_division=0))
+            fold_scores['recall'].append(recall_score(y[mask], predicted[mask], zero_division=0))
+            fold_scores['auc'].append(roc_auc_score(y[mask], probabilities[mask]))
+
+        fraction_positive, mean_predicted = calibration_curve(
+            y, probabilities, n_bins=self.calibration_bins, strategy='quantile'
+        )
+
+        scores = {
+            metric: {'mean': float(np.mean(values)), 'std': float(np.std(values))}
+            for metric, values in fold_scores.items()
+        }
+        scores['calibration'] = {
+            'brier_score': float(brier_score_loss(y, probabilities)),
+            'mean_predicted': [round(float(v), 4) for v in mean_predicted],
+            'fraction_positive': [round(float(v), 4) for v in fraction_positive]
+        }
+        return scores
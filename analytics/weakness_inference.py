@@ -0,0 +1,95 @@
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from typing import Dict, List
+
+class WeaknessInferenceEngine:
+    """Scores every weakness with one matrix multiply.
+
+    The per-weakness logistic models are stacked into a single
+    (n_features, n_weaknesses) coefficient matrix with the StandardScaler
+    folded in, so scoring needs no sklearn calls and no DataFrame work:
+
+        p = sigmoid(fill(X) @ W + b)
+    """
+
+    def __init__(self, feature_names: List[str], weakness_names: List[str],
+                 coef: np.ndarray, intercept: np.ndarray, fill_values: np.ndarray):
+        self.feature_names = list(feature_names)
+        self.weakness_names = list(weakness_names)
+        self.coef = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.fill_values = np.asarray(fill_values, dtype=np.float64)
+
+    @classmethod
+    def from_classifier(cls, classifier) -> 'WeaknessInferenceEngine':
+        """Fold a trained WeaknessClassifier's scaler and logistic models into one engine"""
+        if classifier.feature_names is None or not classifier.models:
+            raise ValueError("WeaknessClassifier has no trained models to export")
+
+        weakness_names = [w for w, models in classifier.models.items() if 'logistic' in models]
+
+        mean = classifier.scaler.mean_
+        scale = classifier.scaler.scale_
+
+        # Raw (n_weaknesses, n_features) weights in scaled space
+        raw_coef = np.vstack([classifier.models[w]['logistic'].coef_[0] for w in weakness_names])
+        raw_intercept = np.array([classifier.models[w]['logistic'].intercept_[0] for w in weakness_names])
+
+        # w . ((x - mean) / scale) + b == (w / scale) . x + (b - w . (mean / scale))
+        coef = (raw_coef / scale).T
+        intercept = raw_intercept - raw_coef @ (mean / scale)
+
+        fill_values = np.nan_to_num(classifier.feature_medians.reindex(classifier.feature_names).to_numpy(dtype=np.float64))
+
+        return cls(classifier.feature_names, weakness_names, coef, intercept, fill_values)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Return an (n_sessions, n_weaknesses) probability matrix for a raw feature matrix"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+
+        # Fill missing values with the training medians
+        nan_mask = np.isnan(X)
+        if nan_mask.any():
+            X = np.where(nan_mask, self.fill_values, X)
+
+        z = X @ self.coef + self.intercept
+        # tanh form of the logistic function; stable for large |z|
+        return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+    def to_matrix(self, feature_df: pd.DataFrame) -> np.ndarray:
+        """Align a session feature frame to the engine's feature order"""
+        return feature_df.reindex(columns=self.feature_names).to_numpy(dtype=np.float64)
+
+    def predict_weaknesses(self, feature_df: pd.DataFrame) -> Dict:
+        """Same output shape as WeaknessClassifier.predict_weaknesses"""
+        probabilities = self.predict_proba(self.to_matrix(feature_df))
+        session_ids = feature_df['session_id'].values
+
+        return {
+            weakness: dict(zip(session_ids, probabilities[:, i].tolist()))
+            for i, weakness in enumerate(self.weakness_names)
+        }
+
+    def save(self, path) -> None:
+        np.savez(
+            Path(path),
+            feature_names=np.array(self.feature_names),
+            weakness_names=np.array(self.weakness_names),
+            coef=self.coef,
+            intercept=self.intercept,
+            fill_values=self.fill_values
+        )
+
+    @classmethod
+    def load(cls, path) -> 'WeaknessInferenceEngine':
+        with np.load(Path(path)) as data:
+            return cls(
+                feature_names=data['feature_names'].tolist(),
+                weakness_names=data['weakness_names'].tolist(),
+                coef=data['coef'],
+                intercept=data['intercept'],
+                fill_values=data['fill_values']
+            )